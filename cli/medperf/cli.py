@@ -89,6 +89,9 @@ def main(
         None, "--version", callback=version_callback, is_eager=True
     ),
 ):
+    # Release the comms resources (e.g. connections) once the command ends
+    ctx.call_on_close(config.comms.close)
+
     # Set inline parameters
     inline_args = ctx.params
     for param in inline_args:
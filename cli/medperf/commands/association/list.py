@@ -1,6 +1,7 @@
 from tabulate import tabulate
 
 from medperf import config
+from medperf.comms.utils import gather
 
 
 class ListAssociations:
@@ -9,8 +10,9 @@ class ListAssociations:
         """Get Pending association requests"""
         comms = config.comms
         ui = config.ui
-        dset_assocs = comms.get_datasets_associations()
-        cube_assocs = comms.get_cubes_associations()
+        dset_assocs, cube_assocs = gather(
+            comms.get_datasets_associations, comms.get_cubes_associations
+        )
 
         # Might be worth seeing if creating an association class that encapsulates
         # most of the logic here is useful
@@ -137,8 +137,48 @@ def run(
         "--no-cache",
         help="Execute even if results already exist",
     ),
+    execution_slots: int = typer.Option(
+        config.execution_slots,
+        "--execution-slots",
+        help="Number of models to execute concurrently",
+    ),
+    slots_per_gpu: int = typer.Option(
+        config.execution_slots_per_gpu,
+        "--slots-per-gpu",
+        help="""If set, models are executed concurrently on each of the GPUs
+        selected with --gpus, this many on each GPU. Each model only sees its GPU""",
+    ),
+    evaluation_slots: int = typer.Option(
+        config.evaluation_slots,
+        "--evaluation-slots",
+        help="Number of model evaluations to run concurrently",
+    ),
+    pipeline_depth: int = typer.Option(
+        config.pipeline_depth,
+        "--pipeline-depth",
+        help="""Number of models whose evaluation can run, without GPUs, while the
+        next models run inference. 0 to run each model's inference and evaluation
+        back to back""",
+    ),
+    evaluate_only: bool = typer.Option(
+        False,
+        "--evaluate-only",
+        help="""Only evaluate the cached predictions of the models, without running
+        their inference. Models without cached predictions fail""",
+    ),
+    warm_evaluator: bool = typer.Option(
+        config.warm_evaluator,
+        "--warm-evaluator",
+        help="""Keep the evaluator container running across models, if the
+        evaluator supports it. Else, models are evaluated separately""",
+    ),
 ):
     """Runs the benchmark execution step for a given benchmark, prepared dataset and model"""
+    config.execution_slots = execution_slots
+    config.execution_slots_per_gpu = slots_per_gpu
+    config.evaluation_slots = evaluation_slots
+    config.pipeline_depth = pipeline_depth
+    config.warm_evaluator = warm_evaluator
     BenchmarkExecution.run(
         benchmark_uid,
         data_uid,
@@ -148,6 +188,7 @@ def run(
         ignore_model_errors=ignore_model_errors,
         show_summary=True,
         ignore_failed_experiments=True,
+        evaluate_only=evaluate_only,
     )
     config.ui.print("✅ Done!")
 
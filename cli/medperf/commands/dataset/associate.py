@@ -1,4 +1,7 @@
+from functools import partial
+
 from medperf import config
+from medperf.comms.utils import gather
 from medperf.entities.dataset import Dataset
 from medperf.entities.benchmark import Benchmark
 from medperf.utils import dict_pretty_print, approval_prompt
@@ -17,13 +20,13 @@ class AssociateDataset:
         """
         comms = config.comms
         ui = config.ui
-        dset = Dataset.get(data_uid)
+        dset, benchmark = gather(
+            partial(Dataset.get, data_uid), partial(Benchmark.get, benchmark_uid)
+        )
         if dset.id is None:
             msg = "The provided dataset is not registered."
             raise InvalidArgumentError(msg)
 
-        benchmark = Benchmark.get(benchmark_uid)
-
         if dset.data_preparation_mlcube != benchmark.data_preparation_mlcube:
             raise InvalidArgumentError(
                 "The specified dataset wasn't prepared for this benchmark"
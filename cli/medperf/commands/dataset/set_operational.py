@@ -36,8 +36,9 @@ class DatasetSetOperational:
         prepared_data_path = self.dataset.data_path
         prepared_labels_path = self.dataset.labels_path
 
-        in_uid = get_folders_hash([raw_data_path, raw_labels_path])
-        generated_uid = get_folders_hash([prepared_data_path, prepared_labels_path])
+        with self.ui.interactive():
+            in_uid = get_folders_hash([raw_data_path, raw_labels_path])
+            generated_uid = get_folders_hash([prepared_data_path, prepared_labels_path])
         self.dataset.input_data_hash = in_uid
         self.dataset.generated_uid = generated_uid
 
@@ -114,7 +114,8 @@ class DataCreation:
 
     def create_dataset_object(self):
         """generates dataset UIDs for both input path"""
-        in_uid = get_folders_hash([self.data_path, self.labels_path])
+        with self.ui.interactive():
+            in_uid = get_folders_hash([self.data_path, self.labels_path])
         dataset = Dataset(
             name=self.name,
             description=self.description,
@@ -1,9 +1,21 @@
 import os
 import logging
+from contextlib import nullcontext
 
 from medperf.entities.cube import Cube
 from medperf.entities.dataset import Dataset
-from medperf.utils import generate_tmp_path
+from medperf.utils import generate_tmp_path, remove_path
+from medperf.storage.evaluations import (
+    evaluation_key,
+    get_memoized_results,
+    memoize_results,
+)
+from medperf.storage.index import pinned, touch
+from medperf.storage.predictions import (
+    cache_predictions,
+    get_cached_predictions,
+    restore_predictions,
+)
 import medperf.config as config
 from medperf.exceptions import ExecutionError
 import yaml
@@ -12,25 +24,72 @@ import yaml
 class Execution:
     @classmethod
     def run(
-        cls, dataset: Dataset, model: Cube, evaluator: Cube, ignore_model_errors=False
+        cls,
+        dataset: Dataset,
+        model: Cube,
+        evaluator: Cube,
+        ignore_model_errors=False,
+        gpus: str = None,
+        evaluation_slot=None,
+        journal=None,
+        use_predictions_cache=False,
+        evaluate_only=False,
+        warm_evaluator=None,
     ):
         """Benchmark execution flow.
 
         Args:
-            benchmark_uid (int): UID of the desired benchmark
-            data_uid (str): Registered Dataset UID
-            model_uid (int): UID of model to execute
+            dataset (Dataset): Registered Dataset
+            model (Cube): model to execute
+            evaluator (Cube): evaluator of the model predictions
+            ignore_model_errors (bool, optional): Whether to evaluate partial predictions
+                                                  if the model fails. Defaults to False.
+            gpus (str, optional): GPUs to expose to the cubes. Defaults to config.gpus.
+            evaluation_slot (optional): Context manager entered to run the evaluation,
+                                        e.g. to wait for a free evaluation slot.
+                                        It returns the GPUs to evaluate on.
+            journal (ModelJournal, optional): Journal to record the completed phases in,
+                                              and to resume the execution from.
+            use_predictions_cache (bool, optional): Whether to reuse the cached
+                                                    predictions of the model on the
+                                                    dataset, and to cache the new
+                                                    ones. Defaults to False.
+            evaluate_only (bool, optional): Whether to only evaluate the cached
+                                            predictions of the model, instead of
+                                            running its inference. Defaults to False.
+            warm_evaluator (WarmEvaluator, optional): Running evaluator container
+                                                      to evaluate the predictions on.
         """
-        execution = cls(dataset, model, evaluator, ignore_model_errors)
+        execution = cls(
+            dataset,
+            model,
+            evaluator,
+            ignore_model_errors,
+            gpus,
+            journal,
+            use_predictions_cache,
+            evaluate_only,
+            warm_evaluator,
+        )
         execution.prepare()
-        with execution.ui.interactive():
+        with pinned(execution.used_paths()), execution.ui.interactive():
             execution.run_inference()
-            execution.run_evaluation()
+            with evaluation_slot or nullcontext(gpus) as evaluation_gpus:
+                execution.run_evaluation(evaluation_gpus)
         execution_summary = execution.todict()
         return execution_summary
 
     def __init__(
-        self, dataset: Dataset, model: Cube, evaluator: Cube, ignore_model_errors=False
+        self,
+        dataset: Dataset,
+        model: Cube,
+        evaluator: Cube,
+        ignore_model_errors=False,
+        gpus: str = None,
+        journal=None,
+        use_predictions_cache=False,
+        evaluate_only=False,
+        warm_evaluator=None,
     ):
         self.comms = config.comms
         self.ui = config.ui
@@ -38,14 +97,32 @@ class Execution:
         self.model = model
         self.evaluator = evaluator
         self.ignore_model_errors = ignore_model_errors
+        self.gpus = gpus
+        self.journal = journal
+        self.use_predictions_cache = use_predictions_cache or evaluate_only
+        self.evaluate_only = evaluate_only
+        self.warm_evaluator = warm_evaluator
 
     def prepare(self):
         self.partial = False
+        self.skip_inference = False
+        self.cached_preds_path = None
+        self.results = None
+        self.evaluation_cached = False
         self.preds_path = self.__setup_predictions_path()
         self.model_logs_path, self.metrics_logs_path = self.__setup_logs_path()
         self.results_path = generate_tmp_path()
         logging.debug(f"tmp results output: {self.results_path}")
 
+    def used_paths(self):
+        """Storage entries the execution needs, to protect them from
+        being evicted while it runs"""
+        return [
+            os.path.join(self.model.path, config.workspace_path),
+            os.path.join(self.evaluator.path, config.workspace_path),
+            self.preds_path,
+        ]
+
     def __setup_logs_path(self):
         model_uid = self.model.generated_uid
         eval_uid = self.evaluator.generated_uid
@@ -65,18 +142,46 @@ class Execution:
         preds_path = os.path.join(
             config.predictions_folder, str(model_uid), str(data_hash)
         )
+        if self.journal is not None:
+            inferred = self.journal.verified_inference(preds_path)
+            if inferred is not None:
+                # The predictions of a previous execution are complete
+                self.skip_inference = True
+                self.partial = inferred["partial"]
+                return preds_path
+            interrupted = self.journal.get("inferred") is None
+            if interrupted and self.journal.get("inferring") is not None:
+                # Predictions of an interrupted inference
+                remove_path(preds_path)
         if os.path.exists(preds_path):
             msg = f"Found existing predictions for model {self.model.id} on dataset "
             msg += f"{self.dataset.id} at {preds_path}. Consider deleting this "
             msg += "folder if you wish to overwrite the predictions."
             raise ExecutionError(msg)
+        if self.use_predictions_cache:
+            self.cached_preds_path = get_cached_predictions(self.model, self.dataset)
+        if self.cached_preds_path is None and self.evaluate_only:
+            msg = f"No cached predictions of model {self.model.id} on dataset "
+            msg += f"{self.dataset.id} to evaluate. Run the model inference first."
+            raise ExecutionError(msg)
         return preds_path
 
     def run_inference(self):
+        if self.skip_inference:
+            self.ui.print("> Reusing the predictions of a previous execution")
+            return
+        if self.cached_preds_path is not None:
+            self.ui.print("> Reusing cached predictions of the model on the dataset")
+            restore_predictions(self.cached_preds_path, self.preds_path)
+            if self.journal is not None:
+                self.journal.record_inference(self.preds_path, self.partial)
+            return
         self.ui.text = "Running model inference on dataset"
         infer_timeout = config.infer_timeout
         preds_path = self.preds_path
         data_path = self.dataset.data_path
+        if self.journal is not None:
+            self.journal.record("inferring")
         try:
             self.model.run(
                 task="infer",
@@ -84,7 +189,9 @@ class Execution:
                 timeout=infer_timeout,
                 data_path=data_path,
                 output_path=preds_path,
+                gpus=self.gpus,
             )
+            touch(preds_path)
             self.ui.print("> Model execution complete")
 
         except ExecutionError as e:
@@ -95,14 +202,57 @@ class Execution:
                 self.partial = True
                 logging.warning(f"Model MLCube Execution failed: {e}")
 
-    def run_evaluation(self):
+        if self.use_predictions_cache and not self.partial:
+            # Partial predictions aren't reused, so that the model is retried
+            cache_predictions(self.model, self.dataset, preds_path)
+        if self.journal is not None:
+            self.journal.record_inference(preds_path, self.partial)
+
+    def run_evaluation(self, gpus: str = None):
+        evaluator_hashes = self.evaluator.content_hashes
+        if self.journal is not None:
+            evaluated = self.journal.get("evaluated")
+            if evaluated is not None and evaluated["evaluator"] == evaluator_hashes:
+                self.ui.print("> Reusing the results of a previous evaluation")
+                self.results = evaluated["results"]
+                return
         self.ui.text = "Running model evaluation on dataset"
         evaluate_timeout = config.evaluate_timeout
         preds_path = self.preds_path
         labels_path = self.dataset.labels_path
         results_path = self.results_path
+        key = None
+        if config.evaluations_cache:
+            key = evaluation_key(self.evaluator, preds_path, labels_path)
+        if key is not None:
+            self.results = get_memoized_results(key)
+        if self.results is not None:
+            self.ui.print("> Reusing the results of an identical evaluation")
+            self.evaluation_cached = True
+        else:
+            self.__evaluate(
+                preds_path, labels_path, results_path, evaluate_timeout, gpus
+            )
+            if key is not None:
+                memoize_results(key, results_path)
+
+        if self.journal is not None:
+            self.journal.record(
+                "evaluated", evaluator=evaluator_hashes, results=self.get_results()
+            )
+
+    def __evaluate(
+        self, preds_path, labels_path, results_path, evaluate_timeout, gpus=None
+    ):
         self.ui.text = "Evaluating results"
+        if gpus is None:
+            gpus = self.gpus
         try:
+            if self.warm_evaluator is not None:
+                self.warm_evaluator.evaluate(
+                    preds_path, results_path, timeout=evaluate_timeout
+                )
+                return
             self.evaluator.run(
                 task="evaluate",
                 output_logs=self.metrics_logs_path,
@@ -110,6 +260,7 @@ class Execution:
                 predictions=preds_path,
                 labels=labels_path,
                 output_path=results_path,
+                gpus=gpus,
             )
         except ExecutionError as e:
             logging.error(f"Metrics MLCube Execution failed: {e}")
@@ -119,9 +270,12 @@ class Execution:
         return {
             "results": self.get_results(),
             "partial": self.partial,
+            "evaluation_cached": self.evaluation_cached,
         }
 
     def get_results(self):
+        if self.results is not None:
+            return self.results
         with open(self.results_path, "r") as f:
             results = yaml.safe_load(f)
         return results
@@ -1,4 +1,7 @@
+from functools import partial
+
 from medperf import config
+from medperf.comms.utils import gather
 from medperf.entities.cube import Cube
 from medperf.entities.benchmark import Benchmark
 from medperf.utils import dict_pretty_print, approval_prompt
@@ -23,8 +26,9 @@ class AssociateCube:
         """
         comms = config.comms
         ui = config.ui
-        cube = Cube.get(cube_uid)
-        benchmark = Benchmark.get(benchmark_uid)
+        cube, benchmark = gather(
+            partial(Cube.get, cube_uid), partial(Benchmark.get, benchmark_uid)
+        )
 
         _, results = CompatibilityTestExecution.run(
             benchmark=benchmark_uid, model=cube_uid, no_cache=no_cache
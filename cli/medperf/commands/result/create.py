@@ -1,7 +1,16 @@
 import os
-from typing import List, Optional
+import logging
+from functools import partial
+from concurrent.futures import Future, as_completed
+from typing import Dict, List, Optional, Tuple
 from medperf.commands.execution import Execution
+from medperf.comms.utils import gather
+from medperf.commands.result.journal import ExecutionJournal
+from medperf.commands.result.prefetch import ModelsPrefetcher
+from medperf.commands.result.scheduler import ExecutionScheduler
+from medperf.commands.result.warm_evaluator import WarmEvaluator
 from medperf.entities.result import Result
+from medperf.storage.index import pinned
 from tabulate import tabulate
 
 from medperf.entities.cube import Cube
@@ -13,6 +22,7 @@ from medperf.exceptions import (
     ExecutionError,
     InvalidEntityError,
     MedperfException,
+    CommunicationRetrievalError,
 )
 
 
@@ -28,6 +38,7 @@ class BenchmarkExecution:
         ignore_failed_experiments=False,
         no_cache=False,
         show_summary=False,
+        evaluate_only=False,
     ):
         """Benchmark execution flow.
 
@@ -38,6 +49,8 @@ class BenchmarkExecution:
                                     if None, models_input_file will be used
             models_input_file: filename to read from
             if models_uids and models_input_file are None, use all benchmark models
+            evaluate_only (bool): Whether to only evaluate the cached predictions
+                                  of the models, instead of running their inference
         """
         execution = cls(
             benchmark_uid,
@@ -46,12 +59,16 @@ class BenchmarkExecution:
             models_input_file,
             ignore_model_errors,
             ignore_failed_experiments,
+            evaluate_only,
         )
         execution.prepare()
         execution.validate()
         execution.prepare_models()
         if not no_cache:
             execution.load_cached_results()
+        else:
+            # Execute from scratch instead of resuming previous executions
+            execution.journal.discard()
         with execution.ui.interactive():
             results = execution.run_experiments()
         if show_summary:
@@ -66,6 +83,7 @@ class BenchmarkExecution:
         models_input_file: str = None,
         ignore_model_errors=False,
         ignore_failed_experiments=False,
+        evaluate_only=False,
     ):
         self.benchmark_uid = benchmark_uid
         self.data_uid = data_uid
@@ -75,13 +93,27 @@ class BenchmarkExecution:
         self.evaluator = None
         self.ignore_model_errors = ignore_model_errors
         self.ignore_failed_experiments = ignore_failed_experiments
+        self.evaluate_only = evaluate_only
         self.cached_results = {}
         self.experiments = []
+        self.journal = ExecutionJournal(benchmark_uid, data_uid)
+        self.warm_evaluator = None
+        self.benchmark_models = None
 
     def prepare(self):
-        self.benchmark = Benchmark.get(self.benchmark_uid)
+        calls = [
+            partial(Benchmark.get, self.benchmark_uid),
+            partial(Dataset.get, self.data_uid),
+        ]
+        if self.models_uids is None and not self.models_input_file:
+            # All the benchmark models will be executed, so their
+            # associations are retrieved along with the benchmark
+            calls.append(partial(Benchmark.get_models_uids, self.benchmark_uid))
+        results = gather(*calls)
+        self.benchmark, self.dataset = results[:2]
+        if len(results) > 2:
+            self.benchmark_models = results[2]
         self.ui.print(f"Benchmark Execution: {self.benchmark.name}")
-        self.dataset = Dataset.get(self.data_uid)
         evaluator_uid = self.benchmark.data_evaluator_mlcube
         self.evaluator = self.__get_cube(evaluator_uid, "Evaluator")
 
@@ -110,8 +142,10 @@ class BenchmarkExecution:
             # finding the benchmark's associated models
             return
 
-        benchmark_models = Benchmark.get_models_uids(self.benchmark_uid)
-        benchmark_models.append(self.benchmark.reference_model_mlcube)
+        benchmark_models = self.benchmark_models
+        if benchmark_models is None:
+            benchmark_models = Benchmark.get_models_uids(self.benchmark_uid)
+        benchmark_models = benchmark_models + [self.benchmark.reference_model_mlcube]
 
         if self.models_uids is None:
             self.models_uids = benchmark_models
@@ -161,7 +195,141 @@ class BenchmarkExecution:
         self.ui.print(f"> {name} cube download complete")
         return cube
 
+    def __get_model(self, uid: int) -> Cube:
+        prefetch = self.prefetcher.take(uid)
+        if prefetch is None:
+            return self.__get_cube(uid, "Model")
+        self.ui.text = "Retrieving Model cube"
+        # Errors raised while prefetching the model are raised here,
+        # so that they are attributed to it
+        cube = prefetch.result()
+        self.ui.print("> Model cube download complete")
+        return cube
+
+    def __prefetch_models(self):
+        """Retrieves the metadata of all the models to be executed in a single
+        request, so that retrieving each model doesn't need a round-trip"""
+        models_uids = [
+            uid for uid in self.models_uids if uid not in self.cached_results
+        ]
+        if not config.metadata_cache or not models_uids:
+            return
+        try:
+            Cube.get_many(models_uids)
+        except CommunicationRetrievalError as e:
+            logging.warning(f"Couldn't prefetch the models metadata: {e}")
+
+    def __workspaces(self) -> List[str]:
+        cubes_uids = [self.evaluator.id] + [
+            uid for uid in self.models_uids if uid not in self.cached_results
+        ]
+        return [
+            os.path.join(config.cubes_folder, str(uid), config.workspace_path)
+            for uid in cubes_uids
+        ]
+
     def run_experiments(self):
+        self.__prefetch_models()
+        # Models are retrieved ahead of their execution, so their workspaces
+        # are protected from eviction until the whole execution ends
+        with pinned(self.__workspaces()):
+            self.__run_experiments()
+        return [experiment["result"] for experiment in self.experiments]
+
+    def __run_experiments(self):
+        # Download the run files of the next models while executing the current one
+        self.prefetcher = ModelsPrefetcher(
+            [uid for uid in self.models_uids if uid not in self.cached_results]
+        )
+        if config.warm_evaluator:
+            self.__prepare_warm_evaluator()
+        try:
+            self.__run_models()
+        finally:
+            self.prefetcher.close()
+            if self.warm_evaluator is not None:
+                self.warm_evaluator.stop()
+
+    def __prepare_warm_evaluator(self):
+        if not WarmEvaluator.supports(self.evaluator):
+            self.ui.print(
+                "> The evaluator can't be kept running across models."
+                " Models will be evaluated separately"
+            )
+            return
+        # The evaluator container is started on the first evaluation, and
+        # can run for as long as the evaluations of all models together
+        timeout = None
+        if config.evaluate_timeout is not None:
+            models = [uid for uid in self.models_uids if uid not in self.cached_results]
+            timeout = config.evaluate_timeout * len(models)
+        self.warm_evaluator = WarmEvaluator(self.evaluator, self.dataset, timeout)
+
+    def __run_model(
+        self, model_uid: int, gpus: str = None, evaluation_slot=None
+    ) -> dict:
+        journal = self.journal.model(model_uid)
+        model_cube = self.__get_model(model_uid)
+        journal.record_download(model_cube.content_hashes)
+        return Execution.run(
+            dataset=self.dataset,
+            model=model_cube,
+            evaluator=self.evaluator,
+            ignore_model_errors=self.ignore_model_errors,
+            gpus=gpus,
+            evaluation_slot=evaluation_slot,
+            journal=journal,
+            use_predictions_cache=True,
+            evaluate_only=self.evaluate_only,
+            warm_evaluator=self.warm_evaluator,
+        )
+
+    def __run_models(self):
+        # Models are executed concurrently, as many as there are execution slots,
+        # and the next models' inference can overlap with the evaluations
+        self.scheduler = ExecutionScheduler()
+        runs = self.__submit_runs()
+        try:
+            experiments, failure = self.__collect_runs(runs)
+        except KeyboardInterrupt:
+            # Models run in worker threads, which don't see the interruption
+            self.scheduler.interrupt()
+            raise
+        finally:
+            self.scheduler.shutdown()
+
+        self.__gather_experiments(experiments)
+        if failure is not None:
+            raise failure
+
+    def __submit_runs(self) -> Dict[Future, int]:
+        runs = {}
+        for model_uid in self.models_uids:
+            if model_uid not in self.cached_results:
+                runs[self.scheduler.submit(self.__run_model, model_uid)] = model_uid
+        return runs
+
+    def __collect_runs(
+        self, runs: Dict[Future, int]
+    ) -> Tuple[Dict[int, dict], Optional[Exception]]:
+        experiments = {}
+        failure = None
+        for run in as_completed(runs):
+            if run.cancelled():
+                continue
+            model_uid = runs[run]
+            experiments[model_uid] = self.__run_experiment(model_uid, run)
+            if run.exception() is None:
+                continue
+            try:
+                self.__handle_experiment_error(model_uid, run.exception())
+            except Exception as e:
+                # Let the running models finish and keep their results
+                failure = failure or e
+                self.scheduler.cancel()
+        return experiments, failure
+
+    def __gather_experiments(self, experiments: Dict[int, dict]):
         for model_uid in self.models_uids:
             if model_uid in self.cached_results:
                 self.experiments.append(
@@ -172,41 +340,32 @@ class BenchmarkExecution:
                         "error": "",
                     }
                 )
-                continue
+            elif model_uid in experiments:
+                self.experiments.append(experiments[model_uid])
 
-            try:
-                model_cube = self.__get_cube(model_uid, "Model")
-                execution_summary = Execution.run(
-                    dataset=self.dataset,
-                    model=model_cube,
-                    evaluator=self.evaluator,
-                    ignore_model_errors=self.ignore_model_errors,
-                )
-            except MedperfException as e:
-                self.__handle_experiment_error(model_uid, e)
-                self.experiments.append(
-                    {
-                        "model_uid": model_uid,
-                        "result": None,
-                        "cached": False,
-                        "error": str(e),
-                    }
-                )
-                continue
+    def __run_experiment(self, model_uid: int, run: Future) -> dict:
+        try:
+            execution_summary = run.result()
+        except MedperfException as e:
+            return {
+                "model_uid": model_uid,
+                "result": None,
+                "cached": False,
+                "error": str(e),
+            }
 
-            partial = execution_summary["partial"]
-            results = execution_summary["results"]
-            result = self.__write_result(model_uid, results, partial)
-
-            self.experiments.append(
-                {
-                    "model_uid": model_uid,
-                    "result": result,
-                    "cached": False,
-                    "error": "",
-                }
-            )
-        return [experiment["result"] for experiment in self.experiments]
+        partial = execution_summary["partial"]
+        results = execution_summary["results"]
+        evaluation_cached = execution_summary["evaluation_cached"]
+        result = self.__write_result(model_uid, results, partial, evaluation_cached)
+        journal = self.journal.model(model_uid)
+        journal.record("result_written", result=result.generated_uid)
+        return {
+            "model_uid": model_uid,
+            "result": result,
+            "cached": False,
+            "error": "",
+        }
 
     def __handle_experiment_error(self, model_uid, exception):
         if isinstance(exception, InvalidEntityError):
@@ -222,18 +381,20 @@ class BenchmarkExecution:
         if not self.ignore_failed_experiments:
             raise exception
 
-    def __result_dict(self, model_uid, results, partial):
+    def __result_dict(self, model_uid, results, partial, evaluation_cached):
         return {
             "name": f"b{self.benchmark_uid}m{model_uid}d{self.data_uid}",
             "benchmark": self.benchmark_uid,
             "model": model_uid,
             "dataset": self.data_uid,
             "results": results,
-            "metadata": {"partial": partial},
+            "metadata": {"partial": partial, "evaluation_cached": evaluation_cached},
         }
 
-    def __write_result(self, model_uid, results, partial):
-        results_info = self.__result_dict(model_uid, results, partial)
+    def __write_result(self, model_uid, results, partial, evaluation_cached):
+        results_info = self.__result_dict(
+            model_uid, results, partial, evaluation_cached
+        )
         result = Result(**results_info)
         result.write()
         return result
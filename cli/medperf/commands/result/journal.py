@@ -0,0 +1,101 @@
+import os
+import json
+import time
+import logging
+from typing import Optional
+
+import medperf.config as config
+from medperf.utils import get_folder_manifest, remove_path
+
+
+class ModelJournal:
+    """On-disk record of the phases of a model's execution that completed.
+    Phases are recorded in order: downloaded, inferring, inferred, evaluated
+    and result_written. Recording a phase discards the phases after it,
+    since they were computed from a previous state of the execution.
+    """
+
+    phases = ["downloaded", "inferring", "inferred", "evaluated", "result_written"]
+
+    def __init__(self, path: str):
+        self.path = path
+        self.state = self.__load()
+
+    def __load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logging.debug(f"Ignoring unreadable execution journal {self.path}: {e}")
+            return {}
+
+    def __save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
+
+    def record(self, phase: str, **details):
+        """Records that a phase completed, along with its details"""
+        next_phase = self.phases.index(phase) + 1
+        for later_phase in self.phases[next_phase:]:
+            self.state.pop(later_phase, None)
+        self.state[phase] = {"time": time.time(), **details}
+        self.__save()
+
+    def get(self, phase: str) -> Optional[dict]:
+        """Details of a phase, or None if the phase didn't complete"""
+        return self.state.get(phase)
+
+    def record_download(self, content_hashes: dict):
+        """Records that the model was downloaded. If a different version
+        of the model was downloaded before, the later phases are discarded"""
+        downloaded = self.get("downloaded")
+        if downloaded is not None and downloaded["content_hashes"] == content_hashes:
+            return
+        self.record("downloaded", content_hashes=content_hashes)
+
+    def record_inference(self, preds_path: str, partial: bool):
+        """Records that the inference completed, with a manifest of
+        the prediction files to verify them when resuming"""
+        manifest = get_folder_manifest(preds_path)
+        self.record(
+            "inferred", preds_path=preds_path, partial=partial, manifest=manifest
+        )
+
+    def verified_inference(self, preds_path: str) -> Optional[dict]:
+        """Details of the completed inference, if the predictions
+        are still the ones it produced. Else None."""
+        inferred = self.get("inferred")
+        if inferred is None or inferred["preds_path"] != preds_path:
+            return
+        if not os.path.isdir(preds_path):
+            return
+        if get_folder_manifest(preds_path) != inferred["manifest"]:
+            logging.debug(f"Predictions at {preds_path} changed since inferred")
+            return
+        return inferred
+
+    def discard(self):
+        self.state = {}
+        remove_path(self.path)
+
+
+class ExecutionJournal:
+    """Journals of the models executed on a dataset for a benchmark, so that an
+    interrupted benchmark execution can be resumed from the phases that completed.
+    """
+
+    def __init__(self, benchmark_uid: int, data_uid: int):
+        self.path = os.path.join(
+            config.journals_folder, str(benchmark_uid), str(data_uid)
+        )
+
+    def model(self, model_uid: int) -> ModelJournal:
+        return ModelJournal(os.path.join(self.path, f"{model_uid}.json"))
+
+    def discard(self):
+        remove_path(self.path)
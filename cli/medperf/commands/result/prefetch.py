@@ -0,0 +1,88 @@
+import os
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from medperf.entities.cube import Cube
+import medperf.config as config
+
+
+def run_files_size(cube: Cube) -> int:
+    """Bytes used by the files of a cube's workspace, including linked ones"""
+    workspace = os.path.join(cube.path, config.workspace_path)
+    size = 0
+    for root, _, files in os.walk(workspace, followlinks=True):
+        for name in files:
+            size += os.path.getsize(os.path.join(root, name))
+    return size
+
+
+class ModelsPrefetcher:
+    """Retrieves models and downloads their run files in a background worker,
+    ahead of their execution, so that downloading the next models overlaps
+    with executing the current one.
+
+    Models are prefetched in the order they will be executed. At most `depth`
+    models are prefetched ahead, and no more models are prefetched while
+    the run files of the prefetched models exceed `max_bytes`.
+    """
+
+    def __init__(
+        self, models_uids: List[int], depth: int = None, max_bytes: int = None
+    ):
+        self.pending = list(models_uids)
+        self.depth = config.prefetch_models if depth is None else depth
+        self.max_bytes = config.prefetch_max_bytes if max_bytes is None else max_bytes
+        self.futures: Dict[int, Future] = {}
+        self.sizes: Dict[int, int] = {}
+        self.closed = False
+        self.lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=1)
+        self.__schedule()
+
+    def __retrieve(self, uid: int) -> Cube:
+        logging.debug(f"Prefetching model {uid}")
+        cube = Cube.get(uid)
+        cube.download_run_files()
+        size = run_files_size(cube)
+        with self.lock:
+            if uid in self.futures:
+                self.sizes[uid] = size
+        logging.debug(f"Prefetched model {uid} ({size} bytes)")
+        return cube
+
+    def __schedule(self):
+        with self.lock:
+            if self.closed or not self.pending:
+                return
+            if len(self.futures) >= self.depth:
+                return
+            if any(not future.done() for future in self.futures.values()):
+                return
+            if sum(self.sizes.values()) >= self.max_bytes:
+                logging.debug("Prefetched models exceed the disk budget")
+                return
+            uid = self.pending.pop(0)
+            future = self.pool.submit(self.__retrieve, uid)
+            self.futures[uid] = future
+        future.add_done_callback(lambda _: self.__schedule())
+
+    def take(self, uid: int) -> Optional[Future]:
+        """Returns the prefetch of a model, whose result is the retrieved
+        cube or the error raised while retrieving it. Returns None if the
+        model wasn't prefetched, in which case it won't be prefetched anymore.
+        """
+        with self.lock:
+            future = self.futures.pop(uid, None)
+            self.sizes.pop(uid, None)
+            if uid in self.pending:
+                self.pending.remove(uid)
+        self.__schedule()
+        return future
+
+    def close(self):
+        """Stops prefetching. Prefetches that already started aren't interrupted"""
+        with self.lock:
+            self.closed = True
+        self.pool.shutdown(wait=False, cancel_futures=True)
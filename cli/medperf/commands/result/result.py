@@ -34,6 +34,12 @@ def create(
         "--no-cache",
         help="Execute even if results already exist",
     ),
+    evaluate_only: bool = typer.Option(
+        False,
+        "--evaluate-only",
+        help="""Only evaluate the cached predictions of the model, without running
+        the inference. Fails if the model has no cached predictions""",
+    ),
 ):
     """Runs the benchmark execution step for a given benchmark, prepared dataset and model"""
     BenchmarkExecution.run(
@@ -42,6 +48,7 @@ def create(
         [model_uid],
         no_cache=no_cache,
         ignore_model_errors=ignore_model_errors,
+        evaluate_only=evaluate_only,
     )
     config.ui.print("✅ Done!")
 
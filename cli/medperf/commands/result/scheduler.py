@@ -0,0 +1,142 @@
+import queue
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, List, Optional
+
+import medperf.config as config
+from medperf.exceptions import InvalidArgumentError
+from medperf.utils import spawn_and_kill
+
+
+# --gpus value of jobs that must not use any GPU
+NO_GPUS = "0"
+
+
+def gpu_devices(gpus: Optional[str]) -> List[str]:
+    """IDs of the GPUs selected by a --gpus value. Empty if the value
+    doesn't select specific GPUs (e.g. "all", or no GPUs)"""
+    if gpus is None:
+        return []
+    gpus = str(gpus).strip()
+    if gpus.isdigit():
+        return [str(device) for device in range(int(gpus))]
+    if gpus.startswith("device="):
+        gpus = gpus[len("device="):]
+    devices = [device.strip() for device in gpus.split(",") if device.strip()]
+    if not all(device.isdigit() for device in devices):
+        return []
+    return devices
+
+
+def execution_slots() -> List[Optional[str]]:
+    """Builds the slots models can be executed on, as the --gpus value of each
+    slot. If config.execution_slots_per_gpu is set, each GPU selected by
+    config.gpus gets that number of slots, which only expose that GPU.
+    Else, there are config.execution_slots slots exposing config.gpus."""
+    per_gpu = config.execution_slots_per_gpu
+    if per_gpu:
+        devices = gpu_devices(config.gpus)
+        if not devices:
+            raise InvalidArgumentError(
+                "Per-GPU execution slots require selecting the GPUs to use "
+                '(e.g. --gpus="device=0,1" or --gpus=2)'
+            )
+        return [f"device={device}" for device in devices for _ in range(per_gpu)]
+
+    if config.execution_slots < 1:
+        raise InvalidArgumentError("There must be at least one execution slot")
+    return [config.gpus] * config.execution_slots
+
+
+class ExecutionScheduler:
+    """Runs jobs concurrently, each on a free execution slot. Jobs are started
+    in the order they were submitted, and receive the GPUs of their slot in
+    the `gpus` argument.
+
+    Jobs run in two stages, inference and evaluation, and are expected to
+    run their evaluation inside the `evaluation_slot` context manager they
+    receive, on the GPUs it returns. Concurrent evaluations are limited to
+    `evaluations`. With a `pipeline_depth`, a job gives its execution slot to
+    the next job when its evaluation starts, so that the next model's inference
+    overlaps with the evaluation. The evaluation then runs without GPUs, since
+    they belong to the next job. At most `pipeline_depth` jobs can be past
+    their inference.
+    """
+
+    def __init__(
+        self,
+        slots: List[Optional[str]] = None,
+        evaluations: int = None,
+        pipeline_depth: int = None,
+    ):
+        if slots is None:
+            slots = execution_slots()
+        if evaluations is None:
+            evaluations = config.evaluation_slots
+        if pipeline_depth is None:
+            pipeline_depth = config.pipeline_depth
+        self.free_slots = queue.SimpleQueue()
+        for gpus in slots:
+            self.free_slots.put(gpus)
+        self.evaluation_slots = threading.BoundedSemaphore(max(evaluations, 1))
+        self.pipeline = None
+        if pipeline_depth > 0:
+            self.pipeline = threading.BoundedSemaphore(pipeline_depth)
+        self.futures: List[Future] = []
+        # Jobs past their inference don't hold an execution slot
+        self.pool = ThreadPoolExecutor(max_workers=len(slots) + max(pipeline_depth, 0))
+
+    @contextmanager
+    def __evaluation_slot(self, gpus: Optional[str], release_slot: Callable):
+        if self.pipeline is not None:
+            # Waits while `pipeline_depth` jobs are already past their inference
+            self.pipeline.acquire()
+            release_slot()
+            gpus = NO_GPUS
+        try:
+            with self.evaluation_slots:
+                yield gpus
+        finally:
+            if self.pipeline is not None:
+                self.pipeline.release()
+
+    def __run_on_slot(self, job: Callable, *args):
+        gpus = self.free_slots.get()
+        held = [True]
+
+        def release_slot():
+            if held[0]:
+                held[0] = False
+                self.free_slots.put(gpus)
+
+        try:
+            evaluation_slot = self.__evaluation_slot(gpus, release_slot)
+            return job(*args, gpus=gpus, evaluation_slot=evaluation_slot)
+        finally:
+            release_slot()
+
+    def submit(self, job: Callable, *args) -> Future:
+        future = self.pool.submit(self.__run_on_slot, job, *args)
+        self.futures.append(future)
+        return future
+
+    def cancel(self):
+        """Cancels the jobs that didn't start yet"""
+        for future in self.futures:
+            future.cancel()
+
+    def interrupt(self):
+        """Cancels the jobs that didn't start yet, and kills the processes
+        of the running ones until they finish. Jobs run in worker threads,
+        so they aren't interrupted when the main thread is."""
+        self.cancel()
+        while not all(future.done() for future in self.futures):
+            spawn_and_kill.kill_running()
+            wait(self.futures, timeout=config.interrupt_poll_interval)
+
+    def shutdown(self):
+        """Cancels the jobs that didn't start yet,
+        and waits for the running ones to finish"""
+        self.cancel()
+        self.pool.shutdown(wait=True)
@@ -0,0 +1,125 @@
+import os
+import time
+import uuid
+import shutil
+import logging
+import threading
+
+import medperf.config as config
+from medperf.entities.cube import Cube
+from medperf.entities.dataset import Dataset
+from medperf.exceptions import ExecutionError
+from medperf.utils import generate_tmp_path, remove_path
+
+WARM_TASK = "evaluate_queue"
+READY_FILE = "ready"
+DONE_FILE = "done"
+FAILED_FILE = "failed"
+STOP_FILE = "stop"
+RESULTS_FILE = "results.yaml"
+PREDICTIONS_FOLDER = "predictions"
+
+
+class WarmEvaluator:
+    """Keeps an evaluator container running across the models of a benchmark
+    execution, so that its startup cost (starting the container, importing
+    its code, loading the labels) is only paid once.
+
+    The container runs the evaluator's `evaluate_queue` task, with the labels
+    and a queue folder mounted. Each evaluation is a job folder in the queue,
+    holding the predictions, which is handed to the container by writing a
+    `ready` file in it. The container writes the job's `results.yaml` and
+    then a `done` file, or a `failed` file if the evaluation failed. Writing
+    a `stop` file in the queue stops the container.
+
+    The queue is writable by the container, so predictions are copied into
+    it rather than hardlinked, which would expose the cached predictions.
+    """
+
+    def __init__(self, evaluator: Cube, dataset: Dataset, timeout: int = None):
+        self.evaluator = evaluator
+        self.dataset = dataset
+        # Time the container can run for, across all the evaluations
+        self.timeout = timeout
+        self.queue_path = generate_tmp_path()
+        logs_path = os.path.join(
+            config.experiments_logs_folder,
+            str(evaluator.generated_uid),
+            str(dataset.generated_uid),
+        )
+        self.logs_path = os.path.join(logs_path, "warm_evaluator.log")
+        self.lock = threading.Lock()
+        self.thread = None
+        self.error = None
+
+    @staticmethod
+    def supports(evaluator: Cube) -> bool:
+        """Whether the evaluator exposes the task to run as a warm evaluator"""
+        tasks = evaluator.get_config("tasks") or {}
+        return WARM_TASK in tasks
+
+    def __serve(self):
+        try:
+            self.evaluator.run(
+                task=WARM_TASK,
+                output_logs=self.logs_path,
+                queue=self.queue_path,
+                labels=self.dataset.labels_path,
+                timeout=self.timeout,
+            )
+        except ExecutionError as e:
+            self.error = e
+        logging.debug("Warm evaluator stopped")
+
+    def __ensure_started(self):
+        with self.lock:
+            if self.thread is not None:
+                return
+            logging.debug(f"Starting warm evaluator on queue {self.queue_path}")
+            os.makedirs(self.queue_path, exist_ok=True)
+            os.makedirs(os.path.dirname(self.logs_path), exist_ok=True)
+            self.thread = threading.Thread(target=self.__serve, daemon=True)
+            self.thread.start()
+
+    def __wait(self, job_path: str, timeout: int = None):
+        start = time.monotonic()
+        while True:
+            if os.path.exists(os.path.join(job_path, DONE_FILE)):
+                return
+            failed_path = os.path.join(job_path, FAILED_FILE)
+            if os.path.exists(failed_path):
+                with open(failed_path) as f:
+                    reason = f.read().strip()
+                raise ExecutionError(f"The warm evaluator failed: {reason}")
+            if not self.thread.is_alive():
+                msg = f"The warm evaluator stopped. Check its logs at {self.logs_path}"
+                raise ExecutionError(msg)
+            if timeout is not None and time.monotonic() - start > timeout:
+                raise ExecutionError("The warm evaluator timed out")
+            time.sleep(config.warm_evaluator_poll_interval)
+
+    def evaluate(self, preds_path: str, output_path: str, timeout: int = None):
+        """Evaluates predictions on the warm evaluator, and writes
+        the results to the given path"""
+        self.__ensure_started()
+        job_path = os.path.join(self.queue_path, uuid.uuid4().hex)
+        shutil.copytree(preds_path, os.path.join(job_path, PREDICTIONS_FOLDER))
+        # The predictions are complete once the job is marked as ready
+        with open(os.path.join(job_path, READY_FILE), "w"):
+            pass
+        try:
+            self.__wait(job_path, timeout)
+            shutil.copyfile(os.path.join(job_path, RESULTS_FILE), output_path)
+        finally:
+            remove_path(job_path)
+
+    def stop(self):
+        """Stops the container, if it was started"""
+        if self.thread is None:
+            return
+        with open(os.path.join(self.queue_path, STOP_FILE), "w"):
+            pass
+        self.thread.join(config.warm_evaluator_stop_timeout)
+        if self.thread.is_alive():
+            logging.warning("The warm evaluator didn't stop in time")
+        remove_path(self.queue_path)
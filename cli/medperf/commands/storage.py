@@ -2,8 +2,9 @@ import typer
 
 from medperf import config
 from medperf.decorators import clean_except
-from medperf.utils import cleanup
+from medperf.utils import cleanup, prune_hash_cache
 from medperf.storage.utils import move_storage
+from medperf.storage.gc import collect_garbage
 from tabulate import tabulate
 
 app = typer.Typer()
@@ -36,8 +37,30 @@ def move(path: str = typer.Option(..., "--target", "-t", help="Target path")):
 
 @app.command("cleanup")
 def clean():
-    """Cleans up clutter paths"""
+    """Cleans up clutter paths and the cached hashes of deleted files"""
 
     # Force cleanup to be true
     config.cleanup = True
     cleanup()
+    prune_hash_cache()
+
+
+@app.command("gc")
+@clean_except
+def gc(
+    quota: int = typer.Option(
+        None,
+        "--quota",
+        "-q",
+        help="Maximum bytes that images, cube workspaces, demo datasets "
+        "and predictions may use. Defaults to the configured storage quota",
+    ),
+):
+    """Evicts the least recently used images, cube workspaces, demo datasets
+    and predictions until the storage usage fits the quota. Entries in use by
+    in-progress executions or by operational datasets are never evicted"""
+    if quota is None:
+        quota = config.storage_quota
+    reclaimed = collect_garbage(quota)
+    prune_hash_cache()
+    config.ui.print(f"Reclaimed {reclaimed / 1024**2:.1f} MB")
@@ -1,14 +1,19 @@
+import hashlib
+import logging
 import requests
-from medperf.exceptions import CommunicationRetrievalError
+from typing import Iterator, Optional
+from concurrent.futures import ThreadPoolExecutor
+from medperf.exceptions import CommunicationRetrievalError, InvalidEntityError
 from medperf import config
-from medperf.utils import remove_path, log_response_error
+from medperf.utils import log_response_error
 from .source import BaseSource
+from .partial import PartialDownload
 import validators
-import os
 
 
 class DirectLinkSource(BaseSource):
     prefix = "direct:"
+    supports_streaming = True
 
     @classmethod
     def validate_resource(cls, value: str):
@@ -34,38 +39,255 @@ class DirectLinkSource(BaseSource):
     def authenticate(self):
         pass
 
-    def __download_once(self, resource_identifier: str, output_path: str):
+    def __probe(self, resource_identifier: str):
+        """Checks whether the server can serve the file in byte ranges.
+
+        Returns:
+            (tuple|None): The file size and the headers identifying its version
+            if it can be downloaded in ranges, else None
+        """
+        try:
+            res = requests.head(resource_identifier, allow_redirects=True)
+        except requests.exceptions.RequestException as e:
+            logging.debug(f"Couldn't probe {resource_identifier}: {e}")
+            return
+        if res.status_code != 200:
+            return
+        if res.headers.get("Accept-Ranges", "").lower() != "bytes":
+            return
+        try:
+            size = int(res.headers["Content-Length"])
+        except (KeyError, ValueError):
+            return
+        return size, PartialDownload.validators(res.headers)
+
+    def __split_ranges(self, size: int):
+        """Splits a file of the given size into byte ranges, one per connection.
+        Parts are never smaller than config.ddl_min_part_size."""
+        num_parts = min(config.ddl_max_connections, size // config.ddl_min_part_size)
+        if num_parts <= 1:
+            return [(0, size - 1)]
+        part_size = -(-size // num_parts)
+        return [
+            (start, min(start + part_size, size) - 1)
+            for start in range(0, size, part_size)
+        ]
+
+    def __download_range(self, resource_identifier, partial, index, progress):
+        """Downloads the missing bytes of a byte range into their position
+        in the preallocated staging file, recording the progress as it goes."""
+        start, end, downloaded = progress
+        headers = {
+            "Range": f"bytes={start + downloaded}-{end}",
+            "Accept-Encoding": "identity",
+        }
+        with requests.get(resource_identifier, headers=headers, stream=True) as res:
+            if res.status_code != 206:
+                log_response_error(res)
+                msg = (
+                    f"There was a problem retrieving bytes {start}-{end} "
+                    f"of the specified file at {resource_identifier}"
+                )
+                raise CommunicationRetrievalError(msg)
+
+            with open(partial.data_path, "r+b") as f:
+                f.seek(start + downloaded)
+                for chunk in res.iter_content(chunk_size=config.ddl_stream_chunk_size):
+                    f.write(chunk)
+                    f.flush()
+                    downloaded += len(chunk)
+                    partial.update_range(index, downloaded)
+
+        if downloaded != end - start + 1:
+            msg = (
+                f"Incomplete download of bytes {start}-{end} "
+                f"of the specified file at {resource_identifier}"
+            )
+            raise CommunicationRetrievalError(msg)
+
+    def __download_ranges(self, resource_identifier, partial, size, file_version):
+        """Downloads a file by fetching its byte ranges concurrently. Ranges
+        already downloaded by a previous attempt are not downloaded again."""
+        ranges = self.__split_ranges(size)
+        progress = partial.resumable_ranges(file_version, size, ranges)
+        if progress is None:
+            partial.start(file_version, size, ranges)
+            progress = partial.progress["ranges"]
+        else:
+            logging.debug(f"Resuming the download of {resource_identifier}")
+
+        pending = [
+            (index, range_progress)
+            for index, range_progress in enumerate(progress)
+            if range_progress[2] < range_progress[1] - range_progress[0] + 1
+        ]
+        logging.debug(
+            f"Downloading {resource_identifier} in {len(pending)} parallel ranges"
+        )
+        with ThreadPoolExecutor(max_workers=max(len(pending), 1)) as pool:
+            futures = [
+                pool.submit(
+                    self.__download_range,
+                    resource_identifier,
+                    partial,
+                    index,
+                    list(range_progress),
+                )
+                for index, range_progress in pending
+            ]
+            for future in futures:
+                future.result()
+
+    def __check_size(self, resource_identifier, size, expected_size):
+        if expected_size is not None and size > expected_size:
+            raise InvalidEntityError(
+                f"{resource_identifier} is larger than expected ({expected_size} bytes)"
+            )
+
+    def __download_stream(
+        self, resource_identifier: str, partial: PartialDownload, expected_size=None
+    ) -> str:
         """Downloads a direct-download-link file by streaming its contents. source:
         https://stackoverflow.com/questions/16694907/download-large-file-in-python-with-requests
+        If a previous attempt was interrupted, only the missing bytes are requested,
+        provided that the file didn't change since. The file is hashed as it is
+        written, so that it doesn't need to be read again to be verified.
+
+        Returns:
+            str: The sha256 hash of the downloaded file
         """
-        with requests.get(resource_identifier, stream=True) as res:
-            if res.status_code != 200:
+        kwargs = {"stream": True}
+        offset = partial.resumable_offset()
+        if offset:
+            kwargs["headers"] = {
+                "Range": f"bytes={offset}-",
+                "If-Range": partial.if_range(),
+                "Accept-Encoding": "identity",
+            }
+
+        with requests.get(resource_identifier, **kwargs) as res:
+            if offset and res.status_code == 206:
+                logging.debug(f"Resuming the download of {resource_identifier}")
+                sha = partial.downloaded_hash()
+            elif res.status_code == 200:
+                # Either a new download or the file changed since the last attempt
+                partial.start(PartialDownload.validators(res.headers))
+                offset = 0
+                sha = hashlib.sha256()
+            else:
                 log_response_error(res)
+                if offset:
+                    # The partial download can't be resumed. Start over next time
+                    partial.discard()
                 msg = (
                     "There was a problem retrieving the specified file at "
                     + resource_identifier
                 )
                 raise CommunicationRetrievalError(msg)
 
-            with open(output_path, "wb") as f:
+            expected_length = res.headers.get("Content-Length")
+            encoded = res.headers.get("Content-Encoding", "identity") != "identity"
+            if expected_length is not None and not encoded:
+                expected_length = int(expected_length)
+                self.__check_size(
+                    resource_identifier, offset + expected_length, expected_size
+                )
+            else:
+                expected_length = None
+
+            written = 0
+            with open(partial.data_path, "ab") as f:
                 for chunk in res.iter_content(chunk_size=config.ddl_stream_chunk_size):
                     # NOTE: if the response is chunk-encoded, this may not work
                     # check whether this is common.
+                    written += len(chunk)
+                    self.__check_size(
+                        resource_identifier, offset + written, expected_size
+                    )
                     f.write(chunk)
+                    sha.update(chunk)
+
+            if expected_length is not None and written != expected_length:
+                msg = f"Incomplete download of {resource_identifier}"
+                raise CommunicationRetrievalError(msg)
+
+        return sha.hexdigest()
 
-    def download(self, resource_identifier: str, output_path: str):
+    def __download_once(
+        self, resource_identifier: str, partial: PartialDownload, expected_size=None
+    ) -> Optional[str]:
+        """Downloads a direct-download-link file. If the server supports range
+        requests and the file is large enough, the file is split into ranges
+        downloaded over multiple connections. Otherwise, the file is downloaded
+        over a single connection.
+
+        Returns:
+            (str|None): The sha256 hash of the downloaded file. None for ranged
+            downloads, whose ranges don't arrive in order
+        """
+        if config.ddl_max_connections > 1:
+            probe = self.__probe(resource_identifier)
+            if probe is not None:
+                size, file_version = probe
+                self.__check_size(resource_identifier, size, expected_size)
+                if len(self.__split_ranges(size)) > 1:
+                    self.__download_ranges(
+                        resource_identifier, partial, size, file_version
+                    )
+                    return
+        return self.__download_stream(resource_identifier, partial, expected_size)
+
+    def stream(self, resource_identifier: str) -> Iterator[bytes]:
+        """Yields the contents of a direct-download-link file in chunks as they
+        arrive, over a single connection. Streams are neither retried nor resumed,
+        so only files known to be smaller than config.ddl_max_stream_size are
+        streamed. Larger files should be downloaded instead."""
+        with requests.get(resource_identifier, stream=True) as res:
+            if res.status_code != 200:
+                log_response_error(res)
+                msg = (
+                    "There was a problem retrieving the specified file at "
+                    + resource_identifier
+                )
+                raise CommunicationRetrievalError(msg)
+            size = res.headers.get("Content-Length")
+            if size is None or int(size) > config.ddl_max_stream_size:
+                msg = f"{resource_identifier} is too large to be streamed"
+                raise CommunicationRetrievalError(msg)
+            yield from res.iter_content(chunk_size=config.ddl_stream_chunk_size)
+
+    def download(
+        self,
+        resource_identifier: str,
+        output_path: str,
+        expected_hash: str = None,
+        expected_size: int = None,
+    ) -> Optional[str]:
         """Downloads a direct-download-link file with multiple attempts. This is
         done due to facing transient network failure from some direct download
-        link servers."""
+        link servers. Failed attempts keep what they downloaded in a staging area,
+        keyed by the URL and the expected hash, so that the next attempt (or a
+        later medperf invocation) resumes the download instead of restarting it.
+        If an expected size is given, the download is aborted as soon as the file
+        turns out to be larger."""
 
+        partial = PartialDownload(resource_identifier, expected_hash)
         attempt = 0
         while attempt < config.ddl_max_redownload_attempts:
             try:
-                self.__download_once(resource_identifier, output_path)
-                return
-            except CommunicationRetrievalError:
-                if os.path.exists(output_path):
-                    remove_path(output_path)
+                file_hash = self.__download_once(
+                    resource_identifier, partial, expected_size
+                )
+                partial.finish(output_path)
+                return file_hash
+            except InvalidEntityError:
+                partial.discard()
+                raise
+            except (
+                CommunicationRetrievalError,
+                requests.exceptions.RequestException,
+            ) as e:
+                logging.debug(f"Failed to download {resource_identifier}: {e}")
                 attempt += 1
 
         raise CommunicationRetrievalError(f"Could not download {resource_identifier}")
@@ -0,0 +1,137 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+from typing import List, Optional, Tuple
+
+import medperf.config as config
+from medperf.utils import remove_path
+
+
+class PartialDownload:
+    """Staging area of a file being downloaded, keyed by its URL and expected hash.
+
+    The downloaded bytes are written to a data file, and the download progress
+    is persisted next to it, so that an interrupted download can be resumed,
+    even by a later medperf invocation. The progress records the ETag and
+    Last-Modified headers of the file, so that a download is only resumed
+    if the remote file didn't change since it started.
+    """
+
+    def __init__(self, url: str, expected_hash: Optional[str] = None):
+        key = hashlib.sha256(f"{url}:{expected_hash}".encode("utf-8")).hexdigest()
+        self.url = url
+        self.path = os.path.join(config.partial_downloads_folder, key)
+        self.data_path = os.path.join(self.path, "data")
+        self.progress_path = os.path.join(self.path, "progress.json")
+        self.progress = self.__load()
+        self.__lock = threading.Lock()
+
+    def __load(self) -> Optional[dict]:
+        if not os.path.exists(self.progress_path) or not os.path.exists(
+            self.data_path
+        ):
+            return
+        try:
+            with open(self.progress_path) as f:
+                progress = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.debug(f"Ignoring unreadable download progress of {self.url}: {e}")
+            return
+        if progress.get("url") != self.url:
+            return
+        return progress
+
+    def __save(self):
+        tmp_path = self.progress_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.progress, f)
+        os.replace(tmp_path, self.progress_path)
+
+    @staticmethod
+    def validators(headers) -> dict:
+        """Extracts the headers that identify a version of a remote file"""
+        return {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+        }
+
+    def __matches(self, validators: dict) -> bool:
+        if self.progress is None:
+            return False
+        if validators["etag"] is None and validators["last_modified"] is None:
+            # The remote file version can't be told apart
+            return False
+        stored = {key: self.progress.get(key) for key in validators}
+        return stored == validators
+
+    def start(self, validators: dict, size: int = None, ranges: List[Tuple] = None):
+        """Discards any previous progress and starts a new download.
+        If ranges are given, the data file is preallocated to the file size and
+        the progress of each range is tracked separately.
+        """
+        self.discard()
+        os.makedirs(self.path, exist_ok=True)
+        with open(self.data_path, "wb") as f:
+            if ranges is not None:
+                f.truncate(size)
+        self.progress = {"url": self.url, "size": size, **validators}
+        if ranges is not None:
+            self.progress["ranges"] = [[start, end, 0] for start, end in ranges]
+        self.__save()
+
+    def resumable_offset(self) -> int:
+        """Number of bytes already downloaded of a single-stream download.
+        Zero if the download can't be resumed."""
+        if self.progress is None or "ranges" in self.progress:
+            return 0
+        if self.progress["etag"] is None and self.progress["last_modified"] is None:
+            # The download can't be validated when resumed
+            return 0
+        return os.path.getsize(self.data_path)
+
+    def downloaded_hash(self):
+        """sha256 hash object fed with the bytes already downloaded"""
+        sha = hashlib.sha256()
+        with open(self.data_path, "rb") as f:
+            while True:
+                data = f.read(config.ddl_stream_chunk_size)
+                if not data:
+                    break
+                sha.update(data)
+        return sha
+
+    def if_range(self) -> str:
+        """Value of the If-Range header to send when resuming the download"""
+        return self.progress["etag"] or self.progress["last_modified"]
+
+    def resumable_ranges(self, validators: dict, size: int, ranges: List[Tuple]):
+        """Returns the progress of each range if a ranged download of the same
+        file version, split in the same ranges, can be resumed. Else None."""
+        if not self.__matches(validators):
+            return
+        if self.progress.get("size") != size or "ranges" not in self.progress:
+            return
+        stored_ranges = [(start, end) for start, end, _ in self.progress["ranges"]]
+        if stored_ranges != list(ranges):
+            return
+        return self.progress["ranges"]
+
+    def update_range(self, index: int, downloaded: int):
+        """Records the number of bytes downloaded of a range"""
+        with self.__lock:
+            self.progress["ranges"][index][2] = downloaded
+            self.__save()
+
+    def finish(self, output_path: str):
+        """Moves the downloaded file to the output path and
+        removes the staging area"""
+        shutil.move(self.data_path, output_path)
+        self.discard()
+
+    def discard(self):
+        self.progress = None
+        if os.path.exists(self.path):
+            remove_path(self.path)
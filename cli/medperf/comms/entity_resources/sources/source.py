@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
+from typing import Iterator, Optional
 
 
 class BaseSource(ABC):
+    # Whether the source can stream resources through `stream`
+    supports_streaming = False
+
     @classmethod
     @abstractmethod
     def validate_resource(cls, value: str):
@@ -16,11 +20,35 @@ class BaseSource(ABC):
         """Authenticates with the source server, if needed."""
 
     @abstractmethod
-    def download(self, resource_identifier: str, output_path: str):
+    def download(
+        self,
+        resource_identifier: str,
+        output_path: str,
+        expected_hash: str = None,
+        expected_size: int = None,
+    ) -> Optional[str]:
         """Downloads the requested resource to the specified location
         Args:
             resource_identifier (str): The identifier that is used to download
             the resource (e.g. URL, asset ID, ...) It is the parsed output
             by `validate_resource`
             output_path (str): The path to download the resource to
+            expected_hash (str, optional): The expected hash of the resource.
+            Sources may use it to identify partial downloads of the resource
+            expected_size (int, optional): The maximum expected size of the resource
+            in bytes. Sources should abort downloading larger resources
+
+        Returns:
+            (str|None): The sha256 hash of the downloaded file, if the source
+            calculated it while downloading
+        """
+
+    def stream(self, resource_identifier: str) -> Iterator[bytes]:
+        """Yields the contents of the requested resource in chunks, as they
+        are downloaded. Only available if `supports_streaming` is True
+        Args:
+            resource_identifier (str): The identifier that is used to download
+            the resource (e.g. URL, asset ID, ...) It is the parsed output
+            by `validate_resource`
         """
+        raise NotImplementedError
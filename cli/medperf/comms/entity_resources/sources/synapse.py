@@ -7,7 +7,9 @@ from synapseclient.core.exceptions import (
 from medperf.exceptions import (
     CommunicationRetrievalError,
     CommunicationAuthenticationError,
+    InvalidEntityError,
 )
+from medperf.utils import get_file_hash, remove_path
 import os
 import shutil
 from .source import BaseSource
@@ -49,7 +51,13 @@ class SynapseSource(BaseSource):
             msg += "\nDid you run 'medperf auth synapse_login' before?"
             raise CommunicationAuthenticationError(msg)
 
-    def download(self, resource_identifier: str, output_path: str):
+    def download(
+        self,
+        resource_identifier: str,
+        output_path: str,
+        expected_hash: str = None,
+        expected_size: int = None,
+    ):
         # we can specify target folder only. File name depends on how it was stored
         download_location = os.path.dirname(output_path)
         os.makedirs(download_location, exist_ok=True)
@@ -67,4 +75,12 @@ class SynapseSource(BaseSource):
             raise CommunicationRetrievalError(
                 "There was a problem retrieving a file from Synapse"
             )
+        if expected_size is not None and os.path.getsize(resource_path) > expected_size:
+            remove_path(resource_path)
+            raise InvalidEntityError(
+                f"{resource_identifier} is larger than expected ({expected_size} bytes)"
+            )
+        # Hash the file once it lands, so that it doesn't need to be read again
+        file_hash = get_file_hash(resource_path, strict=True)
         shutil.move(resource_path, output_path)
+        return file_hash
@@ -0,0 +1,204 @@
+"""Content-addressed storage of MLCube assets. An asset (a file, or a folder
+of extracted files) is stored once under its hash, and is linked into the
+folder of every cube that uses it. Files are hardlinked when possible, while
+folders are symlinked.
+
+The links pointing to each asset are recorded in a references file, so
+that an asset no longer used by any cube can be told apart from one that is.
+Recorded links that were removed or that now point elsewhere don't count.
+References are updated under a per-asset file lock, since concurrent threads
+and medperf processes link the same assets.
+
+Stored files are read-only, since writing to a hardlink of a stored file
+would modify it for every cube linking it.
+"""
+
+import os
+import json
+import stat
+import errno
+import fcntl
+import shutil
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from medperf.utils import remove_path
+
+REFS_FOLDER = ".refs"
+STAGING_FOLDER = ".staging"
+
+# Asset locks held by the current thread
+_held_locks = threading.local()
+
+
+def asset_path(store: str, hash_value: str) -> str:
+    """Location of an asset in a store"""
+    return os.path.join(store, hash_value)
+
+
+def has_asset(store: str, hash_value: str) -> bool:
+    """Whether an asset is in a store. Assets are only added to a store
+    after their hash is verified, so their existence is enough."""
+    return os.path.exists(asset_path(store, hash_value))
+
+
+def _make_read_only(path: str):
+    mode = stat.S_IMODE(os.stat(path).st_mode)
+    os.chmod(path, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+
+
+def __publish(src_path: str, asset: str):
+    # Fails if the asset already exists, unlike a move. Except for files
+    # on filesystems without hardlinks, which replace the existing asset
+    if os.path.isdir(src_path):
+        os.rename(src_path, asset)
+        return
+    try:
+        os.link(src_path, asset)
+    except OSError as e:
+        if e.errno in [errno.EEXIST, errno.EXDEV]:
+            raise
+        os.replace(src_path, asset)
+    else:
+        os.unlink(src_path)
+
+
+def __move_to_store(store: str, src_path: str, asset: str):
+    try:
+        __publish(src_path, asset)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    # The source is on another filesystem. Move it next to the assets first
+    staging_folder = os.path.join(store, STAGING_FOLDER)
+    os.makedirs(staging_folder, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=staging_folder)
+    try:
+        staged_path = os.path.join(staging, os.path.basename(asset))
+        shutil.move(src_path, staged_path)
+        __publish(staged_path, asset)
+    finally:
+        remove_path(staging)
+
+
+def add_asset(store: str, src_path: str, hash_value: str) -> str:
+    """Moves a file or folder into a store, under the given hash.
+    If the asset is already stored, the source is discarded.
+
+    Returns:
+        asset (str): location of the stored asset
+    """
+    asset = asset_path(store, hash_value)
+    if os.path.exists(asset):
+        remove_path(src_path)
+        return asset
+    os.makedirs(store, exist_ok=True)
+    if os.path.isfile(src_path):
+        _make_read_only(src_path)
+    try:
+        __move_to_store(store, src_path, asset)
+    except OSError:
+        if not os.path.exists(asset):
+            raise
+        # The asset was added concurrently
+        remove_path(src_path)
+    return asset
+
+
+def __refs_path(asset: str) -> str:
+    store, hash_value = os.path.split(os.path.normpath(asset))
+    return os.path.join(store, REFS_FOLDER, hash_value + ".json")
+
+
+def __load_refs(asset: str) -> List[str]:
+    refs_path = __refs_path(asset)
+    if not os.path.exists(refs_path):
+        return []
+    try:
+        with open(refs_path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logging.debug(f"Ignoring unreadable references of {asset}: {e}")
+        return []
+
+
+def __save_refs(asset: str, refs: List[str]):
+    refs_path = __refs_path(asset)
+    refs_folder = os.path.dirname(refs_path)
+    fd, tmp_path = tempfile.mkstemp(dir=refs_folder, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(refs, f)
+    os.replace(tmp_path, refs_path)
+
+
+@contextmanager
+def asset_lock(asset: str) -> Iterator[None]:
+    """Holds the lock of a stored asset, across threads and processes,
+    while inside the context. The thread holding it can acquire it again."""
+    lock_path = __refs_path(asset)[: -len(".json")] + ".lock"
+    if not hasattr(_held_locks, "paths"):
+        _held_locks.paths = set()
+    held = _held_locks.paths
+    if lock_path in held:
+        yield
+        return
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    with open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        held.add(lock_path)
+        try:
+            yield
+        finally:
+            held.discard(lock_path)
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def __links_to(link_path: str, asset: str) -> bool:
+    if os.path.islink(link_path):
+        return os.path.realpath(link_path) == os.path.realpath(asset)
+    if os.path.isfile(link_path) and os.path.isfile(asset):
+        return os.path.samefile(link_path, asset)
+    return False
+
+
+def link_asset(asset: str, link_path: str):
+    """Links a stored asset to the given path, replacing whatever is there.
+    Files are hardlinked, falling back to a symlink if the path is on
+    another filesystem. Folders are symlinked."""
+    link_path = os.path.abspath(link_path)
+    with asset_lock(asset):
+        if __links_to(link_path, asset):
+            return
+        if os.path.islink(link_path):  # could be a broken link
+            os.unlink(link_path)
+        elif os.path.exists(link_path):
+            remove_path(link_path)
+        os.makedirs(os.path.dirname(link_path), exist_ok=True)
+
+        if os.path.isfile(asset):
+            try:
+                os.link(asset, link_path)
+            except OSError as e:
+                logging.debug(f"Could not hardlink {asset}, symlinking instead: {e}")
+                os.symlink(asset, link_path)
+        else:
+            os.symlink(asset, link_path)
+
+        refs = asset_references(asset)
+        refs.append(link_path)
+        __save_refs(asset, refs)
+
+
+def asset_references(asset: str) -> List[str]:
+    """Paths currently linked to a stored asset"""
+    refs = __load_refs(asset)
+    return [ref for ref in refs if __links_to(ref, asset)]
+
+
+def asset_refcount(asset: str) -> int:
+    """Number of paths currently linked to a stored asset"""
+    return len(asset_references(asset))
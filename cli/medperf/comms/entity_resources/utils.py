@@ -1,9 +1,32 @@
 import os
 import logging
-from typing import Optional
-from medperf.utils import generate_tmp_path, get_file_hash
+import shutil
+import hashlib
+import tarfile
+import requests
+from typing import Iterable, Optional
+import medperf.config as config
+from medperf.utils import (
+    GZIP_MAGIC,
+    generate_tmp_path,
+    get_file_hash,
+    is_apple_double,
+    remove_path,
+    untar,
+)
 from .sources import supported_sources
-from medperf.exceptions import InvalidArgumentError, InvalidEntityError
+from medperf.exceptions import (
+    CommunicationRetrievalError,
+    InvalidArgumentError,
+    InvalidEntityError,
+)
+
+
+# Compression formats tarfile can decompress while streaming
+STREAMABLE_MAGICS = [GZIP_MAGIC, b"BZh", b"\xfd7zXZ\x00"]
+# Uncompressed tarballs are identified by the magic of their first header
+TAR_MAGIC = b"ustar"
+TAR_MAGIC_OFFSET = 257
 
 
 def __parse_resource(resource: str):
@@ -33,23 +56,30 @@ def __parse_resource(resource: str):
     raise InvalidArgumentError(msg)
 
 
-def tmp_download_resource(resource):
+def tmp_download_resource(
+    resource, expected_hash: Optional[str] = None, expected_size: Optional[int] = None
+):
     """Downloads a resource to the temporary storage.
 
     Args:
         resource (str): The resource string. Must be in the form <source_prefix>:<resource_identifier>
         or a url.
+        expected_hash (optional, str): The expected hash of the file to be downloaded
+        expected_size (optional, int): The maximum expected size of the file in bytes
 
     Returns:
         tmp_output_path (str): The location where the resource was downloaded
+        hash_value (str|None): The hash of the downloaded file, if the source calculated it
     """
 
     tmp_output_path = generate_tmp_path()
     source_class, resource_identifier = __parse_resource(resource)
     source = source_class()
     source.authenticate()
-    source.download(resource_identifier, tmp_output_path)
-    return tmp_output_path
+    hash_value = source.download(
+        resource_identifier, tmp_output_path, expected_hash, expected_size
+    )
+    return tmp_output_path, hash_value
 
 
 def to_permanent_path(tmp_output_path, output_path):
@@ -60,11 +90,15 @@ def to_permanent_path(tmp_output_path, output_path):
 
 
 def download_resource(
-    resource: str, output_path: str, expected_hash: Optional[str] = None
+    resource: str,
+    output_path: str,
+    expected_hash: Optional[str] = None,
+    expected_size: Optional[int] = None,
 ):
     """Downloads a resource/file from the internet. Passing a hash is optional.
     If hash is provided, the downloaded file's hash will be checked and an error
-    will be raised if it is incorrect.
+    will be raised if it is incorrect. The hash is calculated by the source
+    while downloading when possible, so the file is not read again.
 
     Upon success, the function returns the hash of the downloaded file.
 
@@ -73,14 +107,19 @@ def download_resource(
         or a url.
         output_path (str): The path to download the resource to
         expected_hash (optional, str): The expected hash of the file to be downloaded
+        expected_size (optional, int): The maximum expected size of the file in bytes.
+        The download is aborted if the file is larger
 
     Returns:
         The hash of the downloaded file (or existing file)
 
     """
-    tmp_output_path = tmp_download_resource(resource)
-
-    calculated_hash = get_file_hash(tmp_output_path)
+    tmp_output_path, calculated_hash = tmp_download_resource(
+        resource, expected_hash, expected_size
+    )
+    if calculated_hash is None:
+        # The downloaded file's integrity is checked, so it is always read
+        calculated_hash = get_file_hash(tmp_output_path, strict=True)
 
     if expected_hash and calculated_hash != expected_hash:
         logging.debug(f"{resource}: Expected {expected_hash}, found {calculated_hash}.")
@@ -89,3 +128,179 @@ def download_resource(
     to_permanent_path(tmp_output_path, output_path)
 
     return calculated_hash
+
+
+class HashingStream:
+    """Read-only file-like object over a stream of chunks. Chunks are hashed
+    as they are read, so that the stream can be consumed (e.g. extracted) and
+    verified in a single pass."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = iter(chunks)
+        self.sha = hashlib.sha256()
+        self.chunk = memoryview(b"")
+
+    def peek(self, size: int) -> bytes:
+        """Returns up to the next `size` bytes of the stream, without consuming them"""
+        while len(self.chunk) < size:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                break
+            self.sha.update(chunk)
+            self.chunk = memoryview(self.chunk.tobytes() + chunk)
+        return self.chunk[:size].tobytes()
+
+    def read(self, size: int = -1) -> bytes:
+        data = []
+        while size != 0:
+            if not self.chunk:
+                chunk = next(self.chunks, None)
+                if chunk is None:
+                    break
+                self.sha.update(chunk)
+                self.chunk = memoryview(chunk)
+            num_bytes = len(self.chunk) if size < 0 else min(size, len(self.chunk))
+            data.append(self.chunk[:num_bytes].tobytes())
+            self.chunk = self.chunk[num_bytes:]
+            if size > 0:
+                size -= num_bytes
+        return b"".join(data)
+
+    def drain(self):
+        """Reads, and hashes, whatever is left of the stream"""
+        for chunk in self.chunks:
+            self.sha.update(chunk)
+        self.chunk = memoryview(b"")
+
+    def hexdigest(self) -> str:
+        return self.sha.hexdigest()
+
+
+def _is_within(path: str, folder: str) -> bool:
+    path = os.path.normpath(os.path.join(folder, path))
+    return path == folder or path.startswith(folder + os.sep)
+
+
+def _check_member(member: tarfile.TarInfo, output_folder: str):
+    """Rejects tarball members that would be written outside of the output
+    folder, or that aren't regular files, folders or links within it.
+    Members are extracted before the tarball is verified, so they can't
+    be trusted."""
+    output_folder = os.path.abspath(output_folder)
+    if os.path.isabs(member.name) or not _is_within(member.name, output_folder):
+        raise InvalidEntityError(f"Unsafe path in tarball: {member.name}")
+    if member.issym():
+        target = os.path.join(os.path.dirname(member.name), member.linkname)
+    elif member.islnk():
+        target = member.linkname
+    elif member.isfile() or member.isdir():
+        return
+    else:
+        raise InvalidEntityError(f"Unsupported member type in tarball: {member.name}")
+    if os.path.isabs(member.linkname) or not _is_within(target, output_folder):
+        raise InvalidEntityError(f"Unsafe link in tarball: {member.name}")
+
+
+def _is_streamable(head: bytes) -> bool:
+    """Whether tarfile can extract a tarball starting with the given bytes
+    while it is being downloaded"""
+    if any(head.startswith(magic) for magic in STREAMABLE_MAGICS):
+        return True
+    magic_end = TAR_MAGIC_OFFSET + len(TAR_MAGIC)
+    return head[TAR_MAGIC_OFFSET:magic_end] == TAR_MAGIC
+
+
+def __stream_extract(source, resource_identifier, output_folder):
+    """Extracts a tarball while it is being downloaded. Tarballs tarfile can't
+    decompress (e.g. zstd) are instead written to the output folder, to be
+    extracted with untar once verified, so that they aren't downloaded again.
+
+    Returns:
+        hash_value (str): The hash of the downloaded tarball
+        tarball_path (str|None): The path of the tarball, if it wasn't extracted
+    """
+    stream = HashingStream(source.stream(resource_identifier))
+    if not _is_streamable(stream.peek(TAR_MAGIC_OFFSET + len(TAR_MAGIC))):
+        tarball_path = os.path.join(output_folder, config.tarball_filename)
+        with open(tarball_path, "wb") as f:
+            shutil.copyfileobj(stream, f)
+        return stream.hexdigest(), tarball_path
+
+    # The data filter, where available, also strips unsafe permissions
+    extract_kwargs = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+    with tarfile.open(fileobj=stream, mode="r|*") as tar:
+        for member in tar:
+            if is_apple_double(member):
+                continue
+            _check_member(member, output_folder)
+            tar.extract(member, output_folder, **extract_kwargs)
+    # Tarballs may have trailing bytes after the end-of-archive marker
+    stream.drain()
+    return stream.hexdigest(), None
+
+
+def tmp_extract_resource(resource: str, expected_hash: Optional[str] = None):
+    """Downloads a tarball resource and extracts it into a quarantine folder in
+    the temporary storage. If the source supports streaming, the tarball is
+    decompressed, extracted and hashed while it is being downloaded, without
+    ever being written to disk. Streamed tarballs that tarfile can't decompress
+    (e.g. zstd) are written to disk and extracted once verified. Otherwise, or
+    if streaming fails (e.g. for tarballs too large to be streamed), the tarball
+    is downloaded first and extracted afterwards. AppleDouble (._*) files are not extracted, and
+    streamed tarballs with members escaping the quarantine folder are rejected.
+
+    If a hash is provided, the hash of the tarball will be checked. The
+    quarantine folder is removed and an error is raised if it is incorrect.
+    Callers should only move the quarantine folder to its final location
+    (e.g. with os.rename) after this function returns.
+
+    Args:
+        resource (str): The resource string. Must be in the form <source_prefix>:<resource_identifier>
+        or a url.
+        expected_hash (optional, str): The expected hash of the tarball to be downloaded
+
+    Returns:
+        tmp_output_folder (str): The quarantine folder where the tarball was extracted
+        hash_value (str): The hash of the downloaded tarball
+    """
+    tmp_output_folder = generate_tmp_path()
+    source_class, resource_identifier = __parse_resource(resource)
+    source = source_class()
+    source.authenticate()
+
+    calculated_hash = None
+    tarball_path = None
+    if source.supports_streaming:
+        os.makedirs(tmp_output_folder, exist_ok=True)
+        try:
+            calculated_hash, tarball_path = __stream_extract(
+                source, resource_identifier, tmp_output_folder
+            )
+        except (
+            CommunicationRetrievalError,
+            requests.exceptions.RequestException,
+            tarfile.TarError,
+        ) as e:
+            logging.debug(f"Couldn't extract {resource} while downloading it: {e}")
+            remove_path(tmp_output_folder)
+        except InvalidEntityError:
+            remove_path(tmp_output_folder)
+            raise
+
+    if calculated_hash is None:
+        output_tarball_path = os.path.join(tmp_output_folder, config.tarball_filename)
+        # The downloaded tarball is verified before being extracted
+        calculated_hash = download_resource(
+            resource, output_tarball_path, expected_hash
+        )
+        untar(output_tarball_path)
+        return tmp_output_folder, calculated_hash
+
+    if expected_hash and calculated_hash != expected_hash:
+        logging.debug(f"{resource}: Expected {expected_hash}, found {calculated_hash}.")
+        remove_path(tmp_output_folder)
+        raise InvalidEntityError(f"Hash mismatch: {resource}")
+
+    if tarball_path is not None:
+        untar(tarball_path)
+    return tmp_output_folder, calculated_hash
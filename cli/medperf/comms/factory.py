@@ -1,4 +1,5 @@
 from .rest import REST
+from .rest_async import AsyncREST
 from .interface import Comms
 from medperf.exceptions import InvalidArgumentError
 
@@ -9,6 +10,8 @@ class CommsFactory:
         name = name.lower()
         if name == "rest":
             return REST(host)
+        elif name == "rest-async":
+            return AsyncREST(host)
         else:
             msg = "the indicated communication interface doesn't exist"
             raise InvalidArgumentError(msg)
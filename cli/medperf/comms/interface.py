@@ -31,9 +31,12 @@ class Comms(ABC):
         """Retrieve the currently-authenticated user information"""
 
     @abstractmethod
-    def get_benchmarks(self) -> List[dict]:
+    def get_benchmarks(self, filters: dict = {}) -> List[dict]:
         """Retrieves all benchmarks in the platform.
 
+        Args:
+            filters (dict, optional): field-value pairs the server filters by. Defaults to {}.
+
         Returns:
             List[dict]: all benchmarks information.
         """
@@ -61,17 +64,23 @@ class Comms(ABC):
         """
 
     @abstractmethod
-    def get_user_benchmarks(self) -> List[dict]:
+    def get_user_benchmarks(self, filters: dict = {}) -> List[dict]:
         """Retrieves all benchmarks created by the user
 
+        Args:
+            filters (dict, optional): field-value pairs the server filters by. Defaults to {}.
+
         Returns:
             List[dict]: Benchmarks data
         """
 
     @abstractmethod
-    def get_cubes(self) -> List[dict]:
+    def get_cubes(self, filters: dict = {}) -> List[dict]:
         """Retrieves all MLCubes in the platform
 
+        Args:
+            filters (dict, optional): field-value pairs the server filters by. Defaults to {}.
+
         Returns:
             List[dict]: List containing the data of all MLCubes
         """
@@ -88,9 +97,23 @@ class Comms(ABC):
         """
 
     @abstractmethod
-    def get_user_cubes(self) -> List[dict]:
+    def get_cubes_metadata(self, cube_uids: List[int]) -> List[dict]:
+        """Retrieves metadata about multiple cubes in a single request
+
+        Args:
+            cube_uids (List[int]): UIDs of the desired cubes.
+
+        Returns:
+            List[dict]: Metadata of the cubes found in the server
+        """
+
+    @abstractmethod
+    def get_user_cubes(self, filters: dict = {}) -> List[dict]:
         """Retrieves metadata from all cubes registered by the user
 
+        Args:
+            filters (dict, optional): field-value pairs the server filters by. Defaults to {}.
+
         Returns:
             List[dict]: List of dictionaries containing the mlcubes registration information
         """
@@ -118,9 +141,12 @@ class Comms(ABC):
         """
 
     @abstractmethod
-    def get_datasets(self) -> List[dict]:
+    def get_datasets(self, filters: dict = {}) -> List[dict]:
         """Retrieves all datasets in the platform
 
+        Args:
+            filters (dict, optional): field-value pairs the server filters by. Defaults to {}.
+
         Returns:
             List[dict]: List of data from all datasets
         """
@@ -137,9 +163,12 @@ class Comms(ABC):
         """
 
     @abstractmethod
-    def get_user_datasets(self) -> dict:
+    def get_user_datasets(self, filters: dict = {}) -> dict:
         """Retrieves all datasets registered by the user
 
+        Args:
+            filters (dict, optional): field-value pairs the server filters by. Defaults to {}.
+
         Returns:
             dict: dictionary with the contents of each dataset registration query
         """
@@ -156,9 +185,12 @@ class Comms(ABC):
         """
 
     @abstractmethod
-    def get_results(self) -> List[dict]:
+    def get_results(self, filters: dict = {}) -> List[dict]:
         """Retrieves all results
 
+        Args:
+            filters (dict, optional): field-value pairs the server filters by. Defaults to {}.
+
         Returns:
             List[dict]: List of results
         """
@@ -175,9 +207,12 @@ class Comms(ABC):
         """
 
     @abstractmethod
-    def get_user_results(self) -> dict:
+    def get_user_results(self, filters: dict = {}) -> dict:
         """Retrieves all results registered by the user
 
+        Args:
+            filters (dict, optional): field-value pairs the server filters by. Defaults to {}.
+
         Returns:
             dict: dictionary with the contents of each dataset registration query
         """
@@ -285,3 +320,7 @@ class Comms(ABC):
             dataset_id (int): ID of the dataset to update
             data (dict): Updated information of the dataset.
         """
+
+    def close(self):
+        """Releases the resources held by the communication object
+        (e.g. open connections). Does nothing by default"""
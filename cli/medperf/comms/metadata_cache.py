@@ -0,0 +1,152 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+from typing import Optional
+
+import medperf.config as config
+from medperf.config_management import read_config
+
+
+class CachedResponse:
+    """Minimal response-like object used to serve cached entity metadata"""
+
+    def __init__(self, body: dict):
+        self.status_code = 200
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+class MetadataCache:
+    """Local cache of the entity metadata retrieved from the server.
+
+    Each entry stores the response body along with its ETag and the entity's
+    modified_at field. Entries younger than config.metadata_cache_ttl are served
+    without contacting the server. Older entries are revalidated with a
+    conditional request, and are served again if the server reports them
+    as not modified.
+
+    The server may return different metadata to different users, so entries
+    are kept per server, profile and logged in user. These are read once, when
+    the cache is created along with the comms of a command.
+    """
+
+    def __init__(self):
+        config_p = read_config()
+        account = config_p.active_profile.get(config.credentials_keyword) or {}
+        scope = [config.server, config_p.active_profile_name, account.get("email")]
+        self.scope = json.dumps(scope)
+
+    def __entry_path(self, url: str, scope: str) -> str:
+        key = json.dumps([scope, url])
+        key = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(config.metadata_cache_folder, f"{key}.json")
+
+    def get(self, url: str) -> Optional[dict]:
+        """Retrieves the cache entry of a URL, if any
+
+        Args:
+            url (str): URL of the cached response
+
+        Returns:
+            dict: cache entry. None if the URL is not cached or the entry is corrupted
+        """
+        scope = self.scope
+        entry_path = self.__entry_path(url, scope)
+        if not os.path.exists(entry_path):
+            return
+        try:
+            with open(entry_path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.debug(f"Ignoring unreadable metadata cache entry {entry_path}: {e}")
+            return
+        if entry.get("url") != url or entry.get("scope") != scope:
+            return
+        return entry
+
+    def set(self, url: str, res) -> dict:
+        """Stores a successful response in the cache
+
+        Args:
+            url (str): URL of the response
+            res (requests.Response): response to store
+
+        Returns:
+            dict: the created cache entry
+        """
+        return self.store(url, res.json(), res.headers.get("ETag"))
+
+    def store(self, url: str, body: dict, etag: Optional[str] = None) -> dict:
+        """Stores an entity's metadata in the cache. Used for metadata retrieved
+        by other means than the entity's URL (e.g. as part of a list)
+
+        Args:
+            url (str): URL of the entity
+            body (dict): metadata of the entity
+            etag (str, optional): ETag of the metadata, if known. Defaults to None.
+
+        Returns:
+            dict: the created cache entry
+        """
+        entry = {
+            "url": url,
+            "scope": self.scope,
+            "etag": etag,
+            "modified_at": body.get("modified_at"),
+            "cached_at": time.time(),
+            "body": body,
+        }
+        self.__write(entry)
+        return entry
+
+    def refresh(self, entry: dict) -> dict:
+        """Marks an entry as fresh after the server confirmed it was not modified
+
+        Args:
+            entry (dict): cache entry to refresh
+
+        Returns:
+            dict: the refreshed cache entry
+        """
+        entry["cached_at"] = time.time()
+        self.__write(entry)
+        return entry
+
+    def remove(self, url: str):
+        """Removes the cache entry of a URL, if any"""
+        entry_path = self.__entry_path(url, self.scope)
+        if os.path.exists(entry_path):
+            os.remove(entry_path)
+
+    @staticmethod
+    def is_fresh(entry: dict) -> bool:
+        """Checks if an entry can be served without revalidating it"""
+        return time.time() - entry["cached_at"] < config.metadata_cache_ttl
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        """Headers used to revalidate an entry with the server"""
+        if entry.get("etag"):
+            return {"If-None-Match": entry["etag"]}
+        return {}
+
+    def __write(self, entry: dict):
+        # Write to a temporary file first, so concurrent medperf
+        # processes and threads never read a partially written entry
+        entry_path = self.__entry_path(entry["url"], entry["scope"])
+        try:
+            os.makedirs(config.metadata_cache_folder, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=config.metadata_cache_folder, suffix=".tmp"
+            )
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            # The cache is only an optimization
+            logging.debug(f"Couldn't write metadata cache entry {entry_path}: {e}")
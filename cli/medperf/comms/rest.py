@@ -1,10 +1,16 @@
 from typing import List
+import gzip
+import json
 import requests
 import logging
+from urllib.parse import urlencode, quote, urlparse, parse_qs
+from concurrent.futures import ThreadPoolExecutor
 
 from medperf.enums import Status
 import medperf.config as config
 from medperf.comms.interface import Comms
+from medperf.comms.session import create_session, get_connection_stats
+from medperf.comms.metadata_cache import MetadataCache, CachedResponse
 from medperf.utils import (
     sanitize_json,
     log_response_error,
@@ -25,6 +31,10 @@ class REST(Comms):
         if self.cert is None:
             # No certificate provided, default to normal verification
             self.cert = True
+        self.session = create_session()
+        self.metadata_cache = MetadataCache()
+        # Servers that predate request compression reject compressed bodies
+        self.server_accepts_compression = True
 
     @classmethod
     def parse_url(cls, url: str) -> str:
@@ -46,33 +56,253 @@ class REST(Comms):
         return f"https://{url}{api_path}"
 
     def __auth_get(self, url, **kwargs):
-        return self.__auth_req(url, requests.get, **kwargs)
+        return self.__auth_req(url, self.session.get, **kwargs)
 
     def __auth_post(self, url, **kwargs):
-        return self.__auth_req(url, requests.post, **kwargs)
+        return self.__auth_req(url, self.session.post, **kwargs)
 
     def __auth_put(self, url, **kwargs):
-        return self.__auth_req(url, requests.put, **kwargs)
+        # The entity is about to change, its cached metadata can't be trusted anymore
+        self.metadata_cache.remove(url)
+        return self.__auth_req(url, self.session.put, **kwargs)
 
-    def __auth_req(self, url, req_func, **kwargs):
+    def __cached_auth_get(self, url):
+        """Retrieves an entity's metadata through the local metadata cache.
+        Fresh cache entries are served without contacting the server. Stale
+        entries are revalidated with a conditional request.
+
+        Args:
+            url (str): URL of the entity
+
+        Returns:
+            requests.Response|CachedResponse: the server or cached response
+        """
+        if not config.metadata_cache:
+            return self.__auth_get(url)
+
+        entry = self.metadata_cache.get(url)
+        if entry is not None and self.metadata_cache.is_fresh(entry):
+            logging.debug(f"Serving {url} from the metadata cache")
+            return CachedResponse(entry["body"])
+
+        kwargs = {}
+        if entry is not None:
+            kwargs["headers"] = self.metadata_cache.conditional_headers(entry)
+        res = self.__auth_get(url, **kwargs)
+
+        if res.status_code == 304 and entry is not None:
+            logging.debug(f"Cached metadata of {url} is still valid")
+            entry = self.metadata_cache.refresh(entry)
+            return CachedResponse(entry["body"])
+        if res.status_code == 200:
+            self.metadata_cache.set(url, res)
+        return res
+
+    def __auth_req(self, url, req_func, headers={}, **kwargs):
         token = config.auth.access_token
-        return self.__req(
-            url, req_func, headers={"Authorization": f"Bearer {token}"}, **kwargs
-        )
+        headers = {**headers, "Authorization": f"Bearer {token}"}
+        return self.__req(url, req_func, headers=headers, **kwargs)
 
     def __req(self, url, req_func, **kwargs):
         logging.debug(f"Calling {req_func}: {url}")
+        compressed_kwargs = None
         if "json" in kwargs:
             logging.debug(f"Passing JSON contents: {kwargs['json']}")
             kwargs["json"] = sanitize_json(kwargs["json"])
+            if config.comms_compress_requests and self.server_accepts_compression:
+                compressed_kwargs = self.__compress_json(kwargs)
+        if compressed_kwargs is None:
+            return self.__send(url, req_func, **kwargs)
+
+        res = self.__send(url, req_func, **compressed_kwargs)
+        # Servers without support for compressed bodies fail to parse them (400),
+        # or reject their encoding (415). Either way, the request is sent again
+        # uncompressed
+        if res.status_code not in [400, 415]:
+            return res
+        rejected_status = res.status_code
+        res = self.__send(url, req_func, **kwargs)
+        if rejected_status == 415 or res.status_code != 400:
+            # A 400 answer to both requests is about their contents instead
+            logging.debug(f"{self.server_url} doesn't accept compressed requests")
+            self.server_accepts_compression = False
+        return res
+
+    def __send(self, url, req_func, **kwargs):
         try:
-            return req_func(url, verify=self.cert, **kwargs)
+            res = req_func(url, verify=self.cert, **kwargs)
         except requests.exceptions.SSLError as e:
             logging.error(f"Couldn't connect to {self.server_url}: {e}")
             raise CommunicationError(
                 "Couldn't connect to server through HTTPS. If running locally, "
                 "remember to provide the server certificate through --certificate"
             )
+        logging.debug(f"Server connections: {self.connection_stats}")
+        return res
+
+    @staticmethod
+    def __compress_json(kwargs):
+        """Replaces a JSON body with its gzip-compressed serialization if it is
+        larger than config.comms_compression_min_size. Smaller bodies are not
+        compressed, since compressing them saves little. The given arguments
+        are kept, so that the request can be sent uncompressed if the server
+        doesn't accept it
+
+        Returns:
+            dict|None: the request arguments with the compressed body, or None
+        """
+        body = json.dumps(kwargs["json"]).encode("utf-8")
+        if len(body) < config.comms_compression_min_size:
+            return
+        kwargs = {k: v for k, v in kwargs.items() if k != "json"}
+        headers = kwargs.get("headers", {})
+        kwargs["headers"] = {
+            **headers,
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip",
+        }
+        kwargs["data"] = gzip.compress(body)
+        return kwargs
+
+    def close(self):
+        self.session.close()
+
+    @property
+    def connection_stats(self) -> dict:
+        """Number of connections opened to the server and number of
+        requests that reused an already opened connection"""
+        return get_connection_stats(self.session)
+
+    def __get_page(self, url, page_size, offset, binary_reduction, cursor=None):
+        """Retrieves a single page of elements from a URL.
+        If binary_reduction is enabled, errors are assumed to be related to response size. In that case,
+        the page_size is reduced by half until a successful response is obtained or until page_size can't be
+        reduced anymore.
+
+        Args:
+            url (str): The url to retrieve elements from
+            page_size (int): Starting page size.
+            offset (int): The position of the first element of the page. Ignored with cursor pagination.
+            binary_reduction (bool): Wether to handle errors by halfing the page size.
+            cursor (str, optional): Server cursor pointing to the page, when using cursor pagination.
+                If None, the first page is retrieved. Defaults to None.
+
+        Returns:
+            dict: The paginated response body
+            int: The page size that produced a successful response
+        """
+        # The url may already carry query parameters (e.g. filters)
+        separator = "&" if "?" in url else "?"
+        while True:
+            if config.comms_cursor_pagination:
+                query = f"pagination=cursor&limit={page_size}"
+                if cursor is not None:
+                    query += f"&cursor={quote(cursor)}"
+            else:
+                query = f"limit={page_size}&offset={offset}"
+            paginated_url = f"{url}{separator}{query}"
+            res = self.__auth_get(paginated_url)
+            if res.status_code == 200:
+                return res.json(), page_size
+
+            if not binary_reduction:
+                log_response_error(res)
+                details = format_errors_dict(res.json())
+                raise CommunicationRetrievalError(
+                    f"there was an error retrieving the current list: {details}"
+                )
+
+            log_response_error(res, warn=True)
+            details = format_errors_dict(res.json())
+            if page_size <= 1:
+                raise CommunicationRetrievalError(
+                    f"Could not retrieve list. Minimum page size achieved without success: {details}"
+                )
+            page_size = page_size // 2
+
+    def __get_range(self, url, offset, num_elements, binary_reduction):
+        """Retrieves num_elements elements starting at offset. The range is requested
+        as a single page, which may be split into smaller pages if binary_reduction is enabled.
+
+        Returns:
+            List[dict]: The retrieved elements
+            bool: Wether the server reports more elements after the range
+        """
+        el_list = []
+        page_size = num_elements
+        has_next = True
+        while has_next and len(el_list) < num_elements:
+            limit = min(page_size, num_elements - len(el_list))
+            data, page_size = self.__get_page(
+                url, limit, offset + len(el_list), binary_reduction
+            )
+            el_list += data["results"]
+            has_next = data["next"] is not None
+            if not data["results"]:
+                break
+        return el_list, has_next
+
+    def __get_pages_concurrently(
+        self, url, offset, num_elements, page_size, binary_reduction
+    ):
+        """Retrieves num_elements elements starting at offset by requesting
+        pages of page_size elements concurrently. Pages are reassembled in order.
+
+        Returns:
+            List[dict]: The retrieved elements
+            bool: Wether the server reports more elements after the last page
+        """
+        end = offset + num_elements
+        offsets = range(offset, end, page_size)
+        with ThreadPoolExecutor(max_workers=config.comms_max_parallel_pages) as pool:
+            futures = [
+                pool.submit(
+                    self.__get_range,
+                    url,
+                    page_offset,
+                    min(page_size, end - page_offset),
+                    binary_reduction,
+                )
+                for page_offset in offsets
+            ]
+            pages = [future.result() for future in futures]
+
+        el_list = []
+        for page, _ in pages:
+            el_list += page
+        _, has_next = pages[-1]
+        return el_list, has_next
+
+    def __get_cursor_list(self, url, num_elements, page_size, binary_reduction):
+        """Retrieves a list of elements from a URL by following the cursors returned
+        by the server, until num_elements is obtained or there are no more elements.
+        Elements modified during the walk are returned again by the server. Only their
+        latest version is kept.
+
+        Returns:
+            List[dict]: A list of dictionaries representing the retrieved elements.
+        """
+        el_list = []
+        positions = {}
+        cursor = None
+        while len(el_list) < num_elements:
+            data, page_size = self.__get_page(
+                url, page_size, None, binary_reduction, cursor=cursor
+            )
+            for element in data["results"]:
+                id = element.get("id") if isinstance(element, dict) else None
+                if id is not None and id in positions:
+                    el_list[positions[id]] = element
+                    continue
+                if id is not None:
+                    positions[id] = len(el_list)
+                el_list.append(element)
+
+            if data["next"] is None:
+                break
+            cursor = parse_qs(urlparse(data["next"]).query)["cursor"][0]
+
+        return el_list
 
     def __get_list(
         self,
@@ -84,6 +314,11 @@ class REST(Comms):
     ):
         """Retrieves a list of elements from a URL by iterating over pages until num_elements is obtained.
         If num_elements is None, then iterates until all elements have been retrieved.
+        The first page is retrieved alone. The total count reported with it is used to request
+        the remaining pages concurrently. If the server still reports more elements after that,
+        the rest of the list is retrieved sequentially.
+        If config.comms_cursor_pagination is enabled, the list is instead retrieved sequentially
+        by following the cursors returned by the server, and offset is ignored.
         If binary_reduction is enabled, errors are assumed to be related to response size. In that case,
         the page_size is reduced by half until a successful response is obtained or until page_size can't be
         reduced anymore.
@@ -98,41 +333,58 @@ class REST(Comms):
         Returns:
             List[dict]: A list of dictionaries representing the retrieved elements.
         """
-        el_list = []
-
         if num_elements is None:
             num_elements = float("inf")
 
-        while len(el_list) < num_elements:
-            paginated_url = f"{url}?limit={page_size}&offset={offset}"
-            res = self.__auth_get(paginated_url)
-            if res.status_code != 200:
-                if not binary_reduction:
-                    log_response_error(res)
-                    details = format_errors_dict(res.json())
-                    raise CommunicationRetrievalError(
-                        f"there was an error retrieving the current list: {details}"
-                    )
-
-                log_response_error(res, warn=True)
-                details = format_errors_dict(res.json())
-                if page_size <= 1:
-                    raise CommunicationRetrievalError(
-                        f"Could not retrieve list. Minimum page size achieved without success: {details}"
-                    )
-                page_size = page_size // 2
-                continue
-            else:
-                data = res.json()
-                el_list += data["results"]
-                offset += len(data["results"])
-                if data["next"] is None:
-                    break
+        if config.comms_cursor_pagination:
+            el_list = self.__get_cursor_list(
+                url, num_elements, page_size, binary_reduction
+            )
+            if isinstance(num_elements, int):
+                return el_list[:num_elements]
+            return el_list
+
+        data, page_size = self.__get_page(url, page_size, offset, binary_reduction)
+        el_list = data["results"]
+        offset += len(el_list)
+        has_next = data["next"] is not None
+
+        num_remaining = min(data["count"] - offset, num_elements - len(el_list))
+        if has_next and num_remaining > 0:
+            page_list, has_next = self.__get_pages_concurrently(
+                url, offset, num_remaining, page_size, binary_reduction
+            )
+            el_list += page_list
+            offset += len(page_list)
+
+        # Elements may have been added while retrieving the list
+        while has_next and len(el_list) < num_elements:
+            data, page_size = self.__get_page(url, page_size, offset, binary_reduction)
+            el_list += data["results"]
+            offset += len(data["results"])
+            has_next = data["next"] is not None
 
         if isinstance(num_elements, int):
             return el_list[:num_elements]
         return el_list
 
+    @staticmethod
+    def __filtered_url(url: str, filters: dict) -> str:
+        """Adds the given filters to a list URL as query parameters.
+        Filters with a None value are ignored.
+
+        Args:
+            url (str): URL of the list
+            filters (dict): field-value pairs to filter by
+
+        Returns:
+            str: the filtered list URL
+        """
+        params = {key: val for key, val in filters.items() if val is not None}
+        if not params:
+            return url
+        return f"{url}?{urlencode(params)}"
+
     def __set_approval_status(self, url: str, status: str) -> requests.Response:
         """Sets the approval status of a resource
 
@@ -152,13 +404,17 @@ class REST(Comms):
         res = self.__auth_get(f"{self.server_url}/me/")
         return res.json()
 
-    def get_benchmarks(self) -> List[dict]:
+    def get_benchmarks(self, filters: dict = {}) -> List[dict]:
         """Retrieves all benchmarks in the platform.
 
+        Args:
+            filters (dict, optional): field-value pairs the server filters by. Defaults to {}.
+
         Returns:
             List[dict]: all benchmarks information.
         """
-        bmks = self.__get_list(f"{self.server_url}/benchmarks/")
+        url = self.__filtered_url(f"{self.server_url}/benchmarks/", filters)
+        bmks = self.__get_list(url)
         return bmks
 
     def get_benchmark(self, benchmark_uid: int) -> dict:
@@ -170,7 +426,7 @@ class REST(Comms):
         Returns:
             dict: benchmark specification
         """
-        res = self.__auth_get(f"{self.server_url}/benchmarks/{benchmark_uid}")
+        res = self.__cached_auth_get(f"{self.server_url}/benchmarks/{benchmark_uid}")
         if res.status_code != 200:
             log_response_error(res)
             details = format_errors_dict(res.json())
@@ -191,22 +447,30 @@ class REST(Comms):
         assocs = self.__get_list(f"{self.server_url}/benchmarks/{benchmark_uid}/models")
         return filter_latest_associations(assocs, "model_mlcube")
 
-    def get_user_benchmarks(self) -> List[dict]:
+    def get_user_benchmarks(self, filters: dict = {}) -> List[dict]:
         """Retrieves all benchmarks created by the user
 
+        Args:
+            filters (dict, optional): field-value pairs the server filters by. Defaults to {}.
+
         Returns:
             List[dict]: Benchmarks data
         """
-        bmks = self.__get_list(f"{self.server_url}/me/benchmarks/")
+        url = self.__filtered_url(f"{self.server_url}/me/benchmarks/", filters)
+        bmks = self.__get_list(url)
         return bmks
 
-    def get_cubes(self) -> List[dict]:
+    def get_cubes(self, filters: dict = {}) -> List[dict]:
         """Retrieves all MLCubes in the platform
 
+        Args:
+            filters (dict, optional): field-value pairs the server filters by. Defaults to {}.
+
         Returns:
             List[dict]: List containing the data of all MLCubes
         """
-        cubes = self.__get_list(f"{self.server_url}/mlcubes/")
+        url = self.__filtered_url(f"{self.server_url}/mlcubes/", filters)
+        cubes = self.__get_list(url)
         return cubes
 
     def get_cube_metadata(self, cube_uid: int) -> dict:
@@ -218,7 +482,7 @@ class REST(Comms):
         Returns:
             dict: Dictionary containing url and hashes for the cube files
         """
-        res = self.__auth_get(f"{self.server_url}/mlcubes/{cube_uid}/")
+        res = self.__cached_auth_get(f"{self.server_url}/mlcubes/{cube_uid}/")
         if res.status_code != 200:
             log_response_error(res)
             details = format_errors_dict(res.json())
@@ -227,13 +491,39 @@ class REST(Comms):
             )
         return res.json()
 
-    def get_user_cubes(self) -> List[dict]:
+    def get_cubes_metadata(self, cube_uids: List[int]) -> List[dict]:
+        """Retrieves metadata about multiple cubes in a single request. If the
+        metadata cache is enabled, the retrieved metadata is cached so that
+        retrieving any of these cubes individually afterwards doesn't require
+        contacting the server.
+
+        Args:
+            cube_uids (List[int]): UIDs of the desired cubes.
+
+        Returns:
+            List[dict]: Metadata of the cubes found in the server
+        """
+        if not cube_uids:
+            return []
+        ids = ",".join(str(uid) for uid in cube_uids)
+        cubes = self.__get_list(f"{self.server_url}/mlcubes/?id__in={ids}")
+        if config.metadata_cache:
+            for cube in cubes:
+                url = f"{self.server_url}/mlcubes/{cube['id']}/"
+                self.metadata_cache.store(url, cube)
+        return cubes
+
+    def get_user_cubes(self, filters: dict = {}) -> List[dict]:
         """Retrieves metadata from all cubes registered by the user
 
+        Args:
+            filters (dict, optional): field-value pairs the server filters by. Defaults to {}.
+
         Returns:
             List[dict]: List of dictionaries containing the mlcubes registration information
         """
-        cubes = self.__get_list(f"{self.server_url}/me/mlcubes/")
+        url = self.__filtered_url(f"{self.server_url}/me/mlcubes/", filters)
+        cubes = self.__get_list(url)
         return cubes
 
     def upload_benchmark(self, benchmark_dict: dict) -> int:
@@ -268,13 +558,17 @@ class REST(Comms):
             raise CommunicationRetrievalError(f"Could not upload the mlcube: {details}")
         return res.json()
 
-    def get_datasets(self) -> List[dict]:
+    def get_datasets(self, filters: dict = {}) -> List[dict]:
         """Retrieves all datasets in the platform
 
+        Args:
+            filters (dict, optional): field-value pairs the server filters by. Defaults to {}.
+
         Returns:
             List[dict]: List of data from all datasets
         """
-        dsets = self.__get_list(f"{self.server_url}/datasets/")
+        url = self.__filtered_url(f"{self.server_url}/datasets/", filters)
+        dsets = self.__get_list(url)
         return dsets
 
     def get_dataset(self, dset_uid: int) -> dict:
@@ -286,7 +580,7 @@ class REST(Comms):
         Returns:
             dict: Dataset metadata
         """
-        res = self.__auth_get(f"{self.server_url}/datasets/{dset_uid}/")
+        res = self.__cached_auth_get(f"{self.server_url}/datasets/{dset_uid}/")
         if res.status_code != 200:
             log_response_error(res)
             details = format_errors_dict(res.json())
@@ -295,13 +589,17 @@ class REST(Comms):
             )
         return res.json()
 
-    def get_user_datasets(self) -> dict:
+    def get_user_datasets(self, filters: dict = {}) -> dict:
         """Retrieves all datasets registered by the user
 
+        Args:
+            filters (dict, optional): field-value pairs the server filters by. Defaults to {}.
+
         Returns:
             dict: dictionary with the contents of each dataset registration query
         """
-        dsets = self.__get_list(f"{self.server_url}/me/datasets/")
+        url = self.__filtered_url(f"{self.server_url}/me/datasets/", filters)
+        dsets = self.__get_list(url)
         return dsets
 
     def upload_dataset(self, reg_dict: dict) -> int:
@@ -320,18 +618,18 @@ class REST(Comms):
             raise CommunicationRequestError(f"Could not upload the dataset: {details}")
         return res.json()
 
-    def get_results(self) -> List[dict]:
+    def get_results(self, filters: dict = {}) -> List[dict]:
         """Retrieves all results
 
+        Args:
+            filters (dict, optional): field-value pairs the server filters by. Defaults to {}.
+
         Returns:
             List[dict]: List of results
         """
-        res = self.__get_list(f"{self.server_url}/results")
-        if res.status_code != 200:
-            log_response_error(res)
-            details = format_errors_dict(res.json())
-            raise CommunicationRetrievalError(f"Could not retrieve results: {details}")
-        return res.json()
+        url = self.__filtered_url(f"{self.server_url}/results", filters)
+        results = self.__get_list(url)
+        return results
 
     def get_result(self, result_uid: int) -> dict:
         """Retrieves a specific result data
@@ -351,13 +649,17 @@ class REST(Comms):
             )
         return res.json()
 
-    def get_user_results(self) -> dict:
+    def get_user_results(self, filters: dict = {}) -> dict:
         """Retrieves all results registered by the user
 
+        Args:
+            filters (dict, optional): field-value pairs the server filters by. Defaults to {}.
+
         Returns:
             dict: dictionary with the contents of each result registration query
         """
-        results = self.__get_list(f"{self.server_url}/me/results/")
+        url = self.__filtered_url(f"{self.server_url}/me/results/", filters)
+        results = self.__get_list(url)
         return results
 
     def get_benchmark_results(self, benchmark_id: int) -> dict:
@@ -0,0 +1,59 @@
+import asyncio
+from functools import partial
+from typing import Callable, List
+from concurrent.futures import ThreadPoolExecutor
+
+import medperf.config as config
+from medperf.comms.rest import REST
+
+
+class AsyncREST(REST):
+    """REST communication that can issue independent requests concurrently.
+
+    Requests are scheduled on an asyncio event loop and run on a thread pool
+    sharing REST's keep-alive session, so the connection pool is reused across
+    concurrent requests. All the synchronous methods of REST are kept as-is.
+    """
+
+    def __init__(self, source: str):
+        super().__init__(source)
+        self.executor = ThreadPoolExecutor(max_workers=config.comms_pool_maxsize)
+
+    async def run_async(self, func: Callable, *args, **kwargs):
+        """Runs a synchronous comms call without blocking the event loop
+
+        Args:
+            func (Callable): function to run, usually a method of this object
+
+        Returns:
+            Any: whatever func returns
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    async def gather_async(self, *funcs: Callable) -> List:
+        """Runs multiple argument-less calls concurrently
+
+        Returns:
+            List: results of each call, in the same order as funcs
+        """
+        return await asyncio.gather(*[self.run_async(func) for func in funcs])
+
+    def gather(self, *funcs: Callable) -> List:
+        """Synchronous entrypoint for gather_async. Raises the first
+        exception raised by any of the calls.
+
+        Returns:
+            List: results of each call, in the same order as funcs
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.gather_async(*funcs))
+        finally:
+            loop.close()
+
+    def close(self):
+        """Stops the thread pool once the running requests finish,
+        and closes the session"""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        super().close()
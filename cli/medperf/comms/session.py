@@ -0,0 +1,68 @@
+import random
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+
+import medperf.config as config
+
+
+class JitteredRetry(Retry):
+    """urllib3 retry policy whose exponential backoff is randomized
+    (full jitter) and capped, so that many clients hitting a busy server
+    don't retry in lockstep."""
+
+    def get_backoff_time(self) -> float:
+        backoff = min(super().get_backoff_time(), config.comms_backoff_max)
+        return random.uniform(0, backoff)
+
+
+def create_session() -> requests.Session:
+    """Creates a keep-alive session with a pool of reusable connections.
+    Requests failing with connection errors or with any of the retryable
+    status codes are retried with jittered exponential backoff. Non-idempotent
+    requests (e.g. POST) are only retried if the connection could not be established.
+    The session advertises the response encodings it can decompress, so that
+    the server can send compressed responses.
+
+    Returns:
+        requests.Session: the configured session
+    """
+    retries = JitteredRetry(
+        total=config.comms_max_retries,
+        backoff_factor=config.comms_backoff_factor,
+        status_forcelist=config.comms_retry_status_codes,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=config.comms_pool_connections,
+        pool_maxsize=config.comms_pool_maxsize,
+        max_retries=retries,
+    )
+    session = requests.Session()
+    session.headers.update(make_headers(accept_encoding=True))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_connection_stats(session: requests.Session) -> dict:
+    """Counts the connections opened by a session and how many
+    requests reused an already opened connection.
+
+    Args:
+        session (requests.Session): session to inspect
+
+    Returns:
+        dict: number of opened and reused connections
+    """
+    opened = 0
+    num_requests = 0
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+    for adapter in adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools[key]
+            opened += pool.num_connections
+            num_requests += pool.num_requests
+    return {"opened": opened, "reused": num_requests - opened}
@@ -0,0 +1,21 @@
+from typing import Callable, List
+
+import medperf.config as config
+from medperf.comms.rest_async import AsyncREST
+
+
+def gather(*funcs: Callable) -> List:
+    """Runs independent comms calls, concurrently if the configured
+    communication interface supports it, sequentially otherwise.
+
+    Args:
+        funcs (Callable): argument-less calls to run. Use functools.partial
+            for calls that require arguments
+
+    Returns:
+        List: results of each call, in the same order as funcs
+    """
+    comms = config.comms
+    if isinstance(comms, AsyncREST):
+        return comms.gather(*funcs)
+    return [func() for func in funcs]
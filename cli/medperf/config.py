@@ -12,7 +12,7 @@ certificate = None
 local_server = "https://localhost:8000"
 local_certificate = str(BASE_DIR / "server" / "cert.crt")
 
-comms = "REST"
+comms = "REST"  # Use "REST-async" to issue independent requests concurrently
 
 # Auth config
 auth = None  # This will be overwritten by the globally initialized auth class object
@@ -50,6 +50,7 @@ creds_folder = str(config_storage / ".tokens")
 tokens_db = str(config_storage / ".tokens_db")
 
 images_folder = ".images"
+assets_folder = ".assets"
 trash_folder = ".trash"
 tmp_folder = ".tmp"
 demo_datasets_folder = "demo"
@@ -61,6 +62,13 @@ experiments_logs_folder = "experiments_logs"
 results_folder = "results"
 predictions_folder = "predictions"
 tests_folder = "tests"
+metadata_cache_folder = "metadata_cache"
+journals_folder = "journals"
+partial_downloads_folder = ".partial_downloads"
+hash_cache_folder = ".hash_cache"
+storage_index_folder = ".storage_index"
+predictions_cache_folder = ".predictions_cache"
+evaluations_cache_folder = ".evaluations_cache"
 
 default_base_storage = str(Path.home().resolve() / ".medperf")
 
@@ -69,6 +77,10 @@ storage = {
         "base": default_base_storage,
         "name": images_folder,
     },
+    "assets_folder": {
+        "base": default_base_storage,
+        "name": assets_folder,
+    },
     "trash_folder": {
         "base": default_base_storage,
         "name": trash_folder,
@@ -81,6 +93,26 @@ storage = {
         "base": default_base_storage,
         "name": demo_datasets_folder,
     },
+    "partial_downloads_folder": {
+        "base": default_base_storage,
+        "name": partial_downloads_folder,
+    },
+    "hash_cache_folder": {
+        "base": default_base_storage,
+        "name": hash_cache_folder,
+    },
+    "storage_index_folder": {
+        "base": default_base_storage,
+        "name": storage_index_folder,
+    },
+    "predictions_cache_folder": {
+        "base": default_base_storage,
+        "name": predictions_cache_folder,
+    },
+    "evaluations_cache_folder": {
+        "base": default_base_storage,
+        "name": evaluations_cache_folder,
+    },
     "benchmarks_folder": {
         "base": default_base_storage,
         "name": benchmarks_folder,
@@ -109,13 +141,27 @@ storage = {
         "base": default_base_storage,
         "name": tests_folder,
     },
+    "metadata_cache_folder": {
+        "base": default_base_storage,
+        "name": metadata_cache_folder,
+    },
+    "journals_folder": {
+        "base": default_base_storage,
+        "name": journals_folder,
+    },
 }
 
 root_folders = [
     "images_folder",
+    "assets_folder",
     "trash_folder",
     "tmp_folder",
     "demo_datasets_folder",
+    "partial_downloads_folder",
+    "hash_cache_folder",
+    "storage_index_folder",
+    "predictions_cache_folder",
+    "evaluations_cache_folder",
 ]
 server_folders = [
     "benchmarks_folder",
@@ -125,6 +171,8 @@ server_folders = [
     "results_folder",
     "predictions_folder",
     "tests_folder",
+    "metadata_cache_folder",
+    "journals_folder",
 ]
 
 # MedPerf filenames conventions
@@ -137,7 +185,6 @@ log_file = "medperf.log"
 log_package_file = "medperf_logs.tar.gz"
 tarball_filename = "tmp.tar.gz"
 demo_dset_paths_file = "paths.yaml"
-mlcube_cache_file = ".cache_metadata.yaml"
 report_file = "report.yaml"
 metadata_folder = "metadata"
 statistics_filename = "statistics.yaml"
@@ -153,13 +200,69 @@ image_path = "workspace/.image"
 
 # requests
 default_page_size = 32  # This number was chosen arbitrarily
+comms_max_parallel_pages = 8  # Max pages of a list retrieved concurrently
+# Walk lists with server cursors instead of offsets. Pages are then retrieved
+# sequentially, but no element is skipped if the list changes during the walk
+comms_cursor_pagination = False
+comms_pool_connections = 4  # Number of hosts to keep connection pools for
+comms_pool_maxsize = 10  # Max keep-alive connections per host
+comms_max_retries = 3
+comms_backoff_factor = 0.5  # In seconds. Doubles on every retry
+comms_backoff_max = 30  # In seconds
+comms_retry_status_codes = [429, 500, 502, 503, 504]
+# Send JSON request bodies gzip-compressed if they are at least this large.
+# Disabled by default, since older servers don't accept compressed bodies.
+# Compressed requests rejected with a 400 or 415 status are sent again uncompressed
+comms_compress_requests = False
+comms_compression_min_size = 1024  # In bytes
 ddl_stream_chunk_size = 10 * 1024 * 1024  # 10MB. This number was chosen arbitrarily
 ddl_max_redownload_attempts = 3
+# Large files are downloaded over multiple connections, one per byte range,
+# if the server supports range requests
+ddl_max_connections = 4
+ddl_min_part_size = 64 * 1024 * 1024  # 64MB. Smaller files use a single connection
+# Larger tarballs are downloaded before being extracted, since a failed stream
+# can't be resumed
+ddl_max_stream_size = 256 * 1024 * 1024  # 256MB
 wait_before_sending_reports = 30  # In seconds
+metadata_cache = True
+metadata_cache_ttl = 300  # In seconds. Older cached entities are revalidated with the server
+# Reuse the results of evaluations of the same predictions and labels
+# by the same evaluator, instead of running the evaluator again
+evaluations_cache = True
+# Rehash every file instead of reusing the cached hashes of unchanged files
+strict_hashing = False
+hash_max_workers = None  # Threads hashing a folder's files. Defaults to the CPU count
+hash_parallel_min_files = 8  # Folders with fewer files are hashed sequentially
+hash_progress_interval = 0.5  # In seconds
+# Bytes that images, cube workspaces, demo datasets and predictions may use
+# before `medperf storage gc` evicts the least recently used ones
+storage_quota = 100 * 1024**3  # 100GB
+# Number of models whose run files are downloaded ahead of their execution
+prefetch_models = 1
+prefetch_max_bytes = 50 * 1024**3  # 50GB. Prefetching pauses past this budget
+# Models executed concurrently by a benchmark execution. If execution_slots_per_gpu
+# is set, each GPU selected with --gpus gets that many slots, exposing only that GPU
+execution_slots = 1
+execution_slots_per_gpu = 0
+evaluation_slots = 1  # Evaluations running concurrently
+# Models whose evaluation can run while the next models run inference.
+# These evaluations run without GPUs, which are used by the next models
+pipeline_depth = 0
+# How often running models are killed when a benchmark execution is interrupted
+interrupt_poll_interval = 1  # In seconds
+# Keep the evaluator container running across the models of a benchmark
+# execution, if the evaluator supports it
+warm_evaluator = False
+warm_evaluator_poll_interval = 0.5  # In seconds
+warm_evaluator_stop_timeout = 60  # In seconds
 
 # Container config
 gpus = None
 platform = "docker"
+# "mlcube" runs tasks through the mlcube CLI, while "native" invokes the container
+# runtime directly, falling back to the mlcube CLI for unsupported MLCubes
+container_engine = "mlcube"
 prepare_timeout = None
 sanity_check_timeout = None
 statistics_timeout = None
@@ -188,9 +291,13 @@ inline_parameters = [
     "infer_timeout",
     "evaluate_timeout",
     "platform",
+    "container_engine",
     "gpus",
     "cleanup",
     "container_loglevel",
+    "metadata_cache",
+    "strict_hashing",
+    "evaluations_cache",
 ]
 configurable_parameters = inline_parameters + [
     "server",
@@ -0,0 +1,235 @@
+"""Runs MLCube tasks by invoking the container runtime directly, instead of
+going through the mlcube CLI, which starts a Python interpreter and parses the
+MLCube configuration on every task. The task definition in mlcube.yaml is
+translated the same way the mlcube docker and singularity runners do it: each
+folder used by the task parameters is mounted at /mlcube_io<N>, and the task
+receives the paths inside the container as arguments.
+
+Configurations that can't be translated faithfully (e.g. ones using variable
+interpolation, or tasks with their own entrypoint) aren't supported, and
+their tasks should be run through the mlcube CLI instead.
+"""
+
+import os
+import shlex
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+from medperf import config
+
+MOUNT_PREFIX = "/mlcube_io"
+SEPARATORS = ("/", "\\")
+
+
+class UnsupportedTask(Exception):
+    """The task can't be run without the mlcube CLI"""
+
+
+def load_manifest(cube_path: str) -> dict:
+    with open(cube_path) as f:
+        contents = f.read()
+    if "${" in contents:
+        raise UnsupportedTask("The configuration uses variable interpolation")
+    return yaml.safe_load(contents)
+
+
+def _host_path(workspace: str, path: str) -> str:
+    # Relative paths are relative to the MLCube workspace
+    path = os.path.expandvars(os.path.expanduser(path))
+    if not os.path.isabs(path):
+        path = os.path.join(workspace, path)
+    return os.path.normpath(path)
+
+
+def _param_type(name: str, param: dict, host_path: str, io: str) -> str:
+    param_type = param.get("type", "unknown")
+    if param_type != "unknown":
+        return param_type
+    if param["default"].endswith(SEPARATORS):
+        return "directory"
+    if io == "input" and os.path.isdir(host_path):
+        return "directory"
+    if io == "input" and os.path.isfile(host_path):
+        return "file"
+    raise UnsupportedTask(f"Unable to tell the type of parameter {name}")
+
+
+def task_mounts(
+    manifest: dict,
+    workspace: str,
+    task: str,
+    args: Dict[str, str],
+    read_protected_input: bool = True,
+) -> Tuple[Dict[str, str], List[str], Dict[str, str]]:
+    """Translates the parameters of a task into mounts.
+
+    Args:
+        manifest (dict): MLCube configuration
+        workspace (str): MLCube workspace folder
+        task (str): task to run
+        args (Dict[str, str]): values of the task parameters, overriding their defaults
+        read_protected_input (bool, optional): Whether to mount inputs as read-only.
+
+    Returns:
+        mounts (Dict[str, str]): mount path in the container of each host folder
+        task_args (List[str]): arguments of the task
+        mounts_opts (Dict[str, str]): mount option ("ro" or "rw") of each host folder
+    """
+    task_def = (manifest.get("tasks") or {}).get(task)
+    if task_def is None:
+        raise UnsupportedTask(f"The MLCube has no task {task}")
+    if task_def.get("entrypoint"):
+        raise UnsupportedTask(f"Task {task} has its own entrypoint")
+    params = task_def.get("parameters") or {}
+
+    mounts = {}
+    task_args = []
+    mounts_opts = {}
+    for io in ["input", "output"]:
+        for name, param in (params.get(io + "s") or {}).items():
+            if not isinstance(param, dict):
+                param = {"default": param}
+            param = {"default": name, **param}
+            param["default"] = str(args.get(name, param["default"]))
+            host_path = _host_path(workspace, param["default"])
+            param_type = _param_type(name, param, host_path, io)
+            file_name = None
+            if param_type == "file":
+                host_path, file_name = os.path.split(host_path)
+            os.makedirs(host_path, exist_ok=True)
+            if host_path not in mounts:
+                mounts[host_path] = f"{MOUNT_PREFIX}{len(mounts)}"
+            container_path = mounts[host_path]
+            if file_name is not None:
+                container_path += "/" + file_name
+            task_args.append(f"--{name}={container_path}")
+
+            default_opts = "ro" if io == "input" and read_protected_input else "rw"
+            opts = param.get("opts", default_opts)
+            if mounts_opts.get(host_path, opts) != opts:
+                # A folder used as both read-only and writable is writable
+                opts = "rw"
+            mounts_opts[host_path] = opts
+    return mounts, task_args, mounts_opts
+
+
+def _gpu_devices(gpus: str) -> Optional[str]:
+    if gpus.startswith("device="):
+        return gpus[len("device="):]
+
+
+def docker_command(
+    manifest: dict,
+    task: str,
+    mounts: Dict[str, str],
+    task_args: List[str],
+    mounts_opts: Dict[str, str],
+    gpus: str = None,
+) -> List[str]:
+    docker = manifest.get("docker") or {}
+    if docker.get("tar_file"):
+        raise UnsupportedTask("The image is loaded from a tarball")
+    cmd = ["docker", "run", "--rm", "--network=none"]
+    run_args = docker.get("gpu_args" if gpus is not None else "cpu_args") or ""
+    cmd += shlex.split(run_args)
+    # Run as the current user, so that outputs are owned by them
+    cmd += ["-u", f"{os.getuid()}:{os.getgid()}"]
+    if gpus is not None:
+        cmd.append(f"--gpus={gpus}")
+    env_args = docker.get("env_args") or {}
+    if not isinstance(env_args, dict):
+        raise UnsupportedTask("The docker environment arguments aren't a mapping")
+    env_args = dict(env_args)
+    if config.container_loglevel:
+        env_args["MEDPERF_LOGLEVEL"] = config.container_loglevel.upper()
+    for key, value in env_args.items():
+        cmd += ["-e", f"{key}={value}"]
+    for host_path, container_path in mounts.items():
+        volume = f"{host_path}:{container_path}"
+        if mounts_opts[host_path] == "ro":
+            volume += ":ro"
+        cmd += ["--volume", volume]
+    if not docker.get("image"):
+        raise UnsupportedTask("The MLCube has no docker image")
+    cmd += [docker["image"], task] + task_args
+    return cmd
+
+
+def singularity_command(
+    manifest: dict,
+    workspace: str,
+    task: str,
+    mounts: Dict[str, str],
+    task_args: List[str],
+    mounts_opts: Dict[str, str],
+    gpus: str = None,
+    image_name: str = None,
+) -> List[str]:
+    singularity = manifest.get("singularity")
+    if singularity is None:
+        # Images converted from docker ones
+        singularity = {"image": image_name}
+    image_dir = singularity.get("image_dir", ".image")
+    image_file = os.path.join(_host_path(workspace, image_dir), singularity["image"])
+    cmd = ["singularity", "run"]
+    # -e discards host env vars, and -C isolates the container
+    cmd += shlex.split(singularity.get("run_args") or "") + ["-eC"]
+    cmd += ["--net", "--network=none"]
+    if gpus is not None:
+        cmd.append("--nv")
+        devices = _gpu_devices(gpus)
+        if devices is not None:
+            cmd += ["--env", f"CUDA_VISIBLE_DEVICES={devices}"]
+    for host_path, container_path in mounts.items():
+        bind = f"{host_path}:{container_path}"
+        if mounts_opts[host_path] == "ro":
+            bind += ":ro"
+        cmd += ["--bind", bind]
+    cmd += [image_file, task] + task_args
+    return cmd
+
+
+def run_command(
+    cube_path: str,
+    task: str,
+    args: Dict[str, str],
+    platform: str,
+    gpus: str = None,
+    read_protected_input: bool = True,
+    image_name: str = None,
+) -> str:
+    """Builds the command that runs a task of an MLCube with the container runtime.
+
+    Args:
+        cube_path (str): path to the mlcube.yaml file
+        task (str): task to run
+        args (Dict[str, str]): values of the task parameters
+        platform (str): "docker" or "singularity"
+        gpus (str, optional): GPUs to expose to the container
+        read_protected_input (bool, optional): Whether to mount inputs as read-only.
+        image_name (str, optional): singularity image to run, if the MLCube has
+                                    no singularity configuration
+
+    Raises:
+        UnsupportedTask: if the task can't be run without the mlcube CLI
+
+    Returns:
+        str: the command
+    """
+    manifest = load_manifest(cube_path)
+    workspace = os.path.join(os.path.dirname(cube_path), config.workspace_path)
+    mounts, task_args, mounts_opts = task_mounts(
+        manifest, workspace, task, args, read_protected_input
+    )
+    if platform == "docker":
+        cmd = docker_command(manifest, task, mounts, task_args, mounts_opts, gpus)
+    elif platform == "singularity":
+        cmd = singularity_command(
+            manifest, workspace, task, mounts, task_args, mounts_opts, gpus, image_name
+        )
+    else:
+        raise UnsupportedTask(f"Unsupported platform {platform}")
+    logging.debug(f"Translated task {task} of {cube_path} into a {platform} command")
+    return shlex.join(cmd)
@@ -130,6 +130,12 @@ def configurable(func: Callable) -> Callable:
             "--platform",
             help="Platform to use for MLCube. [docker | singularity]",
         ),
+        container_engine: str = typer.Option(
+            config.container_engine,
+            "--container-engine",
+            help="How to run MLCube tasks. [mlcube | native] "
+            "'native' invokes the platform directly instead of the mlcube CLI",
+        ),
         gpus: str = typer.Option(
             config.gpus,
             "--gpus",
@@ -144,6 +150,21 @@ def configurable(func: Callable) -> Callable:
             "--cleanup/--no-cleanup",
             help="Wether to clean up temporary medperf storage after execution",
         ),
+        metadata_cache: bool = typer.Option(
+            config.metadata_cache,
+            "--metadata-cache/--no-metadata-cache",
+            help="Wether to reuse recently retrieved benchmarks, mlcubes and datasets metadata",
+        ),
+        strict_hashing: bool = typer.Option(
+            config.strict_hashing,
+            "--strict-hashing/--no-strict-hashing",
+            help="Wether to rehash all files instead of reusing the hashes of unchanged files",
+        ),
+        evaluations_cache: bool = typer.Option(
+            config.evaluations_cache,
+            "--evaluations-cache/--no-evaluations-cache",
+            help="Wether to reuse the results of evaluating the same predictions and labels",
+        ),
         **kwargs,
     ):
         return func(*args, **kwargs)
@@ -206,6 +227,12 @@ def add_inline_parameters(func: Callable) -> Callable:
             "--platform",
             help="Platform to use for MLCube. [docker | singularity]",
         ),
+        container_engine: str = typer.Option(
+            config.container_engine,
+            "--container-engine",
+            help="How to run MLCube tasks. [mlcube | native] "
+            "'native' invokes the platform directly instead of the mlcube CLI",
+        ),
         gpus: str = typer.Option(
             config.gpus,
             "--gpus",
@@ -224,6 +251,21 @@ def add_inline_parameters(func: Callable) -> Callable:
             "--cleanup/--no-cleanup",
             help="Whether to clean up temporary medperf storage after execution",
         ),
+        metadata_cache: bool = typer.Option(
+            config.metadata_cache,
+            "--metadata-cache/--no-metadata-cache",
+            help="Whether to reuse recently retrieved benchmarks, mlcubes and datasets metadata",
+        ),
+        strict_hashing: bool = typer.Option(
+            config.strict_hashing,
+            "--strict-hashing/--no-strict-hashing",
+            help="Whether to rehash all files instead of reusing the hashes of unchanged files",
+        ),
+        evaluations_cache: bool = typer.Option(
+            config.evaluations_cache,
+            "--evaluations-cache/--no-evaluations-cache",
+            help="Whether to reuse the results of evaluating the same predictions and labels",
+        ),
         **kwargs,
     ):
         return func(*args, **kwargs)
@@ -99,10 +99,20 @@ class Benchmark(Entity, Uploadable, MedperfSchema, ApprovableSchema, DeployableS
         Returns:
             callable: A function for retrieving remote entities with the applied prefilters
         """
+        # Filters the server can apply itself
+        supported_filters = ["owner", "state", "approval_status", "is_valid"]
+        remote_filters = {
+            key: val for key, val in filters.items() if key in supported_filters
+        }
         comms_fn = config.comms.get_benchmarks
         if "owner" in filters and filters["owner"] == get_medperf_user_data()["id"]:
             comms_fn = config.comms.get_user_benchmarks
-        return comms_fn
+            remote_filters.pop("owner")
+
+        def get_benchmarks():
+            return comms_fn(filters=remote_filters)
+
+        return get_benchmarks
 
     @classmethod
     def __local_all(cls) -> List["Benchmark"]:
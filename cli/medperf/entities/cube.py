@@ -23,6 +23,8 @@ from medperf.exceptions import (
 )
 import medperf.config as config
 from medperf.comms.entity_resources import resources
+from medperf.containers import native
+from medperf.storage.index import touch
 from medperf.account_management import get_medperf_user_data
 
 
@@ -118,11 +120,20 @@ class Cube(Entity, Uploadable, MedperfSchema, DeployableSchema):
         Returns:
             callable: A function for retrieving remote entities with the applied prefilters
         """
+        # Filters the server can apply itself
+        supported_filters = ["owner", "state", "is_valid"]
+        remote_filters = {
+            key: val for key, val in filters.items() if key in supported_filters
+        }
         comms_fn = config.comms.get_cubes
         if "owner" in filters and filters["owner"] == get_medperf_user_data()["id"]:
             comms_fn = config.comms.get_user_cubes
+            remote_filters.pop("owner")
+
+        def get_cubes():
+            return comms_fn(filters=remote_filters)
 
-        return comms_fn
+        return get_cubes
 
     @classmethod
     def __local_all(cls) -> List["Cube"]:
@@ -170,6 +181,24 @@ class Cube(Entity, Uploadable, MedperfSchema, DeployableSchema):
         cube.download_config_files()
         return cube
 
+    @classmethod
+    def get_many(cls, cube_uids: List[int]) -> List["Cube"]:
+        """Retrieves multiple MLCubes from the server in a single request
+        and stores them locally. Unlike `get`, the cubes' files are not downloaded.
+
+        Args:
+            cube_uids (List[int]): UIDs of the cubes.
+
+        Returns:
+            List[Cube]: the cubes found in the server
+        """
+        logging.debug(f"Retrieving mlcubes {cube_uids} remotely")
+        cubes_meta = config.comms.get_cubes_metadata(cube_uids)
+        cubes = [cls(**meta) for meta in cubes_meta]
+        for cube in cubes:
+            cube.write()
+        return cubes
+
     @classmethod
     def __remote_get(cls, cube_uid: int) -> "Cube":
         logging.debug(f"Retrieving mlcube {cube_uid} remotely")
@@ -306,6 +335,7 @@ class Cube(Entity, Uploadable, MedperfSchema, DeployableSchema):
         string_params: Dict[str, str] = {},
         timeout: int = None,
         read_protected_input: bool = True,
+        gpus: str = None,
         **kwargs,
     ):
         """Executes a given task on the cube instance
@@ -315,14 +345,47 @@ class Cube(Entity, Uploadable, MedperfSchema, DeployableSchema):
             string_params (Dict[str], optional): Extra parameters that can't be passed as normal function args.
                                                  Defaults to {}.
             timeout (int, optional): timeout for the task in seconds. Defaults to None.
+            gpus (str, optional): GPUs to expose to the cube. Defaults to config.gpus.
+                                  "0" exposes no GPUs.
             read_protected_input (bool, optional): Wether to disable write permissions on input volumes. Defaults to True.
             kwargs (dict): additional arguments that are passed directly to the mlcube command
         """
+        touch(os.path.join(self.path, config.workspace_path))
         kwargs.update(string_params)
+        if gpus is None:
+            gpus = config.gpus
+        if str(gpus).strip() == "0":
+            # No GPUs are exposed to the cube
+            gpus = None
+        if config.container_engine not in ["mlcube", "native"]:
+            raise InvalidArgumentError("Unsupported container engine")
+        cmd = None
+        if config.container_engine == "native":
+            cmd = self._native_run_command(task, gpus, read_protected_input, kwargs)
+        if cmd is None:
+            cmd = self._mlcube_run_command(task, gpus, read_protected_input, kwargs)
+
+        logging.info(f"Running MLCube command: {cmd}")
+        with spawn_and_kill(cmd, timeout=timeout) as proc_wrapper:
+            proc = proc_wrapper.proc
+            proc_out = combine_proc_sp_text(proc)
+
+        if output_logs is not None:
+            with open(output_logs, "w") as f:
+                f.write(proc_out)
+        if proc.exitstatus != 0:
+            raise ExecutionError("There was an error while executing the cube")
+
+        log_storage()
+        return proc
+
+    def _mlcube_run_command(
+        self, task: str, gpus: str, read_protected_input: bool, kwargs: dict
+    ) -> str:
         cmd = f"mlcube --log-level {config.loglevel} run"
         cmd += f" --mlcube={self.cube_path} --task={task} --platform={config.platform} --network=none"
-        if config.gpus is not None:
-            cmd += f" --gpus={config.gpus}"
+        if gpus is not None:
+            cmd += f" --gpus={gpus}"
         if read_protected_input:
             cmd += " --mount=ro"
         for k, v in kwargs.items():
@@ -365,20 +428,28 @@ class Cube(Entity, Uploadable, MedperfSchema, DeployableSchema):
         # set accelerator count to zero to avoid unexpected behaviours and
         # force mlcube to only use --gpus to figure out GPU config
         cmd += " -Pplatform.accelerator_count=0"
-
-        logging.info(f"Running MLCube command: {cmd}")
-        with spawn_and_kill(cmd, timeout=timeout) as proc_wrapper:
-            proc = proc_wrapper.proc
-            proc_out = combine_proc_sp_text(proc)
-
-        if output_logs is not None:
-            with open(output_logs, "w") as f:
-                f.write(proc_out)
-        if proc.exitstatus != 0:
-            raise ExecutionError("There was an error while executing the cube")
-
-        log_storage()
-        return proc
+        return cmd
+
+    def _native_run_command(
+        self, task: str, gpus: str, read_protected_input: bool, kwargs: dict
+    ) -> Optional[str]:
+        """Command running the task with the container runtime directly.
+        None if the task can only be run through the mlcube CLI"""
+        if self.image_tarball_url:
+            logging.debug(f"MLCube {self.name} image tarball requires mlcube")
+            return
+        try:
+            return native.run_command(
+                self.cube_path,
+                task,
+                kwargs,
+                config.platform,
+                gpus=gpus,
+                read_protected_input=read_protected_input,
+                image_name=self._converted_singularity_image_name,
+            )
+        except native.UnsupportedTask as e:
+            logging.debug(f"Running task {task} of {self.name} with mlcube: {e}")
 
     def get_default_output(self, task: str, out_key: str, param_key: str = None) -> str:
         """Returns the output parameter specified in the mlcube.yaml file
@@ -430,6 +501,17 @@ class Cube(Entity, Uploadable, MedperfSchema, DeployableSchema):
 
         return cube
 
+    @property
+    def content_hashes(self) -> Dict[str, Optional[str]]:
+        """Hashes of the cube files, which identify the version of the cube"""
+        return {
+            "mlcube_hash": self.mlcube_hash,
+            "parameters_hash": self.parameters_hash,
+            "additional_files_tarball_hash": self.additional_files_tarball_hash,
+            "image_tarball_hash": self.image_tarball_hash,
+            "image_hash": self.image_hash,
+        }
+
     def todict(self) -> Dict:
         return self.extended_dict()
 
@@ -136,18 +136,27 @@ class Dataset(Entity, Uploadable, MedperfSchema, DeployableSchema):
         Returns:
             callable: A function for retrieving remote entities with the applied prefilters
         """
+        # Filters the server can apply itself
+        supported_filters = ["owner", "state", "is_valid"]
+        remote_filters = {
+            key: val for key, val in filters.items() if key in supported_filters
+        }
         comms_fn = config.comms.get_datasets
         if "owner" in filters and filters["owner"] == get_medperf_user_data()["id"]:
             comms_fn = config.comms.get_user_datasets
+            remote_filters.pop("owner")
 
         if "mlcube" in filters and filters["mlcube"] is not None:
 
             def func():
                 return config.comms.get_mlcube_datasets(filters["mlcube"])
 
-            comms_fn = func
+        else:
+
+            def func():
+                return comms_fn(filters=remote_filters)
 
-        return comms_fn
+        return func
 
     @classmethod
     def __local_all(cls) -> List["Dataset"]:
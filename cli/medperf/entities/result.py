@@ -89,20 +89,40 @@ class Result(Entity, Uploadable, MedperfSchema, ApprovableSchema):
         Returns:
             callable: A function for retrieving remote entities with the applied prefilters
         """
+        # Filters the server can apply itself
+        supported_filters = [
+            "owner",
+            "approval_status",
+            "is_valid",
+            "benchmark",
+            "dataset",
+            "model",
+        ]
+        remote_filters = {
+            key: val for key, val in filters.items() if key in supported_filters
+        }
         comms_fn = config.comms.get_results
-        if "owner" in filters and filters["owner"] == get_medperf_user_data()["id"]:
+        is_owner = (
+            "owner" in filters and filters["owner"] == get_medperf_user_data()["id"]
+        )
+        if is_owner:
             comms_fn = config.comms.get_user_results
-        if "benchmark" in filters and filters["benchmark"] is not None:
+            remote_filters.pop("owner")
+
+        if not is_owner and filters.get("benchmark") is not None:
             bmk = filters["benchmark"]
 
-            def get_benchmark_results():
+            def get_results():
                 # Decorate the benchmark results remote function so it has the same signature
                 # as all the comms_fns
                 return config.comms.get_benchmark_results(bmk)
 
-            comms_fn = get_benchmark_results
+        else:
+
+            def get_results():
+                return comms_fn(filters=remote_filters)
 
-        return comms_fn
+        return get_results
 
     @classmethod
     def __local_all(cls) -> List["Result"]:
@@ -0,0 +1,66 @@
+"""Memoized evaluation results, keyed by the content hashes of the evaluator
+and by the hashes of the predictions and labels it evaluated, so that the
+evaluator doesn't run again on inputs it already evaluated.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+from typing import Optional
+
+import yaml
+
+from medperf import config
+from medperf.entities.cube import Cube
+from medperf.utils import generate_tmp_path, get_folder_manifest
+from .index import touch
+from .predictions import cube_version
+
+
+def _folder_hash(path: str) -> str:
+    # Unlike get_folders_hash, the hash depends on the files' names
+    manifest = json.dumps(get_folder_manifest(path), sort_keys=True)
+    return hashlib.sha256(manifest.encode("utf-8")).hexdigest()
+
+
+def evaluation_key(
+    evaluator: Cube, preds_path: str, labels_path: str
+) -> Optional[str]:
+    """Key of the evaluation of the given predictions and labels.
+    None if the evaluator version can't be identified by its hashes,
+    in which case its results aren't memoized."""
+    evaluator_hashes = cube_version(evaluator)
+    if evaluator_hashes is None:
+        return
+    key = {
+        "evaluator": evaluator_hashes,
+        "predictions": _folder_hash(preds_path),
+        "labels": _folder_hash(labels_path),
+    }
+    key = json.dumps(key, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(key).hexdigest()
+
+
+def _results_path(key: str) -> str:
+    return os.path.join(config.evaluations_cache_folder, key + ".yaml")
+
+
+def get_memoized_results(key: str) -> Optional[dict]:
+    """Results of a previous evaluation with the same key, if any"""
+    results_path = _results_path(key)
+    if not os.path.exists(results_path):
+        return
+    with open(results_path) as f:
+        results = yaml.safe_load(f)
+    touch(results_path)
+    return results
+
+
+def memoize_results(key: str, results_path: str):
+    """Stores the results of an evaluation under its key"""
+    tmp_path = generate_tmp_path()
+    shutil.copyfile(results_path, tmp_path)
+    os.makedirs(config.evaluations_cache_folder, exist_ok=True)
+    os.replace(tmp_path, _results_path(key))
+    touch(_results_path(key))
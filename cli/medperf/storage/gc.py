@@ -0,0 +1,187 @@
+"""Evicts the least recently used storage entries until the storage usage
+fits a quota. Entries are images and MLCube assets in the shared stores,
+workspaces of cubes retrieved from the server, demo datasets, predictions
+and cached predictions.
+All of them can be retrieved or regenerated again when needed.
+
+Entries are never evicted if they are pinned by an in-progress execution,
+if they are used by a registered operational dataset, or if they are
+stored assets still linked to a cube.
+"""
+
+import os
+import shutil
+import logging
+from typing import List, Optional, Set, Tuple
+
+from medperf import config
+from medperf.comms.entity_resources.store import (
+    REFS_FOLDER,
+    STAGING_FOLDER,
+    asset_lock,
+    asset_refcount,
+)
+from medperf.entities.dataset import Dataset
+from .index import forget, last_access, pinned_paths
+
+STORE_KINDS = ["image", "asset"]
+STORE_METADATA = [REFS_FOLDER, STAGING_FOLDER]
+
+
+def _children(folder: str, exclude: List[str] = []) -> List[str]:
+    if not os.path.isdir(folder):
+        return []
+    return [
+        os.path.join(folder, name)
+        for name in sorted(os.listdir(folder))
+        if name not in exclude
+    ]
+
+
+def storage_entries() -> List[Tuple[str, str]]:
+    """Lists the evictable storage entries as (kind, path) pairs"""
+    entries = []
+    for path in _children(config.images_folder, exclude=STORE_METADATA):
+        entries.append(("image", path))
+    for path in _children(config.assets_folder, exclude=STORE_METADATA):
+        entries.append(("asset", path))
+    for cube_path in _children(config.cubes_folder):
+        workspace = os.path.join(cube_path, config.workspace_path)
+        # Local cubes can't be retrieved again
+        if os.path.basename(cube_path).isdigit() and os.path.isdir(workspace):
+            entries.append(("workspace", workspace))
+    for path in _children(config.demo_datasets_folder):
+        entries.append(("demo", path))
+    for model_path in _children(config.predictions_folder):
+        for path in _children(model_path):
+            entries.append(("predictions", path))
+    for path in _children(config.predictions_cache_folder):
+        entries.append(("cached_predictions", path))
+    return entries
+
+
+def _operational_datasets_paths() -> List[str]:
+    # Predictions of operational datasets are not pinned: they are only
+    # needed while an execution runs, which pins them, and can be generated
+    # again otherwise
+    paths = []
+    for dset in Dataset.all(local_only=True):
+        if dset.state != "OPERATION":
+            continue
+        prep_cube_path = os.path.join(
+            config.cubes_folder, str(dset.data_preparation_mlcube)
+        )
+        paths.append(os.path.join(prep_cube_path, config.workspace_path))
+        paths += [dset.data_path, dset.labels_path]
+    return paths
+
+
+def _is_pinned(path: str, pins: List[str]) -> bool:
+    path = os.path.normpath(os.path.abspath(path))
+    for pin in pins:
+        # Pinning a path also pins what contains it and what it contains
+        if path == pin or pin.startswith(path + os.sep):
+            return True
+        if path.startswith(pin + os.sep):
+            return True
+    return False
+
+
+def _files(path: str):
+    if os.path.islink(path) or not os.path.isdir(path):
+        yield os.lstat(path)
+        return
+    for root, _, files in os.walk(path):
+        for name in files:
+            yield os.lstat(os.path.join(root, name))
+
+
+def storage_usage(entries: List[Tuple[str, str]]) -> int:
+    """Bytes used by the given storage entries. Hardlinked files are
+    only counted once."""
+    seen: Set[Tuple[int, int]] = set()
+    usage = 0
+    for _, path in entries:
+        for stat in _files(path):
+            if (stat.st_dev, stat.st_ino) in seen:
+                continue
+            seen.add((stat.st_dev, stat.st_ino))
+            usage += stat.st_size
+    return usage
+
+
+def _reclaimable_size(path: str) -> int:
+    # Files that are hardlinked elsewhere aren't freed when removed
+    return sum(stat.st_size for stat in _files(path) if stat.st_nlink == 1)
+
+
+def _remove(path: str) -> int:
+    """Removes a storage entry. Returns the number of bytes freed,
+    which is less than its reclaimable size if it's only partially removed"""
+    size = _reclaimable_size(path)
+    try:
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    except OSError as e:
+        logging.error(f"Could not remove {path}: {e}")
+        if os.path.lexists(path):
+            return size - _reclaimable_size(path)
+    return size
+
+
+def _evict(kind: str, path: str) -> Optional[int]:
+    """Evicts a storage entry, unless it's a stored asset still linked to
+    a cube. Returns the number of bytes freed, or None if not evicted"""
+    if kind not in STORE_KINDS:
+        return _remove(path)
+    # Assets are locked while being retrieved and linked to a cube
+    with asset_lock(path):
+        if asset_refcount(path) > 0:
+            return
+        return _remove(path)
+
+
+def collect_garbage(quota: int) -> int:
+    """Evicts the least recently used storage entries until the storage
+    usage is under the quota.
+
+    Args:
+        quota (int): maximum number of bytes the storage entries may use
+
+    Returns:
+        reclaimed (int): number of bytes freed
+    """
+    entries = storage_entries()
+    usage = storage_usage(entries)
+    logging.info(f"Storage usage: {usage} bytes, quota: {quota} bytes")
+    pins = pinned_paths() + [
+        os.path.normpath(os.path.abspath(path))
+        for path in _operational_datasets_paths()
+    ]
+    entries.sort(key=lambda entry: last_access(entry[1]) or 0)
+
+    reclaimed = 0
+    evicted = set()
+    progress = True
+    # Evicting workspaces unlinks assets, which can then be evicted
+    # in a later pass
+    while usage > quota and progress:
+        progress = False
+        for kind, path in entries:
+            if usage <= quota:
+                break
+            if path in evicted or _is_pinned(path, pins):
+                continue
+            freed = _evict(kind, path)
+            if freed is None:
+                continue
+            logging.info(f"Evicted {kind} {path} ({freed} bytes)")
+            if not os.path.lexists(path):
+                forget(path)
+            evicted.add(path)
+            usage -= freed
+            reclaimed += freed
+            progress = True
+    return reclaimed
@@ -0,0 +1,123 @@
+"""Keeps track of when storage entries were last used, and of the entries
+that must not be removed because they are in use. Both are used by the
+storage garbage collector to decide what to evict.
+
+Each record is a small file of its own, so that concurrent medperf
+processes can update the index without coordinating.
+"""
+
+import os
+import json
+import time
+import uuid
+import hashlib
+import logging
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from medperf import config
+
+ACCESS_FOLDER = "access"
+PINS_FOLDER = "pins"
+
+
+def _normpath(path: str) -> str:
+    return os.path.normpath(os.path.abspath(path))
+
+
+def _access_record_path(path: str) -> str:
+    key = hashlib.sha256(path.encode("utf-8")).hexdigest()
+    return os.path.join(config.storage_index_folder, ACCESS_FOLDER, key + ".json")
+
+
+def _write_json(path: str, contents):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Unique per thread and process, which may record the same entry
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(contents, f)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: str):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logging.debug(f"Ignoring unreadable storage index record {path}: {e}")
+
+
+def touch(path: str):
+    """Records that a storage entry was just used"""
+    path = _normpath(path)
+    try:
+        _write_json(_access_record_path(path), {"path": path, "time": time.time()})
+    except OSError as e:
+        # The index is only a hint for the garbage collector
+        logging.debug(f"Could not record access to {path}: {e}")
+
+
+def last_access(path: str) -> Optional[float]:
+    """Time a storage entry was last used. Entries used before they were
+    tracked are assumed to be last used when they were last modified."""
+    path = _normpath(path)
+    record = _read_json(_access_record_path(path))
+    if record is not None and record.get("path") == path:
+        return record["time"]
+    if os.path.lexists(path):
+        return os.lstat(path).st_mtime
+
+
+def forget(path: str):
+    """Removes the access record of a storage entry"""
+    record_path = _access_record_path(_normpath(path))
+    if os.path.exists(record_path):
+        os.remove(record_path)
+
+
+def _pid_is_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+@contextmanager
+def pinned(paths: List[str]) -> Iterator[None]:
+    """Protects the given storage entries from being evicted
+    by the garbage collector while inside the context"""
+    pin_name = f"{os.getpid()}-{uuid.uuid4().hex}.json"
+    pin_path = os.path.join(config.storage_index_folder, PINS_FOLDER, pin_name)
+    paths = [_normpath(path) for path in paths if path]
+    _write_json(pin_path, {"pid": os.getpid(), "paths": paths})
+    try:
+        yield
+    finally:
+        if os.path.exists(pin_path):
+            os.remove(pin_path)
+
+
+def pinned_paths() -> List[str]:
+    """Storage entries pinned by running medperf processes. Pins left
+    behind by processes that are no longer running are removed."""
+    pins_folder = os.path.join(config.storage_index_folder, PINS_FOLDER)
+    if not os.path.exists(pins_folder):
+        return []
+    paths = []
+    for pin_name in os.listdir(pins_folder):
+        if not pin_name.endswith(".json"):
+            continue
+        pin_path = os.path.join(pins_folder, pin_name)
+        pin = _read_json(pin_path)
+        if pin is None:
+            continue
+        if not _pid_is_running(pin["pid"]):
+            logging.debug(f"Removing stale storage pin {pin_path}")
+            os.remove(pin_path)
+            continue
+        paths += pin["paths"]
+    return paths
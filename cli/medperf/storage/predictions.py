@@ -0,0 +1,111 @@
+"""Cache of model predictions, keyed by the content hashes of the model and
+by the dataset's generated UID, so that predictions can be reused whenever
+the same model version runs on the same data, e.g. when only the evaluator
+changed.
+
+Each entry holds a copy of the predictions, hardlinked when possible, and a
+manifest with the hash of each prediction file. The manifest is written once
+the predictions are completely stored, and is checked before reusing them.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+from typing import Optional
+
+from medperf import config
+from medperf.entities.cube import Cube
+from medperf.entities.dataset import Dataset
+from medperf.utils import generate_tmp_path, get_folder_manifest, remove_path
+from .index import touch
+
+PREDICTIONS_FOLDER = "predictions"
+MANIFEST_FILE = "manifest.json"
+
+
+def cube_version(cube: Cube) -> Optional[dict]:
+    """Content hashes identifying the version of a cube, or None
+    if the cube has no hashes of its mlcube file and image"""
+    hashes = cube.content_hashes
+    if not hashes["mlcube_hash"]:
+        return
+    if not hashes["image_hash"] and not hashes["image_tarball_hash"]:
+        return
+    return hashes
+
+
+def cache_key(model: Cube, dataset: Dataset) -> Optional[str]:
+    """Key of the predictions of a model on a dataset. None if the model
+    version can't be identified by its hashes, in which case its predictions
+    aren't cached."""
+    model_hashes = cube_version(model)
+    if model_hashes is None:
+        return
+    key = {"model": model_hashes, "dataset": dataset.generated_uid}
+    key = json.dumps(key, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(key).hexdigest()
+
+
+def cache_entry_path(key: str) -> str:
+    return os.path.join(config.predictions_cache_folder, key)
+
+
+def _copy_predictions(src: str, dst: str):
+    def copy_function(src_file, dst_file):
+        try:
+            os.link(src_file, dst_file)
+        except OSError:
+            shutil.copy2(src_file, dst_file)
+
+    shutil.copytree(src, dst, copy_function=copy_function)
+
+
+def get_cached_predictions(model: Cube, dataset: Dataset) -> Optional[str]:
+    """Location of the cached predictions of a model on a dataset, if they
+    are complete and unchanged. Else None.
+    """
+    key = cache_key(model, dataset)
+    if key is None:
+        return
+    entry = cache_entry_path(key)
+    manifest_path = os.path.join(entry, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return
+    preds_path = os.path.join(entry, PREDICTIONS_FOLDER)
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if get_folder_manifest(preds_path) != manifest:
+        logging.warning(f"Discarding corrupted cached predictions at {entry}")
+        remove_path(entry)
+        return
+    touch(entry)
+    return preds_path
+
+
+def cache_predictions(model: Cube, dataset: Dataset, preds_path: str):
+    """Stores the predictions of a model on a dataset in the cache"""
+    key = cache_key(model, dataset)
+    if key is None:
+        logging.debug(f"Predictions of model {model.id} can't be cached")
+        return
+    entry = cache_entry_path(key)
+    if os.path.exists(os.path.join(entry, MANIFEST_FILE)):
+        return
+    # Predictions are stored in a temporary location first,
+    # so that an entry is never left incomplete
+    tmp_entry = generate_tmp_path()
+    _copy_predictions(preds_path, os.path.join(tmp_entry, PREDICTIONS_FOLDER))
+    manifest = get_folder_manifest(os.path.join(tmp_entry, PREDICTIONS_FOLDER))
+    with open(os.path.join(tmp_entry, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f)
+    remove_path(entry)
+    os.makedirs(config.predictions_cache_folder, exist_ok=True)
+    shutil.move(tmp_entry, entry)
+    touch(entry)
+
+
+def restore_predictions(cached_preds_path: str, preds_path: str):
+    """Copies cached predictions to where the evaluator expects them"""
+    _copy_predictions(cached_preds_path, preds_path)
@@ -46,6 +46,27 @@ def test_fails_if_dataset_is_not_registered(mocker, comms, ui, dataset, benchmar
         AssociateDataset.run(1, 1)
 
 
+@pytest.mark.parametrize("dataset", [1], indirect=True)
+@pytest.mark.parametrize("benchmark", [1], indirect=True)
+def test_dataset_and_benchmark_are_retrieved_together(
+    mocker, comms, ui, dataset, benchmark
+):
+    # Arrange
+    gather_spy = mocker.patch(
+        PATCH_ASSOC.format("gather"), return_value=[dataset, benchmark]
+    )
+    mocker.patch(PATCH_ASSOC.format("approval_prompt"), return_value=True)
+    exec_ret = [TestResult()]
+    mocker.patch(PATCH_ASSOC.format("BenchmarkExecution.run"), return_value=exec_ret)
+
+    # Act
+    AssociateDataset.run(1, 1)
+
+    # Assert
+    gather_spy.assert_called_once()
+    assert len(gather_spy.call_args.args) == 2
+
+
 @pytest.mark.parametrize("dataset", [1], indirect=True)
 @pytest.mark.parametrize("benchmark", [1], indirect=True)
 def test_requests_approval_from_user(mocker, comms, ui, dataset, benchmark):
@@ -78,3 +78,21 @@ def test_stops_if_not_approved(mocker, comms, ui, cube, benchmark):
     # Assert
     spy.assert_called_once()
     assoc_spy.assert_not_called()
+
+
+def test_cube_and_benchmark_are_retrieved_together(mocker, cube, benchmark, comms, ui):
+    # Arrange
+    gather_spy = mocker.patch(
+        PATCH_ASSOC.format("gather"), return_value=[cube, benchmark]
+    )
+    mocker.patch.object(ui, "prompt", return_value="y")
+    mocker.patch(
+        PATCH_ASSOC.format("CompatibilityTestExecution.run"), return_value=("", {})
+    )
+
+    # Act
+    AssociateCube.run(1, 1)
+
+    # Assert
+    gather_spy.assert_called_once()
+    assert len(gather_spy.call_args.args) == 2
@@ -6,6 +6,7 @@ from medperf.tests.mocks.benchmark import TestBenchmark
 from medperf.tests.mocks.cube import TestCube
 from medperf.tests.mocks.dataset import TestDataset
 from medperf.tests.mocks.result import TestResult
+from medperf.storage.index import pinned_paths
 import pytest
 
 from medperf.commands.result.create import BenchmarkExecution
@@ -77,12 +78,13 @@ def mock_cube(mocker, state_variables):
 
     mocker.patch(PATCH_EXECUTION.format("Cube.get"), side_effect=__get_side_effect)
     mocker.patch(PATCH_EXECUTION.format("Cube.download_run_files"))
+    return mocker.patch(PATCH_EXECUTION.format("Cube.get_many"))
 
 
 def mock_execution(mocker, state_variables):
     models_props = state_variables["models_props"]
 
-    def __exec_side_effect(dataset, model, evaluator, ignore_model_errors):
+    def __exec_side_effect(dataset, model, evaluator, ignore_model_errors, **kwargs):
         if models_props[model.id] == "exec_error":
             raise ExecutionError
         return models_props[model.id]
@@ -104,14 +106,17 @@ def setup(request, mocker, ui, fs):
             2: {
                 "results": {"res": 41},
                 "partial": False,
+                "evaluation_cached": False,
             },
             4: {
                 "results": {"res": 1},
                 "partial": False,
+                "evaluation_cached": False,
             },
             5: {
                 "results": {"res": 66},
                 "partial": True,
+                "evaluation_cached": False,
             },
             6: "exec_error",
             7: "invalid",
@@ -125,7 +130,7 @@ def setup(request, mocker, ui, fs):
     mock_benchmark(mocker, state_variables)
     mock_dataset(mocker, state_variables)
     mock_result_all(mocker, state_variables)
-    mock_cube(mocker, state_variables)
+    get_many_spy = mock_cube(mocker, state_variables)
     exec_spy = mock_execution(mocker, state_variables)
 
     # spies
@@ -142,6 +147,7 @@ def setup(request, mocker, ui, fs):
         "tabulate": tabulate_spy,
         "exec": exec_spy,
         "validate_models": validate_models_spy,
+        "get_many": get_many_spy,
     }
     return state_variables, spies
 
@@ -267,6 +273,22 @@ class TestDefaultSetup:
             )
             self.spies["ui_error"].assert_called_once()
 
+    def test_prefetch_errors_are_attributed_to_the_failing_model(self, mocker, setup):
+        # Arrange
+        invalid_model_uid = 7
+        models_uids = [invalid_model_uid, 4, 5]
+
+        # Act
+        results = BenchmarkExecution.run(
+            1, 2, models_uids=models_uids, ignore_failed_experiments=True
+        )
+
+        # Assert
+        assert results[0] is None
+        assert [result.model for result in results[1:]] == [4, 5]
+        self.spies["ui_error"].assert_called_once()
+        assert str(invalid_model_uid) in self.spies["ui_error"].call_args[0][0]
+
     @pytest.mark.parametrize("ignore_model_errors", [False, True])
     def test_execution_is_called_with_correct_ignore_model_errors(
         self, mocker, setup, ignore_model_errors
@@ -284,10 +306,27 @@ class TestDefaultSetup:
                     model=ANY,
                     evaluator=ANY,
                     ignore_model_errors=ignore_model_errors,
+                    gpus=None,
+                    evaluation_slot=ANY,
+                    journal=ANY,
+                    use_predictions_cache=True,
+                    evaluate_only=False,
+                    warm_evaluator=None,
                 )
             ]
         )
 
+    @pytest.mark.parametrize("evaluate_only", [False, True])
+    def test_execution_is_called_with_correct_evaluate_only(
+        self, mocker, setup, evaluate_only
+    ):
+        # Act
+        BenchmarkExecution.run(1, 2, models_uids=[5], evaluate_only=evaluate_only)
+
+        # Assert
+        kwargs = self.spies["exec"].call_args.kwargs
+        assert kwargs["evaluate_only"] == evaluate_only
+
     @pytest.mark.parametrize("no_cache", [False, True])
     def test_execution_not_called_with_cached_result(self, mocker, setup, no_cache):
         # Arrange
@@ -345,6 +384,38 @@ class TestDefaultSetup:
             == self.state_variables["models_props"][model_uid]["results"]
         )
 
+    @pytest.mark.parametrize("evaluation_cached", [False, True])
+    def test_result_metadata_records_cached_evaluations(
+        self, mocker, setup, evaluation_cached
+    ):
+        # Arrange
+        model_uid = 4
+        self.state_variables["models_props"][model_uid][
+            "evaluation_cached"
+        ] = evaluation_cached
+        expected_file = os.path.join(
+            config.results_folder, f"b1m{model_uid}d2", config.results_info_file
+        )
+
+        # Act
+        BenchmarkExecution.run(1, 2, models_uids=[model_uid])
+
+        # Assert
+        metadata = yaml.safe_load(open(expected_file))["metadata"]
+        assert metadata["evaluation_cached"] == evaluation_cached
+
+    def test_all_models_are_retrieved_along_with_the_benchmark(self, mocker, setup):
+        # Arrange
+        gather_spy = mocker.spy(create_module, "gather")
+        models_spy = create_module.Benchmark.get_models_uids
+
+        # Act
+        BenchmarkExecution.run(1, 2, ignore_failed_experiments=True)
+
+        # Assert
+        assert len(gather_spy.call_args.args) == 3
+        models_spy.assert_called_once_with(1)
+
     def test_execution_of_reference_model_does_not_call_validate(self, mocker, setup):
         # Arrange
         model_uid = self.state_variables["benchmark_models"][0]
@@ -356,3 +427,128 @@ class TestDefaultSetup:
 
         # Assert
         self.spies["validate_models"].assert_not_called()
+
+    def test_uncached_models_are_prefetched_in_a_single_request(self, mocker, setup):
+        # Arrange
+        cached_model = 2  # system inputs contains the triplet b1m2d1 as cached
+        models_uids = [cached_model, 4, 5]
+
+        # Act
+        BenchmarkExecution.run(1, 1, models_uids=models_uids)
+
+        # Assert
+        self.spies["get_many"].assert_called_once_with([4, 5])
+
+    def test_models_are_not_prefetched_if_metadata_cache_disabled(self, mocker, setup):
+        # Arrange
+        config.metadata_cache = False
+
+        # Act
+        BenchmarkExecution.run(1, 1, models_uids=[4, 5])
+
+        # Assert
+        self.spies["get_many"].assert_not_called()
+
+    def test_models_are_executed_concurrently_on_their_own_slots(
+        self, mocker, setup
+    ):
+        # Arrange
+        config.gpus = "device=0,1"
+        config.execution_slots_per_gpu = 1
+        models_uids = [4, 5]
+
+        # Act
+        BenchmarkExecution.run(1, 2, models_uids=models_uids, show_summary=True)
+
+        # Assert
+        gpus = {
+            exec_call.kwargs["model"].id: exec_call.kwargs["gpus"]
+            for exec_call in self.spies["exec"].call_args_list
+        }
+        assert sorted(gpus) == models_uids
+        assert sorted(gpus.values()) == ["device=0", "device=1"]
+        datalist = self.spies["tabulate"].call_args[0][0]
+        assert [row[0] for row in datalist] == models_uids
+
+    @pytest.mark.parametrize("supported", [False, True])
+    def test_warm_evaluator_is_used_if_enabled_and_supported(
+        self, mocker, setup, supported
+    ):
+        # Arrange
+        config.warm_evaluator = True
+        mocker.patch(
+            PATCH_EXECUTION.format("WarmEvaluator.supports"), return_value=supported
+        )
+        stop_spy = mocker.patch(PATCH_EXECUTION.format("WarmEvaluator.stop"))
+
+        # Act
+        BenchmarkExecution.run(1, 2, models_uids=[4, 5])
+
+        # Assert
+        runners = [
+            run_call.kwargs["warm_evaluator"]
+            for run_call in self.spies["exec"].call_args_list
+        ]
+        if supported:
+            assert runners[0] is not None
+            assert runners == [runners[0]] * 2
+            stop_spy.assert_called_once()
+        else:
+            assert runners == [None, None]
+
+    def test_warm_evaluator_runs_for_the_evaluations_of_all_models(
+        self, mocker, setup
+    ):
+        # Arrange
+        config.warm_evaluator = True
+        config.evaluate_timeout = 10
+        mocker.patch(PATCH_EXECUTION.format("WarmEvaluator.supports"), return_value=True)
+        mocker.patch(PATCH_EXECUTION.format("WarmEvaluator.stop"))
+
+        # Act
+        BenchmarkExecution.run(1, 2, models_uids=[4, 5])
+
+        # Assert
+        runner = self.spies["exec"].call_args.kwargs["warm_evaluator"]
+        assert runner.timeout == 20
+
+    def test_warm_evaluator_is_not_used_by_default(self, mocker, setup):
+        # Arrange
+        supports_spy = mocker.patch(PATCH_EXECUTION.format("WarmEvaluator.supports"))
+
+        # Act
+        BenchmarkExecution.run(1, 2, models_uids=[4])
+
+        # Assert
+        supports_spy.assert_not_called()
+        assert self.spies["exec"].call_args.kwargs["warm_evaluator"] is None
+
+    def test_interruption_kills_running_models(self, mocker, setup):
+        # Arrange
+        self.spies["exec"].side_effect = KeyboardInterrupt
+        interrupt_spy = mocker.spy(create_module.ExecutionScheduler, "interrupt")
+
+        # Act & Assert
+        with pytest.raises(KeyboardInterrupt):
+            BenchmarkExecution.run(1, 2, models_uids=[4])
+        interrupt_spy.assert_called_once()
+
+    def test_workspaces_are_pinned_until_the_execution_ends(self, mocker, setup):
+        # Arrange
+        pins = []
+        run = self.spies["exec"].side_effect
+
+        def run_and_record_pins(**kwargs):
+            pins.append(pinned_paths())
+            return run(**kwargs)
+
+        self.spies["exec"].side_effect = run_and_record_pins
+        workspace = os.path.join(config.cubes_folder, "5", config.workspace_path)
+
+        # Act
+        BenchmarkExecution.run(1, 2, models_uids=[4, 5])
+
+        # Assert
+        assert len(pins) == 2
+        assert all(os.path.abspath(workspace) in paths for paths in pins)
+        assert pinned_paths() == []
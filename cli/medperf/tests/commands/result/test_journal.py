@@ -0,0 +1,130 @@
+import os
+
+import pytest
+
+from medperf import config
+from medperf.commands.result.journal import ExecutionJournal, ModelJournal
+
+CONTENT_HASHES = {"mlcube_hash": "mlcube", "image_hash": "image"}
+
+
+@pytest.fixture
+def journal(fs):
+    return ExecutionJournal(1, 2).model(3)
+
+
+def test_journal_is_stored_per_benchmark_dataset_and_model(journal):
+    # Act
+    journal.record("downloaded")
+
+    # Assert
+    assert journal.path == os.path.join(config.journals_folder, "1", "2", "3.json")
+    assert os.path.exists(journal.path)
+
+
+def test_recorded_phases_persist(journal):
+    # Arrange
+    journal.record("downloaded", content_hashes=CONTENT_HASHES)
+
+    # Act
+    reloaded = ModelJournal(journal.path)
+
+    # Assert
+    assert reloaded.get("downloaded")["content_hashes"] == CONTENT_HASHES
+
+
+def test_recording_a_phase_discards_later_phases(journal):
+    # Arrange
+    journal.record("inferred")
+    journal.record("evaluated")
+
+    # Act
+    journal.record("inferring")
+
+    # Assert
+    assert journal.get("inferring") is not None
+    assert journal.get("inferred") is None
+    assert journal.get("evaluated") is None
+
+
+def test_record_download_keeps_phases_of_same_model(journal):
+    # Arrange
+    journal.record_download(CONTENT_HASHES)
+    journal.record("evaluated")
+
+    # Act
+    journal.record_download(dict(CONTENT_HASHES))
+
+    # Assert
+    assert journal.get("evaluated") is not None
+
+
+def test_record_download_discards_phases_of_other_model_version(journal):
+    # Arrange
+    journal.record_download(CONTENT_HASHES)
+    journal.record("evaluated")
+
+    # Act
+    journal.record_download({**CONTENT_HASHES, "image_hash": "other"})
+
+    # Assert
+    assert journal.get("evaluated") is None
+
+
+def test_verified_inference_checks_predictions(journal, fs):
+    # Arrange
+    fs.create_file("preds/out.csv", contents="1")
+    journal.record_inference("preds", partial=True)
+
+    # Act
+    inferred = journal.verified_inference("preds")
+
+    # Assert
+    assert inferred["partial"] is True
+
+
+@pytest.mark.parametrize("change", ["modify", "remove", "other_path"])
+def test_verified_inference_rejects_changed_predictions(journal, fs, change):
+    # Arrange
+    fs.create_file("preds/out.csv", contents="1")
+    journal.record_inference("preds", partial=False)
+    preds_path = "preds"
+    if change == "modify":
+        with open("preds/out.csv", "w") as f:
+            f.write("2")
+    elif change == "remove":
+        os.remove("preds/out.csv")
+        os.rmdir("preds")
+    else:
+        fs.create_dir("other_preds")
+        preds_path = "other_preds"
+
+    # Act
+    inferred = journal.verified_inference(preds_path)
+
+    # Assert
+    assert inferred is None
+
+
+def test_unreadable_journal_is_ignored(journal, fs):
+    # Arrange
+    fs.create_file(journal.path, contents="{not json")
+
+    # Act
+    reloaded = ModelJournal(journal.path)
+
+    # Assert
+    assert reloaded.get("downloaded") is None
+
+
+def test_discard_removes_the_execution_journals(fs):
+    # Arrange
+    execution_journal = ExecutionJournal(1, 2)
+    journal = execution_journal.model(3)
+    journal.record("downloaded")
+
+    # Act
+    execution_journal.discard()
+
+    # Assert
+    assert not os.path.exists(journal.path)
@@ -0,0 +1,120 @@
+import time
+import pytest
+
+from medperf.commands.result.prefetch import ModelsPrefetcher
+from medperf.exceptions import InvalidEntityError
+from medperf.tests.mocks.cube import TestCube
+
+PATCH_PREFETCH = "medperf.commands.result.prefetch.{}"
+
+
+@pytest.fixture
+def retrieved(mocker):
+    retrieved = []
+
+    def get(uid):
+        if uid == "invalid":
+            raise InvalidEntityError("invalid model")
+        retrieved.append(uid)
+        return TestCube(id=uid)
+
+    mocker.patch(PATCH_PREFETCH.format("Cube.get"), side_effect=get)
+    mocker.patch(PATCH_PREFETCH.format("Cube.download_run_files"))
+    mocker.patch(PATCH_PREFETCH.format("run_files_size"), return_value=10)
+    return retrieved
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def consume(prefetcher, uids):
+    cubes = []
+    for uid in uids:
+        prefetch = prefetcher.take(uid)
+        cubes.append(prefetch.result() if prefetch else None)
+    return cubes
+
+
+def test_prefetcher_retrieves_models_in_order(retrieved):
+    # Arrange
+    prefetcher = ModelsPrefetcher([1, 2, 3], depth=1, max_bytes=100)
+
+    # Act
+    cubes = consume(prefetcher, [1, 2, 3])
+    prefetcher.close()
+
+    # Assert
+    assert [cube.id for cube in cubes] == [1, 2, 3]
+    assert retrieved == [1, 2, 3]
+
+
+def test_prefetcher_does_not_prefetch_past_depth(retrieved):
+    # Arrange
+    prefetcher = ModelsPrefetcher([1, 2, 3], depth=2, max_bytes=100)
+
+    # Act
+    wait_for(lambda: 2 in prefetcher.futures)
+    prefetcher.futures[2].result()
+    time.sleep(0.05)
+    prefetcher.close()
+
+    # Assert
+    assert retrieved == [1, 2]
+
+
+def test_prefetcher_pauses_when_disk_budget_is_exceeded(retrieved):
+    # Arrange
+    prefetcher = ModelsPrefetcher([1, 2, 3], depth=3, max_bytes=10)
+
+    # Act
+    prefetcher.futures[1].result()
+    time.sleep(0.05)
+    prefetcher.close()
+
+    # Assert
+    assert list(prefetcher.futures) == [1]
+    assert retrieved == [1]
+
+
+def test_prefetcher_resumes_when_prefetched_models_are_taken(retrieved):
+    # Arrange
+    prefetcher = ModelsPrefetcher([1, 2], depth=3, max_bytes=10)
+    prefetcher.futures[1].result()
+
+    # Act
+    cubes = consume(prefetcher, [1, 2])
+    prefetcher.close()
+
+    # Assert
+    assert [cube.id for cube in cubes] == [1, 2]
+
+
+def test_prefetcher_does_not_prefetch_if_depth_is_zero(retrieved):
+    # Arrange
+    prefetcher = ModelsPrefetcher([1, 2], depth=0, max_bytes=100)
+
+    # Act
+    cubes = consume(prefetcher, [1, 2])
+    prefetcher.close()
+
+    # Assert
+    assert cubes == [None, None]
+    assert retrieved == []
+
+
+def test_prefetcher_raises_errors_when_the_failing_model_is_taken(retrieved):
+    # Arrange
+    prefetcher = ModelsPrefetcher(["invalid", 2], depth=1, max_bytes=100)
+
+    # Act
+    prefetch = prefetcher.take("invalid")
+    with pytest.raises(InvalidEntityError):
+        prefetch.result()
+    cubes = consume(prefetcher, [2])
+    prefetcher.close()
+
+    # Assert
+    assert [cube.id for cube in cubes] == [2]
@@ -0,0 +1,276 @@
+import time
+import threading
+import pytest
+from contextlib import contextmanager
+from concurrent.futures import wait
+
+from medperf import config
+from medperf.commands.result.scheduler import (
+    NO_GPUS,
+    ExecutionScheduler,
+    execution_slots,
+    gpu_devices,
+)
+from medperf.exceptions import InvalidArgumentError
+
+
+@pytest.mark.parametrize(
+    "gpus,devices",
+    [
+        (None, []),
+        ("", []),
+        ("all", []),
+        ("0", []),
+        ("2", ["0", "1"]),
+        ("device=0,2", ["0", "2"]),
+        ("1,3", ["1", "3"]),
+    ],
+)
+def test_gpu_devices_parses_gpus_values(gpus, devices):
+    assert gpu_devices(gpus) == devices
+
+
+def test_execution_slots_share_configured_gpus_by_default():
+    # Arrange
+    config.gpus = "all"
+    config.execution_slots = 3
+
+    # Act
+    slots = execution_slots()
+
+    # Assert
+    assert slots == ["all", "all", "all"]
+
+
+def test_execution_slots_per_gpu_expose_a_single_gpu():
+    # Arrange
+    config.gpus = "device=0,2"
+    config.execution_slots_per_gpu = 2
+
+    # Act
+    slots = execution_slots()
+
+    # Assert
+    assert slots == ["device=0", "device=0", "device=2", "device=2"]
+
+
+def test_execution_slots_per_gpu_fail_without_selected_gpus():
+    # Arrange
+    config.gpus = "all"
+    config.execution_slots_per_gpu = 1
+
+    # Act & Assert
+    with pytest.raises(InvalidArgumentError):
+        execution_slots()
+
+
+def test_scheduler_runs_jobs_concurrently_on_different_slots():
+    # Arrange
+    scheduler = ExecutionScheduler(slots=["device=0", "device=1"])
+    barrier = threading.Barrier(2, timeout=5)
+
+    def job(uid, gpus=None, evaluation_slot=None):
+        # Both jobs must be running at the same time to pass the barrier
+        barrier.wait()
+        return gpus
+
+    # Act
+    runs = [scheduler.submit(job, uid) for uid in [1, 2]]
+    scheduler.shutdown()
+
+    # Assert
+    assert sorted(run.result() for run in runs) == ["device=0", "device=1"]
+
+
+def test_scheduler_does_not_start_more_jobs_than_slots():
+    # Arrange
+    scheduler = ExecutionScheduler(slots=[None])
+    running = []
+    max_running = []
+    lock = threading.Lock()
+
+    def job(uid, gpus=None, evaluation_slot=None):
+        with lock:
+            running.append(uid)
+            max_running.append(len(running))
+        with lock:
+            running.remove(uid)
+
+    # Act
+    runs = [scheduler.submit(job, uid) for uid in range(5)]
+    wait(runs)
+    scheduler.shutdown()
+
+    # Assert
+    assert len(max_running) == 5
+    assert max(max_running) == 1
+
+
+def test_scheduler_cancel_skips_jobs_that_did_not_start():
+    # Arrange
+    scheduler = ExecutionScheduler(slots=[None])
+    started = threading.Event()
+    release = threading.Event()
+
+    def job(uid, gpus=None, evaluation_slot=None):
+        started.set()
+        release.wait(5)
+        return uid
+
+    first = scheduler.submit(job, 1)
+    second = scheduler.submit(job, 2)
+    started.wait(5)
+
+    # Act
+    scheduler.cancel()
+    release.set()
+    scheduler.shutdown()
+
+    # Assert
+    assert first.result() == 1
+    assert second.cancelled()
+
+
+def test_scheduler_interrupt_kills_running_jobs(mocker):
+    # Arrange
+    scheduler = ExecutionScheduler(slots=[None])
+    started = threading.Event()
+    killed = threading.Event()
+    kill_spy = mocker.patch(
+        "medperf.commands.result.scheduler.spawn_and_kill.kill_running",
+        side_effect=killed.set,
+    )
+
+    def job(uid, gpus=None, evaluation_slot=None):
+        started.set()
+        # Runs until its process is killed
+        killed.wait(5)
+        return uid
+
+    first = scheduler.submit(job, 1)
+    second = scheduler.submit(job, 2)
+    started.wait(5)
+
+    # Act
+    scheduler.interrupt()
+    scheduler.shutdown()
+
+    # Assert
+    kill_spy.assert_called()
+    assert first.result() == 1
+    assert second.cancelled()
+
+
+def pipelined_job(events, lock):
+    def job(uid, gpus=None, evaluation_slot=None):
+        with lock:
+            events.append(f"infer {uid}")
+        with evaluation_slot:
+            with lock:
+                events.append(f"evaluate {uid}")
+            # Wait for the next model's inference, if it can overlap
+            deadline = time.monotonic() + 0.5
+            while time.monotonic() < deadline:
+                with lock:
+                    if f"infer {uid + 1}" in events:
+                        break
+                time.sleep(0.01)
+        return uid
+
+    return job
+
+
+def test_scheduler_overlaps_next_inference_with_evaluation_if_pipelined():
+    # Arrange
+    scheduler = ExecutionScheduler(slots=[None], pipeline_depth=1)
+    events = []
+    job = pipelined_job(events, threading.Lock())
+
+    # Act
+    runs = [scheduler.submit(job, uid) for uid in [1, 2]]
+    wait(runs)
+    scheduler.shutdown()
+
+    # Assert
+    assert events.index("infer 2") < events.index("evaluate 2")
+    assert events[:3] == ["infer 1", "evaluate 1", "infer 2"]
+
+
+def test_scheduler_runs_inference_and_evaluation_back_to_back_if_not_pipelined():
+    # Arrange
+    scheduler = ExecutionScheduler(slots=[None], pipeline_depth=0)
+    events = []
+    job = pipelined_job(events, threading.Lock())
+
+    # Act
+    runs = [scheduler.submit(job, uid) for uid in [1, 2]]
+    wait(runs)
+    scheduler.shutdown()
+
+    # Assert
+    assert events == ["infer 1", "evaluate 1", "infer 2", "evaluate 2"]
+
+
+def test_scheduler_limits_concurrent_evaluations():
+    # Arrange
+    scheduler = ExecutionScheduler(slots=[None, None, None], evaluations=1)
+    evaluating = []
+    max_evaluating = []
+    lock = threading.Lock()
+
+    def job(uid, gpus=None, evaluation_slot=None):
+        with evaluation_slot:
+            with lock:
+                evaluating.append(uid)
+                max_evaluating.append(len(evaluating))
+            time.sleep(0.01)
+            with lock:
+                evaluating.remove(uid)
+
+    # Act
+    runs = [scheduler.submit(job, uid) for uid in range(3)]
+    wait(runs)
+    scheduler.shutdown()
+
+    # Assert
+    assert max(max_evaluating) == 1
+
+
+@pytest.mark.parametrize("pipeline_depth", [0, 2])
+def test_scheduler_never_runs_two_tasks_on_the_same_gpu(pipeline_depth):
+    # Arrange
+    scheduler = ExecutionScheduler(
+        slots=["device=0", "device=1"], evaluations=2, pipeline_depth=pipeline_depth
+    )
+    in_use = []
+    shared = []
+    lock = threading.Lock()
+
+    @contextmanager
+    def task(gpus):
+        with lock:
+            if gpus != NO_GPUS and gpus in in_use:
+                shared.append(gpus)
+            in_use.append(gpus)
+        try:
+            time.sleep(0.02)
+            yield
+        finally:
+            with lock:
+                in_use.remove(gpus)
+
+    def job(uid, gpus=None, evaluation_slot=None):
+        with task(gpus):
+            pass
+        with evaluation_slot as evaluation_gpus:
+            with task(evaluation_gpus):
+                pass
+
+    # Act
+    runs = [scheduler.submit(job, uid) for uid in range(6)]
+    wait(runs)
+    scheduler.shutdown()
+
+    # Assert
+    assert all(run.exception() is None for run in runs)
+    assert shared == []
@@ -0,0 +1,180 @@
+import os
+import time
+import pytest
+import yaml
+
+from medperf import config
+from medperf.commands.result import warm_evaluator
+from medperf.commands.result.warm_evaluator import WarmEvaluator
+from medperf.exceptions import ExecutionError
+from medperf.tests.mocks.cube import TestCube
+from medperf.tests.mocks.dataset import TestDataset
+
+EVALUATOR = TestCube(id=3)
+DATASET = TestDataset()
+
+
+def serve(queue, fail_jobs=False, corrupt_predictions=False, **kwargs):
+    """Fake evaluator container, which counts the prediction files of each job"""
+    while not os.path.exists(os.path.join(queue, warm_evaluator.STOP_FILE)):
+        for job in os.listdir(queue):
+            job_path = os.path.join(queue, job)
+            ready = os.path.exists(os.path.join(job_path, warm_evaluator.READY_FILE))
+            done = os.path.exists(os.path.join(job_path, warm_evaluator.DONE_FILE))
+            if not ready or done:
+                continue
+            if fail_jobs:
+                failed_path = os.path.join(job_path, warm_evaluator.FAILED_FILE)
+                with open(failed_path, "w") as f:
+                    f.write("bad predictions")
+                continue
+            preds_path = os.path.join(job_path, warm_evaluator.PREDICTIONS_FOLDER)
+            if corrupt_predictions:
+                with open(os.path.join(preds_path, "a.csv"), "w") as f:
+                    f.write("corrupted")
+            results_path = os.path.join(job_path, warm_evaluator.RESULTS_FILE)
+            with open(results_path, "w") as f:
+                yaml.safe_dump({"files": len(os.listdir(preds_path))}, f)
+            with open(os.path.join(job_path, warm_evaluator.DONE_FILE), "w"):
+                pass
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def evaluator_run(mocker, fs):
+    config.warm_evaluator_poll_interval = 0.01
+    config.warm_evaluator_stop_timeout = 5
+    fs.create_file("preds/a.csv", contents="1")
+    fs.create_file("preds/b.csv", contents="2")
+
+    def run(task, queue, **kwargs):
+        serve(queue)
+
+    return mocker.patch.object(EVALUATOR, "run", side_effect=run)
+
+
+def evaluate(runner, preds_path="preds"):
+    runner.evaluate(preds_path, "results.yaml")
+    with open("results.yaml") as f:
+        return yaml.safe_load(f)
+
+
+def test_supports_evaluators_exposing_the_warm_task(mocker):
+    # Arrange
+    tasks = {"evaluate": {}, warm_evaluator.WARM_TASK: {}}
+    mocker.patch.object(EVALUATOR, "get_config", return_value=tasks)
+
+    # Act & Assert
+    assert WarmEvaluator.supports(EVALUATOR)
+
+
+def test_does_not_support_evaluators_only_exposing_evaluate(mocker):
+    # Arrange
+    mocker.patch.object(EVALUATOR, "get_config", return_value={"evaluate": {}})
+
+    # Act & Assert
+    assert not WarmEvaluator.supports(EVALUATOR)
+
+
+def test_evaluations_share_a_single_container(evaluator_run, fs):
+    # Arrange
+    fs.create_file("other_preds/a.csv", contents="1")
+    runner = WarmEvaluator(EVALUATOR, DATASET)
+
+    # Act
+    results = [evaluate(runner), evaluate(runner, "other_preds")]
+    runner.stop()
+
+    # Assert
+    assert results == [{"files": 2}, {"files": 1}]
+    evaluator_run.assert_called_once()
+    kwargs = evaluator_run.call_args.kwargs
+    assert kwargs["task"] == warm_evaluator.WARM_TASK
+    assert kwargs["labels"] == DATASET.labels_path
+
+
+def test_container_runs_with_the_given_timeout(evaluator_run):
+    # Arrange
+    runner = WarmEvaluator(EVALUATOR, DATASET, timeout=30)
+
+    # Act
+    evaluate(runner)
+    runner.stop()
+
+    # Assert
+    assert evaluator_run.call_args.kwargs["timeout"] == 30
+
+
+def test_evaluator_can_not_modify_the_original_predictions(evaluator_run):
+    # Arrange
+    evaluator_run.side_effect = lambda task, queue, **kwargs: serve(
+        queue, corrupt_predictions=True
+    )
+    runner = WarmEvaluator(EVALUATOR, DATASET)
+
+    # Act
+    evaluate(runner)
+    runner.stop()
+
+    # Assert
+    with open("preds/a.csv") as f:
+        assert f.read() == "1"
+
+
+def test_container_is_not_started_without_evaluations(evaluator_run):
+    # Arrange
+    runner = WarmEvaluator(EVALUATOR, DATASET)
+
+    # Act
+    runner.stop()
+
+    # Assert
+    evaluator_run.assert_not_called()
+
+
+def test_stop_stops_the_container_and_removes_the_queue(evaluator_run):
+    # Arrange
+    runner = WarmEvaluator(EVALUATOR, DATASET)
+    evaluate(runner)
+
+    # Act
+    runner.stop()
+
+    # Assert
+    assert not runner.thread.is_alive()
+    assert not os.path.exists(runner.queue_path)
+
+
+def test_evaluate_fails_if_the_job_fails(mocker, evaluator_run):
+    # Arrange
+    evaluator_run.side_effect = lambda task, queue, **kwargs: serve(
+        queue, fail_jobs=True
+    )
+    runner = WarmEvaluator(EVALUATOR, DATASET)
+
+    # Act & Assert
+    with pytest.raises(ExecutionError, match="bad predictions"):
+        evaluate(runner)
+    runner.stop()
+
+
+def test_evaluate_fails_if_the_container_stops(mocker, evaluator_run):
+    # Arrange
+    evaluator_run.side_effect = ExecutionError
+    runner = WarmEvaluator(EVALUATOR, DATASET)
+
+    # Act & Assert
+    with pytest.raises(ExecutionError):
+        evaluate(runner)
+    runner.stop()
+
+
+def test_evaluate_fails_on_timeout(mocker, evaluator_run):
+    # Arrange
+    evaluator_run.side_effect = lambda task, queue, **kwargs: time.sleep(1)
+    runner = WarmEvaluator(EVALUATOR, DATASET)
+
+    # Act & Assert
+    with pytest.raises(ExecutionError, match="timed out"):
+        runner.evaluate("preds", "results.yaml", timeout=0.1)
+    runner.stop()
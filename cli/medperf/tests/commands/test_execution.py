@@ -1,6 +1,8 @@
 import os
-from unittest.mock import ANY, call
+import shutil
+from unittest.mock import ANY, MagicMock, call
 from medperf.commands.execution import Execution
+from medperf.commands.result.journal import ExecutionJournal
 from medperf.exceptions import ExecutionError
 from medperf.tests.mocks.cube import TestCube
 from medperf.tests.mocks.dataset import TestDataset
@@ -173,6 +175,7 @@ def test_cube_run_are_called_properly(mocker, setup):
         timeout=config.infer_timeout,
         data_path=INPUT_DATASET.data_path,
         output_path=exp_preds_path,
+        gpus=None,
     )
     exp_eval_call = call(
         task="evaluate",
@@ -181,6 +184,7 @@ def test_cube_run_are_called_properly(mocker, setup):
         predictions=exp_preds_path,
         labels=INPUT_DATASET.labels_path,
         output_path=ANY,
+        gpus=None,
     )
     # Act
     Execution.run(INPUT_DATASET, INPUT_MODEL, INPUT_EVALUATOR)
@@ -190,3 +194,337 @@ def test_cube_run_are_called_properly(mocker, setup):
     spies["eval_run"].assert_has_calls([exp_eval_call])
     spies["model_run"].assert_called_once()
     spies["eval_run"].assert_called_once()
+
+
+@pytest.mark.parametrize("setup", [{}], indirect=True)
+def test_cubes_run_on_the_given_gpus(mocker, setup):
+    # Act
+    Execution.run(INPUT_DATASET, INPUT_MODEL, INPUT_EVALUATOR, gpus="device=1")
+
+    # Assert
+    spies = setup[1]
+    assert spies["model_run"].call_args.kwargs["gpus"] == "device=1"
+    assert spies["eval_run"].call_args.kwargs["gpus"] == "device=1"
+
+
+@pytest.mark.parametrize("setup", [{}], indirect=True)
+def test_evaluation_runs_on_the_gpus_of_the_evaluation_slot(mocker, setup):
+    # Arrange
+    evaluation_slot = MagicMock()
+    evaluation_slot.__enter__.return_value = "0"
+
+    # Act
+    Execution.run(
+        INPUT_DATASET,
+        INPUT_MODEL,
+        INPUT_EVALUATOR,
+        gpus="device=1",
+        evaluation_slot=evaluation_slot,
+    )
+
+    # Assert
+    spies = setup[1]
+    assert spies["model_run"].call_args.kwargs["gpus"] == "device=1"
+    assert spies["eval_run"].call_args.kwargs["gpus"] == "0"
+
+
+@pytest.mark.parametrize("setup", [{}], indirect=True)
+def test_evaluation_runs_inside_the_evaluation_slot(mocker, setup):
+    # Arrange
+    events = []
+    evaluation_slot = MagicMock()
+    evaluation_slot.__enter__.side_effect = lambda: events.append("enter")
+    evaluation_slot.__exit__.side_effect = lambda *args: events.append("exit")
+    eval_run = setup[1]["eval_run"]
+    eval_side_effect = eval_run.side_effect
+
+    def eval_run_side_effect(*args, **kwargs):
+        events.append("evaluate")
+        return eval_side_effect(*args, **kwargs)
+
+    eval_run.side_effect = eval_run_side_effect
+
+    # Act
+    Execution.run(
+        INPUT_DATASET, INPUT_MODEL, INPUT_EVALUATOR, evaluation_slot=evaluation_slot
+    )
+
+    # Assert
+    assert events == ["enter", "evaluate", "exit"]
+
+
+@pytest.mark.parametrize("setup", [{}], indirect=True)
+def test_evaluation_runs_on_the_warm_evaluator(mocker, setup):
+    # Arrange
+    warm_evaluator = MagicMock()
+    results = setup[0]["execution_results"]
+
+    def evaluate(preds_path, output_path, timeout=None):
+        with open(output_path, "w") as f:
+            yaml.dump(results, f)
+
+    warm_evaluator.evaluate.side_effect = evaluate
+
+    # Act
+    execution_summary = Execution.run(
+        INPUT_DATASET, INPUT_MODEL, INPUT_EVALUATOR, warm_evaluator=warm_evaluator
+    )
+
+    # Assert
+    setup[1]["eval_run"].assert_not_called()
+    warm_evaluator.evaluate.assert_called_once()
+    assert execution_summary["results"] == results
+
+
+class TestResume:
+    @pytest.fixture(autouse=True)
+    def no_evaluations_cache(self):
+        config.evaluations_cache = False
+
+    @pytest.fixture
+    def journal(self, fs):
+        return ExecutionJournal(1, INPUT_DATASET.id).model(INPUT_MODEL.id)
+
+    def run_once(self, setup, journal):
+        Execution.run(INPUT_DATASET, INPUT_MODEL, INPUT_EVALUATOR, journal=journal)
+        # Each execution writes its results to the same mocked path
+        os.remove(setup[0]["result_path"])
+
+    @pytest.mark.parametrize("setup", [{}], indirect=True)
+    def test_completed_phases_are_journaled(self, mocker, setup, journal):
+        # Act
+        Execution.run(INPUT_DATASET, INPUT_MODEL, INPUT_EVALUATOR, journal=journal)
+
+        # Assert
+        assert journal.get("inferred")["partial"] is False
+        evaluated = journal.get("evaluated")
+        assert evaluated["evaluator"] == INPUT_EVALUATOR.content_hashes
+        assert evaluated["results"] == setup[0]["execution_results"]
+
+    @pytest.mark.parametrize("setup", [{}], indirect=True)
+    def test_inference_is_skipped_if_predictions_are_verified(
+        self, mocker, setup, journal
+    ):
+        # Arrange
+        self.run_once(setup, journal)
+        journal.record("inferred", **journal.get("inferred"))
+        spies = setup[1]
+
+        # Act
+        Execution.run(INPUT_DATASET, INPUT_MODEL, INPUT_EVALUATOR, journal=journal)
+
+        # Assert
+        assert spies["model_run"].call_count == 1
+        assert spies["eval_run"].call_count == 2
+
+    @pytest.mark.parametrize("setup", [{}], indirect=True)
+    def test_evaluation_is_skipped_if_journaled(self, mocker, setup, journal):
+        # Arrange
+        self.run_once(setup, journal)
+        spies = setup[1]
+
+        # Act
+        execution_summary = Execution.run(
+            INPUT_DATASET, INPUT_MODEL, INPUT_EVALUATOR, journal=journal
+        )
+
+        # Assert
+        assert spies["model_run"].call_count == 1
+        assert spies["eval_run"].call_count == 1
+        assert execution_summary["results"] == setup[0]["execution_results"]
+
+    @pytest.mark.parametrize("setup", [{}], indirect=True)
+    def test_evaluation_runs_if_evaluator_changed(self, mocker, setup, journal):
+        # Arrange
+        self.run_once(setup, journal)
+        evaluated = journal.get("evaluated")
+        evaluated["evaluator"] = {"mlcube_hash": "other"}
+        journal.record("evaluated", **evaluated)
+        spies = setup[1]
+
+        # Act
+        Execution.run(INPUT_DATASET, INPUT_MODEL, INPUT_EVALUATOR, journal=journal)
+
+        # Assert
+        assert spies["model_run"].call_count == 1
+        assert spies["eval_run"].call_count == 2
+
+    @pytest.mark.parametrize("setup", [{}], indirect=True)
+    def test_inference_runs_again_if_predictions_changed(
+        self, mocker, setup, fs, journal
+    ):
+        # Arrange
+        self.run_once(setup, journal)
+        preds_path = journal.get("inferred")["preds_path"]
+        fs.create_file(os.path.join(preds_path, "extra.csv"))
+        spies = setup[1]
+
+        # Act & Assert
+        with pytest.raises(ExecutionError):
+            self.run_once(setup, journal)
+        assert spies["model_run"].call_count == 1
+
+    @pytest.mark.parametrize("setup", [{}], indirect=True)
+    def test_interrupted_predictions_are_removed(self, mocker, setup, fs, journal):
+        # Arrange
+        self.run_once(setup, journal)
+        journal.record("inferring")
+        spies = setup[1]
+
+        # Act
+        Execution.run(INPUT_DATASET, INPUT_MODEL, INPUT_EVALUATOR, journal=journal)
+
+        # Assert
+        assert spies["model_run"].call_count == 2
+        assert spies["eval_run"].call_count == 2
+
+
+class TestPredictionsCache:
+    @pytest.fixture(autouse=True)
+    def no_evaluations_cache(self):
+        config.evaluations_cache = False
+
+    def run_once(self, setup, **kwargs):
+        Execution.run(INPUT_DATASET, INPUT_MODEL, INPUT_EVALUATOR, **kwargs)
+        # Each execution writes its results to the same mocked path
+        os.remove(setup[0]["result_path"])
+        # Predictions are kept only in the cache
+        shutil.rmtree(config.predictions_folder)
+
+    @pytest.mark.parametrize("setup", [{}], indirect=True)
+    def test_inference_is_skipped_if_predictions_are_cached(self, mocker, setup):
+        # Arrange
+        self.run_once(setup, use_predictions_cache=True)
+        spies = setup[1]
+
+        # Act
+        Execution.run(
+            INPUT_DATASET, INPUT_MODEL, INPUT_EVALUATOR, use_predictions_cache=True
+        )
+
+        # Assert
+        assert spies["model_run"].call_count == 1
+        assert spies["eval_run"].call_count == 2
+
+    @pytest.mark.parametrize("setup", [{}], indirect=True)
+    def test_predictions_cache_is_not_used_by_default(self, mocker, setup):
+        # Arrange
+        self.run_once(setup, use_predictions_cache=True)
+        spies = setup[1]
+
+        # Act
+        Execution.run(INPUT_DATASET, INPUT_MODEL, INPUT_EVALUATOR)
+
+        # Assert
+        assert spies["model_run"].call_count == 2
+
+    @pytest.mark.parametrize("setup", [{"failing_model": True}], indirect=True)
+    def test_partial_predictions_are_not_cached(self, mocker, setup):
+        # Arrange
+        self.run_once(setup, use_predictions_cache=True, ignore_model_errors=True)
+        spies = setup[1]
+
+        # Act
+        Execution.run(
+            INPUT_DATASET,
+            INPUT_MODEL,
+            INPUT_EVALUATOR,
+            use_predictions_cache=True,
+            ignore_model_errors=True,
+        )
+
+        # Assert
+        assert spies["model_run"].call_count == 2
+
+    @pytest.mark.parametrize("setup", [{}], indirect=True)
+    def test_evaluate_only_evaluates_cached_predictions(self, mocker, setup):
+        # Arrange
+        self.run_once(setup, use_predictions_cache=True)
+        spies = setup[1]
+
+        # Act
+        execution_summary = Execution.run(
+            INPUT_DATASET, INPUT_MODEL, INPUT_EVALUATOR, evaluate_only=True
+        )
+
+        # Assert
+        assert spies["model_run"].call_count == 1
+        assert execution_summary["results"] == setup[0]["execution_results"]
+
+    @pytest.mark.parametrize("setup", [{}], indirect=True)
+    def test_evaluate_only_fails_without_cached_predictions(self, mocker, setup):
+        # Act & Assert
+        with pytest.raises(ExecutionError):
+            Execution.run(
+                INPUT_DATASET, INPUT_MODEL, INPUT_EVALUATOR, evaluate_only=True
+            )
+        setup[1]["model_run"].assert_not_called()
+        setup[1]["eval_run"].assert_not_called()
+
+
+class TestEvaluationsCache:
+    def run_once(self, setup, **kwargs):
+        execution_summary = Execution.run(
+            INPUT_DATASET, INPUT_MODEL, INPUT_EVALUATOR, **kwargs
+        )
+        # Each evaluation writes its results to the same mocked path
+        if os.path.exists(setup[0]["result_path"]):
+            os.remove(setup[0]["result_path"])
+        shutil.rmtree(config.predictions_folder)
+        return execution_summary
+
+    @pytest.mark.parametrize("setup", [{}], indirect=True)
+    def test_evaluation_of_same_inputs_is_memoized(self, mocker, setup):
+        # Arrange
+        self.run_once(setup)
+        spies = setup[1]
+
+        # Act
+        execution_summary = self.run_once(setup)
+
+        # Assert
+        assert spies["model_run"].call_count == 2
+        assert spies["eval_run"].call_count == 1
+        assert execution_summary["results"] == setup[0]["execution_results"]
+        assert execution_summary["evaluation_cached"]
+
+    @pytest.mark.parametrize("setup", [{}], indirect=True)
+    def test_first_evaluation_is_not_cached(self, mocker, setup):
+        # Act
+        execution_summary = self.run_once(setup)
+
+        # Assert
+        assert not execution_summary["evaluation_cached"]
+
+    @pytest.mark.parametrize("setup", [{}], indirect=True)
+    def test_evaluation_of_other_predictions_is_not_memoized(self, mocker, setup):
+        # Arrange
+        self.run_once(setup)
+        model_run = setup[1]["model_run"]
+        model_side_effect = model_run.side_effect
+
+        def model_run_side_effect(*args, **kwargs):
+            model_side_effect(*args, **kwargs)
+            with open(os.path.join(kwargs["output_path"], "preds.csv"), "w") as f:
+                f.write("1")
+
+        model_run.side_effect = model_run_side_effect
+
+        # Act
+        execution_summary = self.run_once(setup)
+
+        # Assert
+        assert setup[1]["eval_run"].call_count == 2
+        assert not execution_summary["evaluation_cached"]
+
+    @pytest.mark.parametrize("setup", [{}], indirect=True)
+    def test_evaluations_are_not_memoized_if_disabled(self, mocker, setup):
+        # Arrange
+        config.evaluations_cache = False
+        self.run_once(setup)
+
+        # Act
+        self.run_once(setup)
+
+        # Assert
+        assert setup[1]["eval_run"].call_count == 2
@@ -1,13 +1,43 @@
 from medperf.tests.mocks import MockResponse
 from medperf.comms.entity_resources.sources.direct import DirectLinkSource
 import medperf.config as config
+import os
+import hashlib
 import pytest
-from medperf.exceptions import CommunicationRetrievalError
+import requests
+from medperf.exceptions import CommunicationRetrievalError, InvalidEntityError
 
 PATCH_DIRECT = "medperf.comms.entity_resources.sources.direct.{}"
 url = "https://mock.com"
 
 
+@pytest.fixture(autouse=True)
+def no_ranges(mocker):
+    res = MockResponse({}, 200, headers={"Content-Length": "8"})
+    return mocker.patch(PATCH_DIRECT.format("requests.head"), return_value=res)
+
+
+def ranged_server(mocker, content, status_code=206, etag=None, failing_starts=[]):
+    """Mocks a server that serves the given content in byte ranges. Ranges
+    starting at any of failing_starts fail"""
+    headers = {"Accept-Ranges": "bytes", "Content-Length": str(len(content))}
+    if etag is not None:
+        headers["ETag"] = etag
+    head_res = MockResponse({}, 200, headers=headers)
+    mocker.patch(PATCH_DIRECT.format("requests.head"), return_value=head_res)
+
+    def get(url, headers={}, **kwargs):
+        start, end = headers["Range"].replace("bytes=", "").split("-")
+        end = int(end) + 1
+        part = content[int(start):end]
+        status = 500 if int(start) in failing_starts else status_code
+        res = MockResponse({}, status)
+        res.iter_content = lambda *args, **kwargs: [part]
+        return res
+
+    return mocker.patch(PATCH_DIRECT.format("requests.get"), side_effect=get)
+
+
 def test_download_works_as_expected(mocker, fs):
     # Arrange
     filename = "filename"
@@ -35,3 +65,261 @@ def test_download_raises_for_failed_request_after_multiple_attempts(mocker):
         DirectLinkSource().download(url, filename)
 
     assert spy.call_count == config.ddl_max_redownload_attempts
+
+
+@pytest.mark.parametrize("num_connections", [2, 4, 7])
+def test_download_fetches_ranges_concurrently(mocker, fs, num_connections):
+    # Arrange
+    filename = "filename"
+    content = b"0123456789abcdefghij"
+    config.ddl_max_connections = num_connections
+    config.ddl_min_part_size = 2
+    get_spy = ranged_server(mocker, content)
+
+    # Act
+    DirectLinkSource().download(url, filename)
+
+    # Assert
+    assert open(filename, "rb").read() == content
+    assert get_spy.call_count == num_connections
+
+
+def test_download_uses_single_stream_for_small_files(mocker, fs):
+    # Arrange
+    filename = "filename"
+    content = b"0123456789"
+    config.ddl_max_connections = 4
+    config.ddl_min_part_size = len(content)
+    ranged_server(mocker, content)
+    res = MockResponse({}, 200)
+    mocker.patch.object(res, "iter_content", return_value=[content])
+    get_spy = mocker.patch(PATCH_DIRECT.format("requests.get"), return_value=res)
+
+    # Act
+    DirectLinkSource().download(url, filename)
+
+    # Assert
+    assert open(filename, "rb").read() == content
+    get_spy.assert_called_once_with(url, stream=True)
+
+
+def test_download_uses_single_stream_if_ranges_are_disabled(mocker, fs):
+    # Arrange
+    filename = "filename"
+    config.ddl_max_connections = 1
+    head_spy = mocker.patch(PATCH_DIRECT.format("requests.head"))
+    res = MockResponse({}, 200)
+    mocker.patch.object(res, "iter_content", return_value=[b"text"])
+    mocker.patch(PATCH_DIRECT.format("requests.get"), return_value=res)
+
+    # Act
+    DirectLinkSource().download(url, filename)
+
+    # Assert
+    assert open(filename).read() == "text"
+    head_spy.assert_not_called()
+
+
+def test_download_raises_if_ranges_are_not_honored(mocker, fs):
+    # Arrange
+    filename = "filename"
+    config.ddl_max_connections = 2
+    config.ddl_min_part_size = 2
+    ranged_server(mocker, b"0123456789", status_code=200)
+
+    # Act & Assert
+    with pytest.raises(CommunicationRetrievalError):
+        DirectLinkSource().download(url, filename)
+
+    assert not os.path.exists(filename)
+
+
+def flaky_server(mocker, content, fail_at, etag='"v1"'):
+    """Mocks a server whose first response is interrupted after fail_at bytes,
+    and that serves the missing bytes when asked for them afterwards"""
+
+    def get(url, headers={}, **kwargs):
+        if "Range" not in headers:
+            res = MockResponse({}, 200, headers={"ETag": etag})
+
+            def interrupted(*args, **kwargs):
+                yield content[:fail_at]
+                raise requests.exceptions.ChunkedEncodingError()
+
+            res.iter_content = interrupted
+            return res
+        start = int(headers["Range"].replace("bytes=", "").rstrip("-"))
+        res = MockResponse({}, 206, headers={"ETag": etag})
+        res.iter_content = lambda *args, **kwargs: [content[start:]]
+        return res
+
+    return mocker.patch(PATCH_DIRECT.format("requests.get"), side_effect=get)
+
+
+def test_download_resumes_interrupted_download(mocker, fs):
+    # Arrange
+    filename = "filename"
+    content = b"0123456789"
+    get_spy = flaky_server(mocker, content, fail_at=4)
+    exp_headers = {
+        "Range": "bytes=4-",
+        "If-Range": '"v1"',
+        "Accept-Encoding": "identity",
+    }
+
+    # Act
+    DirectLinkSource().download(url, filename)
+
+    # Assert
+    assert open(filename, "rb").read() == content
+    get_spy.assert_called_with(url, stream=True, headers=exp_headers)
+
+
+def test_download_resumes_across_invocations(mocker, fs):
+    # Arrange
+    filename = "filename"
+    content = b"0123456789"
+    config.ddl_max_redownload_attempts = 1
+    flaky_server(mocker, content, fail_at=4)
+    with pytest.raises(CommunicationRetrievalError):
+        DirectLinkSource().download(url, filename)
+
+    # Act
+    DirectLinkSource().download(url, filename)
+
+    # Assert
+    assert open(filename, "rb").read() == content
+
+
+def test_download_restarts_if_file_changed(mocker, fs):
+    # Arrange
+    filename = "filename"
+    content = b"0123456789"
+    config.ddl_max_redownload_attempts = 1
+    flaky_server(mocker, b"old content", fail_at=4)
+    with pytest.raises(CommunicationRetrievalError):
+        DirectLinkSource().download(url, filename)
+    res = MockResponse({}, 200, headers={"ETag": '"v2"'})
+    mocker.patch.object(res, "iter_content", return_value=[content])
+    mocker.patch(PATCH_DIRECT.format("requests.get"), return_value=res)
+
+    # Act
+    DirectLinkSource().download(url, filename)
+
+    # Assert
+    assert open(filename, "rb").read() == content
+
+
+def test_download_does_not_resume_without_validators(mocker, fs):
+    # Arrange
+    filename = "filename"
+    content = b"0123456789"
+    config.ddl_max_redownload_attempts = 1
+    flaky_server(mocker, content, fail_at=4, etag=None)
+    with pytest.raises(CommunicationRetrievalError):
+        DirectLinkSource().download(url, filename)
+    res = MockResponse({}, 200)
+    mocker.patch.object(res, "iter_content", return_value=[content])
+    get_spy = mocker.patch(PATCH_DIRECT.format("requests.get"), return_value=res)
+
+    # Act
+    DirectLinkSource().download(url, filename)
+
+    # Assert
+    assert open(filename, "rb").read() == content
+    get_spy.assert_called_once_with(url, stream=True)
+
+
+def test_download_resumes_only_missing_ranges(mocker, fs):
+    # Arrange
+    filename = "filename"
+    content = b"0123456789abcdefghij"
+    config.ddl_max_connections = 2
+    config.ddl_min_part_size = 2
+    config.ddl_max_redownload_attempts = 1
+    ranged_server(mocker, content, etag='"v1"', failing_starts=[10])
+    with pytest.raises(CommunicationRetrievalError):
+        DirectLinkSource().download(url, filename)
+    get_spy = ranged_server(mocker, content, etag='"v1"')
+
+    # Act
+    DirectLinkSource().download(url, filename)
+
+    # Assert
+    assert open(filename, "rb").read() == content
+    get_spy.assert_called_once()
+
+
+def test_download_returns_hash_of_streamed_file(mocker, fs):
+    # Arrange
+    filename = "filename"
+    content = b"0123456789"
+    flaky_server(mocker, content, fail_at=4)
+    exp_hash = hashlib.sha256(content).hexdigest()
+
+    # Act
+    file_hash = DirectLinkSource().download(url, filename)
+
+    # Assert
+    assert file_hash == exp_hash
+
+
+@pytest.mark.parametrize("content_length", [None, "10"])
+def test_download_aborts_files_larger_than_expected(mocker, fs, content_length):
+    # Arrange
+    filename = "filename"
+    headers = {} if content_length is None else {"Content-Length": content_length}
+    res = MockResponse({}, 200, headers=headers)
+    chunks = [b"01234", b"56789"]
+    iter_spy = mocker.patch.object(res, "iter_content", return_value=chunks)
+    get_spy = mocker.patch(PATCH_DIRECT.format("requests.get"), return_value=res)
+
+    # Act & Assert
+    with pytest.raises(InvalidEntityError):
+        DirectLinkSource().download(url, filename, expected_size=8)
+
+    get_spy.assert_called_once()
+    assert iter_spy.call_count == (1 if content_length is None else 0)
+    assert not os.path.exists(filename)
+
+
+def test_download_aborts_ranged_files_larger_than_expected(mocker, fs):
+    # Arrange
+    filename = "filename"
+    config.ddl_max_connections = 2
+    config.ddl_min_part_size = 2
+    get_spy = ranged_server(mocker, b"0123456789")
+
+    # Act & Assert
+    with pytest.raises(InvalidEntityError):
+        DirectLinkSource().download(url, filename, expected_size=8)
+
+    get_spy.assert_not_called()
+
+
+def test_stream_yields_chunks_of_small_files(mocker):
+    # Arrange
+    res = MockResponse({}, 200, headers={"Content-Length": "10"})
+    mocker.patch.object(res, "iter_content", return_value=[b"01234", b"56789"])
+    mocker.patch(PATCH_DIRECT.format("requests.get"), return_value=res)
+
+    # Act
+    chunks = list(DirectLinkSource().stream(url))
+
+    # Assert
+    assert chunks == [b"01234", b"56789"]
+
+
+@pytest.mark.parametrize("content_length", [None, "11"])
+def test_stream_refuses_files_that_may_be_large(mocker, content_length):
+    # Arrange
+    config.ddl_max_stream_size = 10
+    headers = {} if content_length is None else {"Content-Length": content_length}
+    res = MockResponse({}, 200, headers=headers)
+    iter_spy = mocker.patch.object(res, "iter_content")
+    mocker.patch(PATCH_DIRECT.format("requests.get"), return_value=res)
+
+    # Act & Assert
+    with pytest.raises(CommunicationRetrievalError):
+        list(DirectLinkSource().stream(url))
+    iter_spy.assert_not_called()
@@ -1,8 +1,9 @@
 import os
-from medperf.utils import get_file_hash
+import hashlib
+from medperf.utils import generate_tmp_path, get_file_hash
 import pytest
 import medperf.config as config
-from medperf.comms.entity_resources import resources
+from medperf.comms.entity_resources import resources, store
 import yaml
 
 url = "https://mock.url"
@@ -14,9 +15,19 @@ def setup(mocker, fs):
         fs.create_file(outpath, contents=url)
         return get_file_hash(outpath)
 
+    def tmp_extract_resource_side_effect(url, expected_hash=None):
+        tmp_output_folder = generate_tmp_path()
+        fs.create_file(os.path.join(tmp_output_folder, "file"), contents=url)
+        return tmp_output_folder, hashlib.sha256(url.encode()).hexdigest()
+
     mocker.patch.object(
         resources, "download_resource", side_effect=download_resource_side_effect
     )
+    mocker.patch.object(
+        resources,
+        "tmp_extract_resource",
+        side_effect=tmp_extract_resource_side_effect,
+    )
 
 
 class TestGetCubeImage:
@@ -65,10 +76,6 @@ class TestGetCubeImage:
 
 
 class TestGetAdditionalFiles:
-    @pytest.fixture(autouse=True)
-    def class_setup(self, mocker):
-        mocker.patch.object(resources, "untar")
-
     def test_get_additional_files_does_not_download_if_folder_exists_and_hash_valid(
         self, mocker, fs
     ):
@@ -76,7 +83,7 @@ class TestGetAdditionalFiles:
         cube_path = "cube/1"
         additional_files_folder = os.path.join(cube_path, config.additional_path)
         fs.create_dir(additional_files_folder)
-        spy = mocker.spy(resources, "download_resource")
+        spy = mocker.spy(resources, "tmp_extract_resource")
         exp_hash = resources.get_cube_additional(url, cube_path)
 
         # Act
@@ -92,7 +99,7 @@ class TestGetAdditionalFiles:
         cube_path = "cube/1"
         additional_files_folder = os.path.join(cube_path, config.additional_path)
         fs.create_dir(additional_files_folder)
-        spy = mocker.spy(resources, "download_resource")
+        spy = mocker.spy(resources, "tmp_extract_resource")
         resources.get_cube_additional(url, cube_path)
 
         # Act
@@ -101,23 +108,36 @@ class TestGetAdditionalFiles:
         # Assert
         assert spy.call_count == 2
 
-    def test_get_additional_files_will_download_if_folder_exists_and_hash_valid_but_no_cached_hash(
+    def test_get_additional_files_links_stored_folder_over_existing_folder(
         self, mocker, fs
-    ):  # a test for existing installation before this feature
+    ):  # a test for existing installations before the assets store
         # Arrange
         cube_path = "cube/1"
         additional_files_folder = os.path.join(cube_path, config.additional_path)
-        fs.create_dir(additional_files_folder)
-        spy = mocker.spy(resources, "download_resource")
-        exp_hash = resources.get_cube_additional(url, cube_path)
-        hash_cache_file = os.path.join(cube_path, config.mlcube_cache_file)
-        os.remove(hash_cache_file)
+        exp_hash = resources.get_cube_additional(url, "cube/2")
+        fs.create_file(os.path.join(additional_files_folder, "old_file"))
+        spy = mocker.spy(resources, "tmp_extract_resource")
 
         # Act
         resources.get_cube_additional(url, cube_path, exp_hash)
 
         # Assert
-        assert spy.call_count == 2
+        spy.assert_not_called()
+        assert os.path.islink(additional_files_folder)
+        assert os.listdir(additional_files_folder) == ["file"]
+
+    def test_get_additional_files_shares_extracted_files_between_cubes(
+        self, mocker, fs
+    ):
+        # Arrange
+        exp_hash = resources.get_cube_additional(url, "cube/1")
+
+        # Act
+        resources.get_cube_additional(url, "cube/2", exp_hash)
+
+        # Assert
+        asset = store.asset_path(config.assets_folder, exp_hash)
+        assert store.asset_refcount(asset) == 2
 
 
 class TestGetCube:
@@ -178,3 +198,15 @@ class TestGetCubeParams:
 
         # Assert
         assert spy.call_count == 2
+
+    def test_get_cube_params_hardlinks_stored_file(self, mocker, fs):
+        # Arrange
+        cube_path = "cube/1"
+
+        # Act
+        path, exp_hash = resources.get_cube_params(url, cube_path)
+
+        # Assert
+        asset = store.asset_path(config.assets_folder, exp_hash)
+        assert os.path.samefile(path, asset)
+        assert not os.path.islink(path)
@@ -0,0 +1,149 @@
+import os
+import pytest
+
+from medperf.comms.entity_resources import store
+
+store_path = "/store"
+
+
+@pytest.fixture
+def file_asset(fs):
+    fs.create_file("/tmp/file", contents="data")
+    return store.add_asset(store_path, "/tmp/file", "hash")
+
+
+@pytest.fixture
+def folder_asset(fs):
+    fs.create_file("/tmp/folder/file", contents="data")
+    return store.add_asset(store_path, "/tmp/folder", "folder_hash")
+
+
+def test_add_asset_moves_source_to_store(file_asset):
+    # Assert
+    assert file_asset == os.path.join(store_path, "hash")
+    assert store.has_asset(store_path, "hash")
+    assert not os.path.exists("/tmp/file")
+
+
+def test_add_asset_discards_source_if_already_stored(fs, file_asset):
+    # Arrange
+    fs.create_file("/tmp/other", contents="data")
+
+    # Act
+    store.add_asset(store_path, "/tmp/other", "hash")
+
+    # Assert
+    assert not os.path.exists("/tmp/other")
+    assert store.has_asset(store_path, "hash")
+
+
+def test_add_asset_discards_folder_added_concurrently(mocker, fs, folder_asset):
+    # Arrange
+    fs.create_file("/tmp/other/file", contents="data")
+    # The asset doesn't exist yet when checked
+    exists = os.path.exists
+    checks = iter([False])
+    mocker.patch.object(
+        store.os.path, "exists", side_effect=lambda path: next(checks, exists(path))
+    )
+
+    # Act
+    store.add_asset(store_path, "/tmp/other", "folder_hash")
+
+    # Assert
+    assert not os.path.exists("/tmp/other")
+    assert os.listdir(folder_asset) == ["file"]
+
+
+def test_add_asset_makes_files_read_only(file_asset):
+    # Assert
+    assert os.stat(file_asset).st_mode & 0o222 == 0
+
+
+def test_link_asset_hardlinks_files(file_asset):
+    # Act
+    store.link_asset(file_asset, "/cube/1/file")
+
+    # Assert
+    assert not os.path.islink("/cube/1/file")
+    assert os.path.samefile("/cube/1/file", file_asset)
+
+
+def test_link_asset_symlinks_folders(folder_asset):
+    # Act
+    store.link_asset(folder_asset, "/cube/1/folder")
+
+    # Assert
+    assert os.path.islink("/cube/1/folder")
+    assert os.path.exists("/cube/1/folder/file")
+
+
+def test_link_asset_falls_back_to_symlink_if_hardlink_fails(mocker, file_asset):
+    # Arrange
+    mocker.patch("os.link", side_effect=OSError)
+
+    # Act
+    store.link_asset(file_asset, "/cube/1/file")
+
+    # Assert
+    assert os.path.islink("/cube/1/file")
+
+
+def test_link_asset_replaces_existing_folder(fs, folder_asset):
+    # Arrange
+    fs.create_file("/cube/1/folder/old_file")
+
+    # Act
+    store.link_asset(folder_asset, "/cube/1/folder")
+
+    # Assert
+    assert os.listdir("/cube/1/folder") == ["file"]
+
+
+def test_link_asset_does_not_duplicate_references(file_asset):
+    # Act
+    store.link_asset(file_asset, "/cube/1/file")
+    store.link_asset(file_asset, "/cube/1/file")
+
+    # Assert
+    assert store.asset_references(file_asset) == ["/cube/1/file"]
+
+
+@pytest.mark.parametrize("links", [[], ["/cube/1/file"], ["/cube/1/f", "/cube/2/f"]])
+def test_asset_refcount_counts_links(file_asset, links):
+    # Arrange
+    for link in links:
+        store.link_asset(file_asset, link)
+
+    # Act
+    refcount = store.asset_refcount(file_asset)
+
+    # Assert
+    assert refcount == len(links)
+
+
+def test_asset_refcount_ignores_removed_links(file_asset):
+    # Arrange
+    store.link_asset(file_asset, "/cube/1/file")
+    store.link_asset(file_asset, "/cube/2/file")
+    os.remove("/cube/1/file")
+
+    # Act
+    refcount = store.asset_refcount(file_asset)
+
+    # Assert
+    assert refcount == 1
+
+
+def test_asset_refcount_ignores_links_replaced_by_other_assets(fs, file_asset):
+    # Arrange
+    fs.create_file("/tmp/other", contents="other")
+    other_asset = store.add_asset(store_path, "/tmp/other", "other_hash")
+    store.link_asset(file_asset, "/cube/1/file")
+
+    # Act
+    store.link_asset(other_asset, "/cube/1/file")
+
+    # Assert
+    assert store.asset_refcount(file_asset) == 0
+    assert store.asset_refcount(other_asset) == 1
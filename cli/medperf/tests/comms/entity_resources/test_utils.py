@@ -1,9 +1,22 @@
+import io
 import os
-from medperf.exceptions import InvalidArgumentError, InvalidEntityError
+import hashlib
+import tarfile
+import requests
+from medperf.exceptions import (
+    CommunicationRetrievalError,
+    InvalidArgumentError,
+    InvalidEntityError,
+)
+import medperf.config as config
 from medperf.tests.utils import calculate_fake_file_hash
+from medperf.utils import ZSTD_MAGIC
 import pytest
 from medperf.comms.entity_resources import sources, utils
 import synapseclient
+from unittest.mock import ANY
+
+PATCH_UTILS = "medperf.comms.entity_resources.utils.{}"
 
 # prefixes
 DIRECT = sources.DirectLinkSource.prefix
@@ -15,7 +28,7 @@ DOWNLOADED_FILE_CONTENTS = "some contents"
 
 @pytest.fixture(autouse=True)
 def setup_download_side_effect(mocker, fs):
-    def download_side_effect(identifier, outpath):
+    def download_side_effect(identifier, outpath, *args):
         fs.create_file(outpath, contents=DOWNLOADED_FILE_CONTENTS)
 
     mocker.patch.object(
@@ -92,3 +105,210 @@ class TestWithHash:
 
         # Assert
         assert open(output_path).read() == DOWNLOADED_FILE_CONTENTS
+
+    def test_download_uses_hash_calculated_by_source(self, mocker, fs):
+        # Arrange
+        output_path = "out"
+        expected_hash = "hash calculated while downloading"
+
+        def download_side_effect(identifier, outpath, *args):
+            fs.create_file(outpath, contents=DOWNLOADED_FILE_CONTENTS)
+            return expected_hash
+
+        mocker.patch.object(
+            sources.DirectLinkSource, "download", side_effect=download_side_effect
+        )
+        spy = mocker.patch(PATCH_UTILS.format("get_file_hash"))
+
+        # Act
+        hash_value = utils.download_resource(
+            "https://url.com", output_path, expected_hash
+        )
+
+        # Assert
+        assert hash_value == expected_hash
+        spy.assert_not_called()
+
+    def test_download_always_reads_the_downloaded_file(self, mocker, fs):
+        # Arrange
+        output_path = "out"
+        expected_hash = "some hash"
+        spy = mocker.patch(
+            PATCH_UTILS.format("get_file_hash"), return_value=expected_hash
+        )
+
+        # Act
+        utils.download_resource("https://url.com", output_path, expected_hash)
+
+        # Assert
+        spy.assert_called_once_with(ANY, strict=True)
+
+
+def create_tarball(files, links={}, member_type=tarfile.REGTYPE):
+    tarball = io.BytesIO()
+    with tarfile.open(fileobj=tarball, mode="w:gz") as tar:
+        for name, contents in files.items():
+            info = tarfile.TarInfo(name)
+            info.type = member_type
+            info.size = len(contents)
+            tar.addfile(info, io.BytesIO(contents))
+        for name, target in links.items():
+            info = tarfile.TarInfo(name)
+            info.type = tarfile.SYMTYPE
+            info.linkname = target
+            tar.addfile(info)
+    return tarball.getvalue()
+
+
+def chunked(data, chunk_size=7):
+    for start in range(0, len(data), chunk_size):
+        end = start + chunk_size
+        yield data[start:end]
+
+
+class TestExtractResource:
+    @pytest.fixture(autouse=True)
+    def setup(self, mocker):
+        self.files = {"a.txt": b"a contents", "folder/b.txt": b"b contents"}
+        self.tarball = create_tarball({**self.files, "folder/._b.txt": b"junk"})
+        self.tarball_hash = hashlib.sha256(self.tarball).hexdigest()
+        self.stream_spy = mocker.patch.object(
+            sources.DirectLinkSource,
+            "stream",
+            side_effect=lambda identifier: chunked(self.tarball),
+        )
+        self.untar_spy = mocker.patch(PATCH_UTILS.format("untar"))
+
+    def test_extracts_tarball_while_streaming(self, fs):
+        # Act
+        output_folder, hash_value = utils.tmp_extract_resource(
+            "https://url.com", self.tarball_hash
+        )
+
+        # Assert
+        assert hash_value == self.tarball_hash
+        for name, contents in self.files.items():
+            with open(os.path.join(output_folder, name), "rb") as f:
+                assert f.read() == contents
+        assert not os.path.exists(os.path.join(output_folder, "folder", "._b.txt"))
+        sources.DirectLinkSource.download.assert_not_called()
+        self.untar_spy.assert_not_called()
+
+    def test_extracts_uncompressed_tarball_while_streaming(self, fs):
+        # Arrange
+        tarball = io.BytesIO()
+        with tarfile.open(fileobj=tarball, mode="w") as tar:
+            info = tarfile.TarInfo("a.txt")
+            info.size = len(self.files["a.txt"])
+            tar.addfile(info, io.BytesIO(self.files["a.txt"]))
+        self.tarball = tarball.getvalue()
+
+        # Act
+        output_folder, _ = utils.tmp_extract_resource("https://url.com")
+
+        # Assert
+        assert os.path.exists(os.path.join(output_folder, "a.txt"))
+        self.untar_spy.assert_not_called()
+
+    def test_saves_streamed_tarball_if_tarfile_cannot_decompress_it(self, mocker, fs):
+        # Arrange
+        tmp_folder = "/tmp_folder"
+        mocker.patch(PATCH_UTILS.format("generate_tmp_path"), return_value=tmp_folder)
+        self.tarball = ZSTD_MAGIC + b"zstd compressed tarball"
+        expected_hash = hashlib.sha256(self.tarball).hexdigest()
+        tarball_path = os.path.join(tmp_folder, config.tarball_filename)
+
+        # Act
+        _, hash_value = utils.tmp_extract_resource("https://url.com", expected_hash)
+
+        # Assert
+        assert hash_value == expected_hash
+        with open(tarball_path, "rb") as f:
+            assert f.read() == self.tarball
+        self.untar_spy.assert_called_once_with(tarball_path)
+        sources.DirectLinkSource.download.assert_not_called()
+
+    def test_does_not_extract_saved_tarball_on_hash_mismatch(self, mocker, fs):
+        # Arrange
+        self.tarball = ZSTD_MAGIC + b"zstd compressed tarball"
+
+        # Act & Assert
+        with pytest.raises(InvalidEntityError):
+            utils.tmp_extract_resource("https://url.com", "some unmatching hash")
+
+        self.untar_spy.assert_not_called()
+        sources.DirectLinkSource.download.assert_not_called()
+
+    def test_removes_quarantine_folder_on_hash_mismatch(self, mocker, fs):
+        # Arrange
+        tmp_folder = "/tmp_folder"
+        mocker.patch(PATCH_UTILS.format("generate_tmp_path"), return_value=tmp_folder)
+
+        # Act & Assert
+        with pytest.raises(InvalidEntityError):
+            utils.tmp_extract_resource("https://url.com", "some unmatching hash")
+
+        assert not os.path.exists(tmp_folder)
+
+    @pytest.mark.parametrize(
+        "files,links,member_type",
+        [
+            ({"../escaped.txt": b"x"}, {}, tarfile.REGTYPE),
+            ({"/absolute.txt": b"x"}, {}, tarfile.REGTYPE),
+            ({}, {"folder/link": "../../escaped.txt"}, tarfile.REGTYPE),
+            ({}, {"link": "/etc/passwd"}, tarfile.REGTYPE),
+            ({"fifo": b""}, {}, tarfile.FIFOTYPE),
+        ],
+    )
+    def test_rejects_unsafe_members(self, mocker, fs, files, links, member_type):
+        # Arrange
+        tmp_folder = "/tmp_folder"
+        mocker.patch(PATCH_UTILS.format("generate_tmp_path"), return_value=tmp_folder)
+        self.tarball = create_tarball(files, links, member_type)
+
+        # Act & Assert
+        with pytest.raises(InvalidEntityError):
+            utils.tmp_extract_resource("https://url.com")
+
+        assert not os.path.exists(tmp_folder)
+        assert not os.path.exists("/escaped.txt")
+        sources.DirectLinkSource.download.assert_not_called()
+
+    def test_extracts_links_within_the_tarball(self, fs):
+        # Arrange
+        self.tarball = create_tarball(self.files, {"folder/link": "../a.txt"})
+
+        # Act
+        output_folder, _ = utils.tmp_extract_resource("https://url.com")
+
+        # Assert
+        with open(os.path.join(output_folder, "folder", "link"), "rb") as f:
+            assert f.read() == self.files["a.txt"]
+
+    @pytest.mark.parametrize(
+        "error",
+        [CommunicationRetrievalError, requests.exceptions.ChunkedEncodingError],
+    )
+    def test_falls_back_to_download_if_streaming_fails(self, fs, error):
+        # Arrange
+        self.stream_spy.side_effect = error
+
+        # Act
+        output_folder, _ = utils.tmp_extract_resource("https://url.com")
+
+        # Assert
+        sources.DirectLinkSource.download.assert_called_once()
+        tarball_path = os.path.join(output_folder, config.tarball_filename)
+        self.untar_spy.assert_called_once_with(tarball_path)
+
+    def test_downloads_first_if_source_cannot_stream(self, mocker, fs):
+        # Arrange
+        mock = mocker.create_autospec(synapseclient.Synapse)
+        mocker.patch.object(synapseclient, "Synapse", return_value=mock)
+
+        # Act
+        utils.tmp_extract_resource(f"{SYNAPSE}syn532035")
+
+        # Assert
+        sources.SynapseSource.download.assert_called_once()
+        self.untar_spy.assert_called_once()
@@ -0,0 +1,226 @@
+import pytest
+
+from medperf import config
+from medperf.comms.rest import REST
+from medperf.comms.metadata_cache import MetadataCache
+from medperf.config_management import read_config, write_config
+from medperf.tests.mocks import MockResponse
+
+url = "https://mock.url"
+full_url = REST.parse_url(url)
+patch_server = "medperf.comms.rest.{}"
+entity_url = f"{full_url}/benchmarks/1"
+
+
+@pytest.fixture
+def server(mocker, ui, auth):
+    server = REST(url)
+    return server
+
+
+@pytest.fixture
+def cache():
+    return MetadataCache()
+
+
+def test_set_stores_body_and_validators(cache):
+    # Arrange
+    body = {"id": 1, "modified_at": "2024-01-01T00:00:00Z"}
+    res = MockResponse(body, 200, headers={"ETag": '"etag"'})
+
+    # Act
+    cache.set(entity_url, res)
+
+    # Assert
+    entry = cache.get(entity_url)
+    assert entry["body"] == body
+    assert entry["etag"] == '"etag"'
+    assert entry["modified_at"] == body["modified_at"]
+
+
+def test_get_returns_none_for_unknown_urls(cache):
+    # Act & Assert
+    assert cache.get(entity_url) is None
+
+
+def test_remove_deletes_entry(cache):
+    # Arrange
+    cache.set(entity_url, MockResponse({}, 200))
+
+    # Act
+    cache.remove(entity_url)
+
+    # Assert
+    assert cache.get(entity_url) is None
+
+
+def log_in(email):
+    config_p = read_config()
+    config_p.active_profile[config.credentials_keyword] = {"email": email}
+    write_config(config_p)
+
+
+def activate_profile(name):
+    config_p = read_config()
+    config_p[name] = dict(config_p.active_profile)
+    config_p.activate(name)
+    write_config(config_p)
+
+
+@pytest.mark.parametrize(
+    "switch_scope",
+    [lambda: log_in("other@example.com"), lambda: activate_profile("other")],
+)
+def test_entries_are_not_shared_across_users_or_profiles(switch_scope):
+    # Arrange
+    log_in("user@example.com")
+    MetadataCache().set(entity_url, MockResponse({"id": 1}, 200))
+    switch_scope()
+
+    # Act
+    entry = MetadataCache().get(entity_url)
+
+    # Assert
+    assert entry is None
+
+
+def test_entries_are_kept_per_user():
+    # Arrange
+    log_in("user@example.com")
+    MetadataCache().set(entity_url, MockResponse({"owner": "user"}, 200))
+    log_in("other@example.com")
+    MetadataCache().set(entity_url, MockResponse({"owner": "other"}, 200))
+    log_in("user@example.com")
+
+    # Act
+    entry = MetadataCache().get(entity_url)
+
+    # Assert
+    assert entry["body"] == {"owner": "user"}
+
+
+def test_scope_is_read_once(mocker, cache):
+    # Arrange
+    spy = mocker.patch("medperf.comms.metadata_cache.read_config")
+
+    # Act
+    for _ in range(3):
+        cache.set(entity_url, MockResponse({}, 200))
+        cache.get(entity_url)
+    cache.remove(entity_url)
+
+    # Assert
+    spy.assert_not_called()
+
+
+def test_set_ignores_write_failures(mocker, cache):
+    # Arrange
+    mocker.patch("tempfile.mkstemp", side_effect=OSError)
+
+    # Act
+    cache.set(entity_url, MockResponse({}, 200))
+
+    # Assert
+    assert cache.get(entity_url) is None
+
+
+@pytest.mark.parametrize("age,fresh", [(10, True), (1000, False)])
+def test_is_fresh_depends_on_ttl(mocker, cache, age, fresh):
+    # Arrange
+    config.metadata_cache_ttl = 300
+    entry = cache.set(entity_url, MockResponse({}, 200))
+    mocker.patch("time.time", return_value=entry["cached_at"] + age)
+
+    # Act & Assert
+    assert cache.is_fresh(entry) == fresh
+
+
+def test_fresh_entries_are_served_without_requests(mocker, server):
+    # Arrange
+    body = {"id": 1}
+    server.metadata_cache.set(entity_url, MockResponse(body, 200))
+    spy = mocker.patch(patch_server.format("REST._REST__auth_get"))
+
+    # Act
+    retrieved = server.get_benchmark(1)
+
+    # Assert
+    spy.assert_not_called()
+    assert retrieved == body
+
+
+def test_stale_entries_are_revalidated(mocker, server):
+    # Arrange
+    body = {"id": 1}
+    config.metadata_cache_ttl = 0
+    server.metadata_cache.set(entity_url, MockResponse(body, 200, {"ETag": "tag"}))
+    res = MockResponse({}, 304)
+    spy = mocker.patch(patch_server.format("REST._REST__auth_get"), return_value=res)
+
+    # Act
+    retrieved = server.get_benchmark(1)
+
+    # Assert
+    spy.assert_called_once_with(entity_url, headers={"If-None-Match": "tag"})
+    assert retrieved == body
+
+
+def test_modified_entries_are_updated(mocker, server):
+    # Arrange
+    config.metadata_cache_ttl = 0
+    server.metadata_cache.set(entity_url, MockResponse({"id": 1}, 200))
+    new_body = {"id": 1, "name": "new"}
+    res = MockResponse(new_body, 200)
+    mocker.patch(patch_server.format("REST._REST__auth_get"), return_value=res)
+
+    # Act
+    retrieved = server.get_benchmark(1)
+
+    # Assert
+    assert retrieved == new_body
+    assert server.metadata_cache.get(entity_url)["body"] == new_body
+
+
+def test_cache_is_bypassed_if_disabled(mocker, server):
+    # Arrange
+    config.metadata_cache = False
+    server.metadata_cache.set(entity_url, MockResponse({"id": 1}, 200))
+    res = MockResponse({"id": 2}, 200)
+    spy = mocker.patch(patch_server.format("REST._REST__auth_get"), return_value=res)
+
+    # Act
+    retrieved = server.get_benchmark(1)
+
+    # Assert
+    spy.assert_called_once_with(entity_url)
+    assert retrieved == {"id": 2}
+
+
+def test_put_invalidates_cached_entry(mocker, server):
+    # Arrange
+    dset_url = f"{full_url}/datasets/1/"
+    server.metadata_cache.set(dset_url, MockResponse({"id": 1}, 200))
+    mocker.patch(
+        patch_server.format("REST._REST__auth_req"), return_value=MockResponse({}, 200)
+    )
+
+    # Act
+    server.update_dataset(1, {})
+
+    # Assert
+    assert server.metadata_cache.get(dset_url) is None
+
+
+def test_get_cubes_metadata_caches_each_cube(mocker, server):
+    # Arrange
+    cubes = [{"id": 1}, {"id": 2}]
+    mocker.patch(patch_server.format("REST._REST__get_list"), return_value=cubes)
+    spy = mocker.patch(patch_server.format("REST._REST__auth_get"))
+
+    # Act
+    server.get_cubes_metadata([1, 2])
+    retrieved = server.get_cube_metadata(2)
+
+    # Assert
+    spy.assert_not_called()
+    assert retrieved == cubes[1]
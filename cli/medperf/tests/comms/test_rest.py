@@ -1,4 +1,6 @@
 from medperf.exceptions import CommunicationRequestError, CommunicationRetrievalError
+import gzip
+import json
 import pytest
 import requests
 from unittest.mock import ANY, call
@@ -135,26 +137,37 @@ def test_methods_exit_if_status_not_200(mocker, server, status, method_params):
 
 def test_auth_get_calls_authorized_request(mocker, server):
     # Arrange
-    mocker.patch("requests.get")
     spy = mocker.patch(patch_server.format("REST._REST__auth_req"))
 
     # Act
     server._REST__auth_get(url)
 
     # Assert
-    spy.called_once_with(url, requests.get)
+    spy.assert_called_once_with(url, server.session.get)
 
 
 def test_auth_post_calls_authorized_request(mocker, server):
     # Arrange
-    mocker.patch("requests.post")
     spy = mocker.patch(patch_server.format("REST._REST__auth_req"))
 
     # Act
     server._REST__auth_post(url)
 
     # Assert
-    spy.called_once_with(url, requests.post)
+    spy.assert_called_once_with(url, server.session.post)
+
+
+def test_server_reuses_the_same_session(mocker, server, auth):
+    # Arrange
+    res = MockResponse({}, 200)
+    spy = mocker.patch.object(server.session, "request", return_value=res)
+
+    # Act
+    server._REST__auth_get(url)
+    server._REST__auth_put(url)
+
+    # Assert
+    assert spy.call_count == 2
 
 
 @pytest.mark.parametrize("req_type", ["get", "post"])
@@ -183,7 +196,7 @@ def test_auth_get_adds_token_to_request(mocker, server, token, req_type, auth):
 def test__req_sanitizes_json(mocker, server):
     # Arrange
     body = {}
-    spy = mocker.patch(patch_server.format("sanitize_json"))
+    spy = mocker.patch(patch_server.format("sanitize_json"), return_value=body)
     mocker.patch("requests.post")
     func = requests.post
 
@@ -194,6 +207,103 @@ def test__req_sanitizes_json(mocker, server):
     spy.assert_called_once_with(body)
 
 
+def test__req_compresses_large_json_bodies(mocker, server):
+    # Arrange
+    body = {"report": "x" * config.comms_compression_min_size}
+    config.comms_compress_requests = True
+    spy = mocker.patch("requests.post")
+    func = requests.post
+
+    # Act
+    server._REST__req(url, func, json=body)
+
+    # Assert
+    kwargs = spy.call_args.kwargs
+    assert "json" not in kwargs
+    assert kwargs["headers"]["Content-Encoding"] == "gzip"
+    assert kwargs["headers"]["Content-Type"] == "application/json"
+    assert json.loads(gzip.decompress(kwargs["data"])) == body
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test__req_sends_small_json_bodies_uncompressed(mocker, server, compress):
+    # Arrange
+    body = {"report": "x"}
+    big_body = {"report": "x" * config.comms_compression_min_size}
+    config.comms_compress_requests = compress
+    spy = mocker.patch("requests.post")
+    func = requests.post
+
+    # Act
+    server._REST__req(url, func, json=body)
+    if not compress:
+        server._REST__req(url, func, json=big_body)
+
+    # Assert
+    for req_call in spy.call_args_list:
+        assert "data" not in req_call.kwargs
+        assert "headers" not in req_call.kwargs
+
+
+def test__req_sends_json_bodies_uncompressed_by_default(mocker, server):
+    # Arrange
+    body = {"report": "x" * config.comms_compression_min_size}
+    spy = mocker.patch("requests.post")
+    func = requests.post
+
+    # Act
+    server._REST__req(url, func, json=body)
+
+    # Assert
+    assert spy.call_args.kwargs["json"] == body
+    assert "data" not in spy.call_args.kwargs
+
+
+@pytest.mark.parametrize("rejected_status", [400, 415])
+def test__req_resends_uncompressed_if_the_server_rejects_compression(
+    mocker, server, rejected_status
+):
+    # Arrange
+    body = {"report": "x" * config.comms_compression_min_size}
+    config.comms_compress_requests = True
+    spy = mocker.patch(
+        "requests.post",
+        side_effect=[
+            MockResponse({}, rejected_status),
+            MockResponse({}, 201),
+            MockResponse({}, 201),
+        ],
+    )
+    func = requests.post
+
+    # Act
+    res = server._REST__req(url, func, json=body)
+    server._REST__req(url, func, json=body)
+
+    # Assert
+    assert res.status_code == 201
+    assert "data" in spy.call_args_list[0].kwargs
+    for req_call in spy.call_args_list[1:]:
+        assert req_call.kwargs["json"] == body
+        assert "data" not in req_call.kwargs
+
+
+def test__req_keeps_compressing_if_invalid_requests_are_rejected(mocker, server):
+    # Arrange
+    body = {"report": "x" * config.comms_compression_min_size}
+    config.comms_compress_requests = True
+    spy = mocker.patch("requests.post", return_value=MockResponse({}, 400))
+    func = requests.post
+
+    # Act
+    res = server._REST__req(url, func, json=body)
+    server._REST__req(url, func, json=body)
+
+    # Assert
+    assert res.status_code == 400
+    assert "data" in spy.call_args_list[2].kwargs
+
+
 def test__get_list_uses_default_page_size(mocker, server):
     # Arrange
     exp_page_size = config.default_page_size
@@ -275,6 +385,190 @@ def test__get_list_fails_if_failing_element_encountered(mocker, server):
         server._REST__get_list(url, page_size=1)
 
 
+def paginated_server(count, failing_limits=[]):
+    """Mocks a paginated endpoint with `count` elements, where each element is its position.
+    Requests with a limit contained in `failing_limits` fail"""
+
+    def get(paginated_url):
+        query = paginated_url.split("?")[1]
+        params = dict(param.split("=") for param in query.split("&"))
+        limit, offset = int(params["limit"]), int(params["offset"])
+        if limit in failing_limits:
+            return MockResponse({}, 500)
+        results = list(range(offset, min(offset + limit, count)))
+        next_url = url if offset + limit < count else None
+        return MockResponse({"count": count, "next": next_url, "results": results}, 200)
+
+    return get
+
+
+def cursor_server(elements, failing_limits=[]):
+    """Mocks a cursor-paginated endpoint returning `elements`, where the cursor is
+    the position of the next element. Requests with a limit contained in `failing_limits` fail"""
+
+    def get(paginated_url):
+        query = paginated_url.split("?")[1]
+        params = dict(param.split("=") for param in query.split("&"))
+        assert params["pagination"] == "cursor"
+        limit, position = int(params["limit"]), int(params.get("cursor", 0))
+        if limit in failing_limits:
+            return MockResponse({}, 500)
+        next_position = position + limit
+        results = elements[position:next_position]
+        next_url = None
+        if next_position < len(elements):
+            next_url = f"{url}?pagination=cursor&cursor={next_position}"
+        return MockResponse({"next": next_url, "results": results}, 200)
+
+    return get
+
+
+@pytest.mark.parametrize("count", [0, 33, 100])
+def test__get_list_follows_cursors(mocker, server, count):
+    # Arrange
+    config.comms_cursor_pagination = True
+    elements = [{"id": id} for id in range(count)]
+    spy = mocker.patch.object(
+        server, "_REST__auth_get", side_effect=cursor_server(elements)
+    )
+    num_pages = max(1, -(-count // config.default_page_size))
+
+    # Act
+    retrieved = server._REST__get_list(url)
+
+    # Assert
+    assert retrieved == elements
+    assert spy.call_count == num_pages
+
+
+def test__get_list_with_cursors_keeps_latest_version_of_elements(mocker, server):
+    # Arrange
+    config.comms_cursor_pagination = True
+    elements = [{"id": id, "version": 0} for id in range(40)]
+    # Element 0 was modified after the first page was retrieved
+    elements.append({"id": 0, "version": 1})
+    mocker.patch.object(server, "_REST__auth_get", side_effect=cursor_server(elements))
+
+    # Act
+    retrieved = server._REST__get_list(url)
+
+    # Assert
+    assert len(retrieved) == 40
+    assert retrieved[0] == {"id": 0, "version": 1}
+
+
+def test__get_list_with_cursors_reduces_page_size_on_error(mocker, server):
+    # Arrange
+    config.comms_cursor_pagination = True
+    elements = [{"id": id} for id in range(40)]
+    failing_limits = [config.default_page_size]
+    mocker.patch.object(
+        server, "_REST__auth_get", side_effect=cursor_server(elements, failing_limits)
+    )
+
+    # Act
+    retrieved = server._REST__get_list(url, binary_reduction=True)
+
+    # Assert
+    assert retrieved == elements
+
+
+@pytest.mark.parametrize("count", [33, 100, 257])
+def test__get_list_fetches_remaining_pages_from_count(mocker, server, count):
+    # Arrange
+    page_size = config.default_page_size
+    num_pages = -(-count // page_size)
+    spy = mocker.patch.object(
+        server, "_REST__auth_get", side_effect=paginated_server(count)
+    )
+
+    # Act
+    elements = server._REST__get_list(url)
+
+    # Assert
+    assert elements == list(range(count))
+    assert spy.call_count == num_pages
+
+
+def test__get_list_keeps_query_parameters_of_url(mocker, server):
+    # Arrange
+    spy = mocker.patch.object(
+        server, "_REST__auth_get", side_effect=paginated_server(10)
+    )
+    filtered_url = f"{url}?id__in=1,2"
+
+    # Act
+    server._REST__get_list(filtered_url)
+
+    # Assert
+    spy.assert_called_once_with(
+        f"{filtered_url}&limit={config.default_page_size}&offset=0"
+    )
+
+
+@pytest.mark.parametrize("uids", [[1], [4, 2, 7]])
+def test_get_cubes_metadata_requests_all_cubes_at_once(mocker, server, uids):
+    # Arrange
+    spy = mocker.patch(patch_server.format("REST._REST__get_list"), return_value=[])
+    ids = ",".join(str(uid) for uid in uids)
+    exp_url = f"{full_url}/mlcubes/?id__in={ids}"
+
+    # Act
+    server.get_cubes_metadata(uids)
+
+    # Assert
+    spy.assert_called_once_with(exp_url)
+
+
+def test_get_cubes_metadata_with_no_uids_does_not_request(mocker, server):
+    # Arrange
+    spy = mocker.patch(patch_server.format("REST._REST__get_list"))
+
+    # Act
+    cubes = server.get_cubes_metadata([])
+
+    # Assert
+    spy.assert_not_called()
+    assert cubes == []
+
+
+@pytest.mark.parametrize("num_elements", [40, 70])
+def test__get_list_fetches_only_desired_elements(mocker, server, num_elements):
+    # Arrange
+    spy = mocker.patch.object(
+        server, "_REST__auth_get", side_effect=paginated_server(1000)
+    )
+
+    # Act
+    elements = server._REST__get_list(url, num_elements=num_elements)
+
+    # Assert
+    assert elements == list(range(num_elements))
+    assert spy.call_count == -(-num_elements // config.default_page_size)
+
+
+def test__get_list_splits_remaining_pages_on_error(mocker, server):
+    # Arrange
+    get = paginated_server(80, failing_limits=[16])
+    mocker.patch.object(server, "_REST__auth_get", side_effect=get)
+
+    # Act
+    elements = server._REST__get_list(url, page_size=16, binary_reduction=True)
+
+    # Assert
+    assert elements == list(range(80))
+
+
+def test__get_list_fails_if_remaining_page_fails(mocker, server):
+    # Arrange
+    get = paginated_server(80, failing_limits=[16])
+    mocker.patch.object(server, "_REST__auth_get", side_effect=get)
+
+    # Act & Assert
+    with pytest.raises(CommunicationRetrievalError):
+        server._REST__get_list(url, page_size=32)
+
+
 @pytest.mark.parametrize("body", [{"benchmark": 1}, {}, {"test": "test"}])
 def test_get_benchmarks_calls_benchmarks_path(mocker, server, body):
     # Arrange
@@ -288,6 +582,32 @@ def test_get_benchmarks_calls_benchmarks_path(mocker, server, body):
     assert bmarks == [body]
 
 
+@pytest.mark.parametrize(
+    "method,path",
+    [
+        ("get_benchmarks", "benchmarks/"),
+        ("get_user_benchmarks", "me/benchmarks/"),
+        ("get_cubes", "mlcubes/"),
+        ("get_user_cubes", "me/mlcubes/"),
+        ("get_datasets", "datasets/"),
+        ("get_user_datasets", "me/datasets/"),
+        ("get_results", "results"),
+        ("get_user_results", "me/results/"),
+    ],
+)
+def test_list_methods_send_filters_as_query_parameters(mocker, server, method, path):
+    # Arrange
+    spy = mocker.patch(patch_server.format("REST._REST__get_list"), return_value=[])
+    filters = {"state": "OPERATION", "is_valid": True, "owner": None}
+    exp_url = f"{full_url}/{path}?state=OPERATION&is_valid=True"
+
+    # Act
+    getattr(server, method)(filters=filters)
+
+    # Assert
+    spy.assert_called_once_with(exp_url)
+
+
 def test_get_benchmark_model_associations_calls_expected_functions(mocker, server):
     # Arrange
     assocs = [{"model_mlcube": uid} for uid in [1, 2, 3]]
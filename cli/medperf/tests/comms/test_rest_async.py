@@ -0,0 +1,106 @@
+import time
+import pytest
+from functools import partial
+
+from medperf import config
+from medperf.comms.factory import CommsFactory
+from medperf.comms.rest_async import AsyncREST
+from medperf.comms.utils import gather
+from medperf.exceptions import CommunicationRetrievalError, InvalidArgumentError
+
+url = "https://mock.url"
+
+
+@pytest.fixture
+def server(mocker, ui):
+    server = AsyncREST(url)
+    return server
+
+
+@pytest.mark.parametrize("name", ["REST-async", "rest-async"])
+def test_factory_creates_async_rest(name):
+    # Act
+    comms = CommsFactory.create_comms(name, url)
+
+    # Assert
+    assert isinstance(comms, AsyncREST)
+
+
+def test_factory_fails_for_unknown_interface():
+    # Act & Assert
+    with pytest.raises(InvalidArgumentError):
+        CommsFactory.create_comms("unknown", url)
+
+
+def test_gather_returns_results_in_order(server):
+    # Arrange
+    def delayed(value, delay):
+        time.sleep(delay)
+        return value
+
+    funcs = [partial(delayed, 1, 0.2), partial(delayed, 2, 0.1), partial(delayed, 3, 0)]
+
+    # Act
+    results = server.gather(*funcs)
+
+    # Assert
+    assert results == [1, 2, 3]
+
+
+def test_gather_runs_calls_concurrently(server):
+    # Arrange
+    delay = 0.2
+    funcs = [partial(time.sleep, delay) for _ in range(4)]
+
+    # Act
+    start = time.time()
+    server.gather(*funcs)
+    elapsed = time.time() - start
+
+    # Assert
+    assert elapsed < delay * len(funcs)
+
+
+def test_gather_raises_errors_of_calls(server):
+    # Arrange
+    def failing():
+        raise CommunicationRetrievalError
+
+    # Act & Assert
+    with pytest.raises(CommunicationRetrievalError):
+        server.gather(lambda: 1, failing)
+
+
+def test_gather_helper_uses_async_comms(mocker, server):
+    # Arrange
+    config.comms = server
+    spy = mocker.spy(server, "gather")
+    funcs = [lambda: 1, lambda: 2]
+
+    # Act
+    results = gather(*funcs)
+
+    # Assert
+    assert results == [1, 2]
+    spy.assert_called_once_with(*funcs)
+
+
+def test_gather_helper_runs_sequentially_for_other_comms(comms):
+    # Act
+    results = gather(lambda: 1, lambda: 2)
+
+    # Assert
+    assert results == [1, 2]
+
+
+def test_close_stops_the_thread_pool(mocker, server):
+    # Arrange
+    session_spy = mocker.spy(server.session, "close")
+
+    # Act
+    server.close()
+
+    # Assert
+    session_spy.assert_called_once()
+    with pytest.raises(RuntimeError):
+        server.executor.submit(lambda: 1)
@@ -0,0 +1,74 @@
+import pytest
+from unittest.mock import MagicMock
+
+from medperf import config
+from medperf.comms.session import JitteredRetry, create_session, get_connection_stats
+
+
+@pytest.fixture
+def session():
+    return create_session()
+
+
+def test_create_session_mounts_pooled_adapter(session):
+    # Arrange
+    exp_pool_maxsize = config.comms_pool_maxsize
+
+    # Act
+    adapter = session.get_adapter("https://mock.url")
+
+    # Assert
+    assert adapter._pool_maxsize == exp_pool_maxsize
+    assert isinstance(adapter.max_retries, JitteredRetry)
+
+
+def test_create_session_retries_expected_statuses(session):
+    # Arrange
+    adapter = session.get_adapter("https://mock.url")
+
+    # Act
+    retries = adapter.max_retries
+
+    # Assert
+    assert retries.total == config.comms_max_retries
+    assert set(retries.status_forcelist) == set(config.comms_retry_status_codes)
+    assert not retries.raise_on_status
+
+
+def test_create_session_accepts_compressed_responses(session):
+    # Act
+    accept_encoding = session.headers["Accept-Encoding"]
+
+    # Assert
+    assert "gzip" in accept_encoding
+
+
+@pytest.mark.parametrize("num_retries", [1, 3, 10])
+def test_backoff_time_is_jittered_and_capped(mocker, num_retries):
+    # Arrange
+    spy = mocker.patch("medperf.comms.session.random.uniform", return_value=0.1)
+    config.comms_backoff_max = 2
+    retry = JitteredRetry(total=20, backoff_factor=1)
+    for _ in range(num_retries):
+        retry = retry.increment(method="GET", url="https://mock.url")
+
+    # Act
+    backoff = retry.get_backoff_time()
+
+    # Assert
+    assert backoff == 0.1
+    _, max_backoff = spy.call_args[0]
+    assert max_backoff <= config.comms_backoff_max
+
+
+def test_get_connection_stats_counts_opened_and_reused(session):
+    # Arrange
+    pool = MagicMock(num_connections=2, num_requests=7)
+    adapter = session.get_adapter("https://mock.url")
+    adapter.poolmanager.pools["key"] = pool
+
+    # Act
+    stats = get_connection_stats(session)
+
+    # Assert
+    assert stats == {"opened": 2, "reused": 5}
@@ -21,8 +21,14 @@ def disable_network_calls(monkeypatch):
     def stunted_post():
         raise Exception("There was an attempt at executing a post request")
 
+    def stunted_session_request():
+        raise Exception("There was an attempt at executing a session request")
+
     monkeypatch.setattr(requests, "get", lambda *args, **kwargs: stunted_get())
     monkeypatch.setattr(requests, "post", lambda *args, **kwargs: stunted_post())
+    monkeypatch.setattr(
+        requests.Session, "request", lambda *args, **kwargs: stunted_session_request()
+    )
 
 
 @pytest.fixture()
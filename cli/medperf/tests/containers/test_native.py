@@ -0,0 +1,188 @@
+import os
+import shlex
+import pytest
+import yaml
+
+from medperf import config
+from medperf.containers import native
+
+CUBE_PATH = "/cube/mlcube.yaml"
+WORKSPACE = "/cube/workspace"
+MANIFEST = {
+    "docker": {"image": "mlcommons/model:0.0.1", "gpu_args": "--shm-size=1g"},
+    "tasks": {
+        "infer": {
+            "parameters": {
+                "inputs": {
+                    "data_path": "data/",
+                    "parameters_file": "parameters.yaml",
+                },
+                "outputs": {"output_path": {"type": "directory", "default": "out"}},
+            }
+        }
+    },
+}
+
+
+@pytest.fixture
+def cube(fs):
+    fs.create_file(CUBE_PATH, contents=yaml.dump(MANIFEST))
+    fs.create_file(os.path.join(WORKSPACE, "parameters.yaml"))
+    return CUBE_PATH
+
+
+def test_load_manifest_rejects_variable_interpolation(fs):
+    # Arrange
+    fs.create_file(CUBE_PATH, contents="docker:\n  image: ${name.image}\n")
+
+    # Act & Assert
+    with pytest.raises(native.UnsupportedTask):
+        native.load_manifest(CUBE_PATH)
+
+
+def test_task_mounts_mounts_the_folder_of_each_parameter(cube):
+    # Act
+    mounts, task_args, _ = native.task_mounts(
+        MANIFEST, WORKSPACE, "infer", {"data_path": "/data/"}
+    )
+
+    # Assert
+    assert mounts == {
+        "/data": "/mlcube_io0",
+        WORKSPACE: "/mlcube_io1",
+        os.path.join(WORKSPACE, "out"): "/mlcube_io2",
+    }
+    assert task_args == [
+        "--data_path=/mlcube_io0",
+        "--parameters_file=/mlcube_io1/parameters.yaml",
+        "--output_path=/mlcube_io2",
+    ]
+
+
+def test_task_mounts_creates_the_mounted_folders(cube):
+    # Act
+    native.task_mounts(MANIFEST, WORKSPACE, "infer", {})
+
+    # Assert
+    assert os.path.isdir(os.path.join(WORKSPACE, "data"))
+    assert os.path.isdir(os.path.join(WORKSPACE, "out"))
+
+
+@pytest.mark.parametrize("read_protected_input", [True, False])
+def test_task_mounts_protects_inputs_if_requested(cube, read_protected_input):
+    # Arrange
+    input_opts = "ro" if read_protected_input else "rw"
+
+    # Act
+    _, _, mounts_opts = native.task_mounts(
+        MANIFEST, WORKSPACE, "infer", {}, read_protected_input
+    )
+
+    # Assert
+    assert mounts_opts == {
+        os.path.join(WORKSPACE, "data"): input_opts,
+        WORKSPACE: input_opts,
+        os.path.join(WORKSPACE, "out"): "rw",
+    }
+
+
+def test_task_mounts_makes_folders_used_by_outputs_writable(cube):
+    # Arrange
+    args = {"output_path": os.path.join(WORKSPACE, "data")}
+
+    # Act
+    mounts, _, mounts_opts = native.task_mounts(MANIFEST, WORKSPACE, "infer", args)
+
+    # Assert
+    assert len(mounts) == 2
+    assert mounts_opts[os.path.join(WORKSPACE, "data")] == "rw"
+
+
+@pytest.mark.parametrize(
+    "task_def",
+    [
+        None,
+        {"entrypoint": "python run.py", "parameters": {}},
+        {"parameters": {"outputs": {"output": "unknown_type"}}},
+    ],
+)
+def test_task_mounts_rejects_unsupported_tasks(fs, task_def):
+    # Arrange
+    manifest = {"tasks": {"other": {}}}
+    if task_def is not None:
+        manifest["tasks"]["infer"] = task_def
+
+    # Act & Assert
+    with pytest.raises(native.UnsupportedTask):
+        native.task_mounts(manifest, WORKSPACE, "infer", {})
+
+
+def test_docker_command_isolates_the_container(cube):
+    # Act
+    cmd = native.run_command(CUBE_PATH, "infer", {}, "docker")
+
+    # Assert
+    cmd = shlex.split(cmd)
+    assert cmd[:4] == ["docker", "run", "--rm", "--network=none"]
+    assert cmd[cmd.index("-u") + 1] == f"{os.getuid()}:{os.getgid()}"
+    assert f"{WORKSPACE}/data:/mlcube_io0:ro" in cmd
+    assert f"{WORKSPACE}/out:/mlcube_io2" in cmd
+    assert cmd[-5:] == [
+        "mlcommons/model:0.0.1",
+        "infer",
+        "--data_path=/mlcube_io0",
+        "--parameters_file=/mlcube_io1/parameters.yaml",
+        "--output_path=/mlcube_io2",
+    ]
+
+
+@pytest.mark.parametrize("gpus", [None, "all"])
+def test_docker_command_uses_gpu_args_only_with_gpus(cube, gpus):
+    # Act
+    cmd = shlex.split(native.run_command(CUBE_PATH, "infer", {}, "docker", gpus))
+
+    # Assert
+    assert ("--shm-size=1g" in cmd) == (gpus is not None)
+    assert ("--gpus=all" in cmd) == (gpus is not None)
+
+
+def test_docker_command_passes_the_container_loglevel(cube):
+    # Arrange
+    config.container_loglevel = "debug"
+
+    # Act
+    cmd = shlex.split(native.run_command(CUBE_PATH, "infer", {}, "docker"))
+
+    # Assert
+    assert cmd[cmd.index("-e") + 1] == "MEDPERF_LOGLEVEL=DEBUG"
+
+
+def test_docker_command_rejects_image_tarballs(cube):
+    # Arrange
+    manifest = {**MANIFEST, "docker": {"image": "image", "tar_file": "image.tar"}}
+
+    # Act & Assert
+    with pytest.raises(native.UnsupportedTask):
+        native.docker_command(manifest, "infer", {}, [], {})
+
+
+def test_singularity_command_runs_the_converted_image(cube):
+    # Act
+    cmd = native.run_command(
+        CUBE_PATH, "infer", {}, "singularity", "device=1", image_name="model.sif"
+    )
+
+    # Assert
+    cmd = shlex.split(cmd)
+    assert cmd[:2] == ["singularity", "run"]
+    assert "--network=none" in cmd
+    assert "--nv" in cmd
+    assert cmd[cmd.index("--env") + 1] == "CUDA_VISIBLE_DEVICES=1"
+    assert f"{WORKSPACE}/data:/mlcube_io0:ro" in cmd
+    assert os.path.join(WORKSPACE, ".image", "model.sif") in cmd
+
+
+def test_run_command_rejects_unknown_platforms(cube):
+    # Act & Assert
+    with pytest.raises(native.UnsupportedTask):
+        native.run_command(CUBE_PATH, "infer", {}, "podman")
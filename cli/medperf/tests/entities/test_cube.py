@@ -12,7 +12,13 @@ from medperf.tests.entities.utils import (
     setup_cube_comms_downloads,
 )
 from medperf.tests.mocks.pexpect import MockPexpect
-from medperf.exceptions import ExecutionError, InvalidEntityError
+from medperf.tests.mocks.cube import TestCube
+from medperf.containers import native
+from medperf.exceptions import (
+    ExecutionError,
+    InvalidArgumentError,
+    InvalidEntityError,
+)
 
 PATCH_CUBE = "medperf.entities.cube.{}"
 DEFAULT_CUBE = {"id": 37}
@@ -196,6 +202,24 @@ class TestRun:
         # Assert
         spy.assert_any_call(expected_cmd, timeout=timeout)
 
+    def test_cube_runs_command_without_gpus_if_zero_are_requested(
+        self, mocker, setup, task
+    ):
+        # Arrange
+        config.gpus = "device=1"
+        mpexpect = MockPexpect(0, "expected_hash")
+        spy = mocker.patch(
+            PATCH_CUBE.format("spawn_and_kill.spawn"), side_effect=mpexpect.spawn
+        )
+        mocker.patch(PATCH_CUBE.format("Cube.get_config"), side_effect=["", ""])
+
+        # Act
+        cube = Cube.get(self.id)
+        cube.run(task, gpus="0")
+
+        # Assert
+        assert "--gpus" not in spy.call_args.args[0]
+
     def test_cube_runs_command_with_rw_access(self, mocker, setup, task):
         # Arrange
         mpexpect = MockPexpect(0, "expected_hash")
@@ -281,6 +305,69 @@ class TestRun:
         with pytest.raises(ExecutionError):
             cube.run(task)
 
+    def test_native_engine_runs_container_directly(self, mocker, setup, task):
+        # Arrange
+        config.container_engine = "native"
+        mpexpect = MockPexpect(0, "expected_hash")
+        spy = mocker.patch(
+            PATCH_CUBE.format("spawn_and_kill.spawn"), side_effect=mpexpect.spawn
+        )
+        native_spy = mocker.patch(
+            PATCH_CUBE.format("native.run_command"), return_value="docker run image"
+        )
+
+        # Act
+        cube = Cube.get(self.id)
+        cube.image_tarball_url = None
+        cube.run(task, read_protected_input=False, test="test")
+
+        # Assert
+        native_spy.assert_called_once_with(
+            self.manifest_path,
+            task,
+            {"test": "test"},
+            self.platform,
+            gpus=self.gpus,
+            read_protected_input=False,
+            image_name=cube._converted_singularity_image_name,
+        )
+        spy.assert_any_call("docker run image", timeout=None)
+
+    @pytest.mark.parametrize("has_tarball", [True, False])
+    def test_native_engine_falls_back_to_mlcube(
+        self, mocker, setup, task, has_tarball
+    ):
+        # Arrange
+        config.container_engine = "native"
+        mpexpect = MockPexpect(0, "expected_hash")
+        spy = mocker.patch(
+            PATCH_CUBE.format("spawn_and_kill.spawn"), side_effect=mpexpect.spawn
+        )
+        mocker.patch(
+            PATCH_CUBE.format("native.run_command"),
+            side_effect=native.UnsupportedTask("unsupported"),
+        )
+        mocker.patch(PATCH_CUBE.format("Cube.get_config"), side_effect=["", ""])
+
+        # Act
+        cube = Cube.get(self.id)
+        if not has_tarball:
+            cube.image_tarball_url = None
+        cube.run(task)
+
+        # Assert
+        cmd = spy.call_args[0][0]
+        assert cmd.startswith("mlcube --log-level debug run")
+
+    def test_run_fails_with_unknown_container_engine(self, mocker, setup, task):
+        # Arrange
+        config.container_engine = "podman"
+
+        # Act & Assert
+        cube = Cube.get(self.id)
+        with pytest.raises(InvalidArgumentError):
+            cube.run(task)
+
 
 @pytest.mark.parametrize("setup", [{"local": [DEFAULT_CUBE]}], indirect=True)
 @pytest.mark.parametrize("task", ["task"])
@@ -338,3 +425,20 @@ class TestDefaultOutput:
 
         # Assert
         assert out_path == exp_path
+
+
+@pytest.mark.parametrize("setup", [{"remote": [4, 5, 6]}], indirect=True)
+def test_get_many_stores_all_cubes_locally(mocker, comms, setup):
+    # Arrange
+    uids = [4, 6]
+    metas = [TestCube(id=uid).dict() for uid in uids]
+    spy = mocker.patch.object(comms, "get_cubes_metadata", return_value=metas)
+
+    # Act
+    cubes = Cube.get_many(uids)
+
+    # Assert
+    spy.assert_called_once_with(uids)
+    assert [cube.id for cube in cubes] == uids
+    for uid in uids:
+        assert Cube.get(uid, local_only=True).id == uid
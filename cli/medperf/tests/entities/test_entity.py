@@ -85,6 +85,50 @@ class TestAll:
         assert self.local_ids == retrieved_ids
 
 
+@pytest.mark.parametrize("setup", [{"remote": [1, 2]}], indirect=True)
+class TestAllFilters:
+    @pytest.fixture(autouse=True)
+    def set_common_attributes(self, mocker, comms, Implementation, setup):
+        user_data = {"id": 1}
+        for module in ["benchmark", "cube", "dataset", "result"]:
+            mocker.patch(
+                f"medperf.entities.{module}.get_medperf_user_data",
+                return_value=user_data,
+            )
+        comms_calls = {
+            Benchmark: ("get_benchmarks", "get_user_benchmarks"),
+            Cube: ("get_cubes", "get_user_cubes"),
+            Dataset: ("get_datasets", "get_user_datasets"),
+            Result: ("get_results", "get_user_results"),
+        }
+        get_all, get_user = comms_calls[Implementation]
+        self.get_all_spy = getattr(comms, get_all)
+        self.get_user_spy = getattr(comms, get_user)
+
+    def test_all_pushes_supported_filters_to_server(self, Implementation):
+        # Arrange
+        filters = {"owner": 2, "is_valid": True, "unsupported": "value"}
+
+        # Act
+        Implementation.all(filters=filters)
+
+        # Assert
+        self.get_all_spy.assert_called_once_with(
+            filters={"owner": 2, "is_valid": True}
+        )
+
+    def test_all_filtered_by_current_user_uses_user_endpoint(self, Implementation):
+        # Arrange
+        filters = {"owner": 1, "is_valid": True}
+
+        # Act
+        Implementation.all(filters=filters)
+
+        # Assert
+        self.get_all_spy.assert_not_called()
+        self.get_user_spy.assert_called_once_with(filters={"is_valid": True})
+
+
 @pytest.mark.parametrize(
     "setup", [{"local": [78], "remote": [479, 42, 7, 1]}], indirect=True
 )
@@ -1,5 +1,8 @@
 class MockTar:
-    def extractall(self, path):
+    def __iter__(self):
+        return iter([])
+
+    def extractall(self, path, members=None):
         pass
 
     def close(self):
@@ -0,0 +1,65 @@
+import pytest
+
+from medperf.storage import evaluations
+from medperf.tests.mocks.cube import TestCube
+
+EVALUATOR = TestCube(id=3)
+
+
+@pytest.fixture
+def inputs(fs):
+    fs.create_file("preds/out.csv", contents="1,2")
+    fs.create_file("labels/labels.csv", contents="1,3")
+    return "preds", "labels"
+
+
+def test_evaluation_key_depends_on_evaluator_predictions_and_labels(inputs, fs):
+    # Arrange
+    preds_path, labels_path = inputs
+    fs.create_file("renamed_preds/renamed.csv", contents="1,2")
+    fs.create_file("other_labels/labels.csv", contents="1,4")
+    other_evaluator = TestCube(id=3, mlcube_hash="other")
+
+    # Act
+    key = evaluations.evaluation_key(EVALUATOR, preds_path, labels_path)
+
+    # Assert
+    assert key == evaluations.evaluation_key(TestCube(id=3), preds_path, labels_path)
+    assert key != evaluations.evaluation_key(other_evaluator, preds_path, labels_path)
+    assert key != evaluations.evaluation_key(EVALUATOR, "renamed_preds", labels_path)
+    assert key != evaluations.evaluation_key(EVALUATOR, preds_path, "other_labels")
+
+
+def test_evaluation_key_is_none_for_unidentified_evaluators(inputs):
+    # Arrange
+    evaluator = TestCube(id=3, mlcube_hash=None)
+
+    # Act
+    key = evaluations.evaluation_key(evaluator, *inputs)
+
+    # Assert
+    assert key is None
+
+
+def test_memoized_results_can_be_retrieved(inputs, fs):
+    # Arrange
+    key = evaluations.evaluation_key(EVALUATOR, *inputs)
+    fs.create_file("results.yaml", contents="metric: 0.5\n")
+    evaluations.memoize_results(key, "results.yaml")
+
+    # Act
+    results = evaluations.get_memoized_results(key)
+
+    # Assert
+    assert results == {"metric": 0.5}
+
+
+def test_get_memoized_results_misses_unknown_keys(inputs):
+    # Arrange
+    key = evaluations.evaluation_key(EVALUATOR, *inputs)
+
+    # Act
+    results = evaluations.get_memoized_results(key)
+
+    # Assert
+    assert results is None
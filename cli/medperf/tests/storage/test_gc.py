@@ -0,0 +1,239 @@
+import os
+import pytest
+from unittest.mock import MagicMock
+
+from medperf import config
+from medperf.comms.entity_resources import store
+from medperf.storage import gc
+from medperf.storage.index import pinned, pinned_paths, touch
+
+PATCH_GC = "medperf.storage.gc.{}"
+
+
+@pytest.fixture(autouse=True)
+def setup(mocker):
+    mocker.patch(PATCH_GC.format("Dataset.all"), return_value=[])
+    times = iter(range(1000))
+    mocker.patch("medperf.storage.index.time.time", side_effect=lambda: next(times))
+
+
+def create_entry(fs, path, size):
+    fs.create_file(os.path.join(path, "file"), contents="x" * size)
+    touch(path)
+    return path
+
+
+def demo(fs, name, size=10):
+    return create_entry(fs, os.path.join(config.demo_datasets_folder, name), size)
+
+
+def test_collect_garbage_evicts_least_recently_used_first(fs):
+    # Arrange
+    old = demo(fs, "old")
+    new = demo(fs, "new")
+
+    # Act
+    reclaimed = gc.collect_garbage(quota=10)
+
+    # Assert
+    assert reclaimed == 10
+    assert not os.path.exists(old)
+    assert os.path.exists(new)
+
+
+def test_collect_garbage_does_nothing_under_quota(fs):
+    # Arrange
+    old = demo(fs, "old")
+    demo(fs, "new")
+
+    # Act
+    reclaimed = gc.collect_garbage(quota=20)
+
+    # Assert
+    assert reclaimed == 0
+    assert os.path.exists(old)
+
+
+def test_collect_garbage_uses_last_access_not_creation_order(fs):
+    # Arrange
+    old = demo(fs, "old")
+    new = demo(fs, "new")
+    touch(old)
+
+    # Act
+    gc.collect_garbage(quota=10)
+
+    # Assert
+    assert os.path.exists(old)
+    assert not os.path.exists(new)
+
+
+def test_collect_garbage_does_not_evict_pinned_entries(fs):
+    # Arrange
+    old = demo(fs, "old")
+    new = demo(fs, "new")
+
+    # Act
+    with pinned([old]):
+        gc.collect_garbage(quota=10)
+
+    # Assert
+    assert os.path.exists(old)
+    assert not os.path.exists(new)
+
+
+def test_collect_garbage_evicts_predictions(fs):
+    # Arrange
+    preds = os.path.join(config.predictions_folder, "model", "data")
+    create_entry(fs, preds, 10)
+
+    # Act
+    reclaimed = gc.collect_garbage(quota=0)
+
+    # Assert
+    assert reclaimed == 10
+    assert not os.path.exists(preds)
+
+
+def operational_dataset(mocker):
+    dset = MagicMock(
+        state="OPERATION",
+        data_preparation_mlcube=1,
+        generated_uid="d",
+        data_path=os.path.join(config.datasets_folder, "d", "data"),
+        labels_path=os.path.join(config.datasets_folder, "d", "labels"),
+    )
+    mocker.patch(PATCH_GC.format("Dataset.all"), return_value=[dset])
+    return dset
+
+
+def test_collect_garbage_does_not_evict_operational_datasets_assets(mocker, fs):
+    # Arrange
+    operational_dataset(mocker)
+    workspace = os.path.join(config.cubes_folder, "1", config.workspace_path)
+    create_entry(fs, workspace, 10)
+
+    # Act
+    reclaimed = gc.collect_garbage(quota=0)
+
+    # Assert
+    assert reclaimed == 0
+    assert os.path.exists(workspace)
+
+
+def test_collect_garbage_evicts_old_predictions_of_operational_datasets(
+    mocker, fs
+):
+    # Arrange
+    operational_dataset(mocker)
+    old_preds = os.path.join(config.predictions_folder, "model1", "d")
+    new_preds = os.path.join(config.predictions_folder, "model2", "d")
+    create_entry(fs, old_preds, 10)
+    create_entry(fs, new_preds, 10)
+
+    # Act
+    reclaimed = gc.collect_garbage(quota=10)
+
+    # Assert
+    assert reclaimed == 10
+    assert not os.path.exists(old_preds)
+    assert os.path.exists(new_preds)
+
+
+def test_collect_garbage_does_not_evict_local_cubes(fs):
+    # Arrange
+    workspace = os.path.join(config.cubes_folder, "local", config.workspace_path)
+    create_entry(fs, workspace, 10)
+
+    # Act
+    gc.collect_garbage(quota=0)
+
+    # Assert
+    assert os.path.exists(workspace)
+
+
+def test_collect_garbage_evicts_linked_assets_after_their_cubes(fs):
+    # Arrange
+    fs.create_file("/tmp/image", contents="x" * 100)
+    image = store.add_asset(config.images_folder, "/tmp/image", "hash")
+    touch(image)
+    workspace = os.path.join(config.cubes_folder, "1", config.workspace_path)
+    store.link_asset(image, os.path.join(workspace, ".image", "image"))
+    touch(workspace)
+
+    # Act
+    reclaimed = gc.collect_garbage(quota=0)
+
+    # Assert
+    assert reclaimed == 100
+    assert not os.path.exists(workspace)
+    assert not store.has_asset(config.images_folder, "hash")
+
+
+def test_collect_garbage_keeps_linked_assets_if_cube_is_kept(fs):
+    # Arrange
+    fs.create_file("/tmp/image", contents="x" * 100)
+    image = store.add_asset(config.images_folder, "/tmp/image", "hash")
+    workspace = os.path.join(config.cubes_folder, "1", config.workspace_path)
+    store.link_asset(image, os.path.join(workspace, ".image", "image"))
+
+    # Act
+    with pinned([workspace]):
+        reclaimed = gc.collect_garbage(quota=0)
+
+    # Assert
+    assert reclaimed == 0
+    assert store.has_asset(config.images_folder, "hash")
+
+
+def test_storage_usage_counts_hardlinked_files_once(fs):
+    # Arrange
+    fs.create_file("/tmp/file", contents="x" * 100)
+    asset = store.add_asset(config.assets_folder, "/tmp/file", "hash")
+    workspace = os.path.join(config.cubes_folder, "1", config.workspace_path)
+    store.link_asset(asset, os.path.join(workspace, "parameters.yaml"))
+
+    # Act
+    usage = gc.storage_usage(gc.storage_entries())
+
+    # Assert
+    assert usage == 100
+
+
+def test_pinned_paths_removes_pins_of_finished_processes(mocker, fs):
+    # Arrange
+    mocker.patch("os.kill", side_effect=ProcessLookupError)
+
+    # Act
+    with pinned(["/some/path"]):
+        paths = pinned_paths()
+
+    # Assert
+    assert paths == []
+
+
+def test_collect_garbage_evicts_cached_predictions(fs):
+    # Arrange
+    entry = create_entry(fs, os.path.join(config.predictions_cache_folder, "k"), 10)
+
+    # Act
+    reclaimed = gc.collect_garbage(quota=0)
+
+    # Assert
+    assert reclaimed == 10
+    assert not os.path.exists(entry)
+
+
+def test_collect_garbage_only_counts_bytes_actually_freed(mocker, fs):
+    # Arrange
+    old = demo(fs, "old")
+    new = demo(fs, "new")
+    mocker.patch(PATCH_GC.format("shutil.rmtree"), side_effect=OSError)
+
+    # Act
+    reclaimed = gc.collect_garbage(quota=10)
+
+    # Assert
+    assert reclaimed == 0
+    assert os.path.exists(old)
+    assert os.path.exists(new)
@@ -0,0 +1,125 @@
+import os
+import pytest
+
+from medperf import config
+from medperf.storage import predictions
+from medperf.tests.mocks.cube import TestCube
+from medperf.tests.mocks.dataset import TestDataset
+
+MODEL = TestCube(id=2)
+DATASET = TestDataset()
+
+
+@pytest.fixture
+def preds(fs):
+    fs.create_file("preds/out.csv", contents="1,2")
+    fs.create_file("preds/sub/out.csv", contents="3,4")
+    return "preds"
+
+
+def test_cache_key_depends_on_model_hashes_and_dataset():
+    # Arrange
+    other_model = TestCube(id=2, parameters_hash="other")
+    other_dataset = TestDataset(generated_uid="other")
+
+    # Act
+    key = predictions.cache_key(MODEL, DATASET)
+
+    # Assert
+    assert key == predictions.cache_key(TestCube(id=5), TestDataset())
+    assert key != predictions.cache_key(other_model, DATASET)
+    assert key != predictions.cache_key(MODEL, other_dataset)
+
+
+@pytest.mark.parametrize(
+    "hashes",
+    [
+        {"mlcube_hash": None},
+        {"image_hash": None, "image_tarball_hash": None},
+    ],
+)
+def test_cache_key_is_none_for_unidentified_models(hashes):
+    # Arrange
+    model = TestCube(**hashes)
+
+    # Act
+    key = predictions.cache_key(model, DATASET)
+
+    # Assert
+    assert key is None
+
+
+def test_cached_predictions_can_be_retrieved(preds):
+    # Arrange
+    predictions.cache_predictions(MODEL, DATASET, preds)
+
+    # Act
+    cached_preds = predictions.get_cached_predictions(MODEL, DATASET)
+
+    # Assert
+    with open(os.path.join(cached_preds, "sub", "out.csv")) as f:
+        assert f.read() == "3,4"
+
+
+def test_get_cached_predictions_misses_other_models(preds):
+    # Arrange
+    predictions.cache_predictions(MODEL, DATASET, preds)
+    other_model = TestCube(id=2, image_tarball_hash="other")
+
+    # Act
+    cached_preds = predictions.get_cached_predictions(other_model, DATASET)
+
+    # Assert
+    assert cached_preds is None
+
+
+def test_get_cached_predictions_misses_incomplete_entries(preds):
+    # Arrange
+    predictions.cache_predictions(MODEL, DATASET, preds)
+    entry = predictions.cache_entry_path(predictions.cache_key(MODEL, DATASET))
+    os.remove(os.path.join(entry, predictions.MANIFEST_FILE))
+
+    # Act
+    cached_preds = predictions.get_cached_predictions(MODEL, DATASET)
+
+    # Assert
+    assert cached_preds is None
+
+
+def test_get_cached_predictions_discards_corrupted_entries(preds):
+    # Arrange
+    predictions.cache_predictions(MODEL, DATASET, preds)
+    entry = predictions.cache_entry_path(predictions.cache_key(MODEL, DATASET))
+    os.remove(os.path.join(entry, predictions.PREDICTIONS_FOLDER, "out.csv"))
+
+    # Act
+    cached_preds = predictions.get_cached_predictions(MODEL, DATASET)
+
+    # Assert
+    assert cached_preds is None
+    assert not os.path.exists(entry)
+
+
+def test_cached_predictions_are_unaffected_by_removing_the_source(preds):
+    # Arrange
+    predictions.cache_predictions(MODEL, DATASET, preds)
+
+    # Act
+    os.remove(os.path.join(preds, "out.csv"))
+
+    # Assert
+    assert predictions.get_cached_predictions(MODEL, DATASET) is not None
+
+
+def test_restore_predictions_copies_cached_predictions(preds):
+    # Arrange
+    predictions.cache_predictions(MODEL, DATASET, preds)
+    cached_preds = predictions.get_cached_predictions(MODEL, DATASET)
+    restored = os.path.join(config.predictions_folder, "model", "data")
+
+    # Act
+    predictions.restore_predictions(cached_preds, restored)
+
+    # Assert
+    with open(os.path.join(restored, "out.csv")) as f:
+        assert f.read() == "1,2"
@@ -1,5 +1,8 @@
 from datetime import datetime
+import io
+import hashlib
 import os
+import tarfile
 import pytest
 import logging
 from pathlib import Path
@@ -8,7 +11,7 @@ from unittest.mock import mock_open, call, ANY
 from medperf import utils
 import medperf.config as config
 from medperf.tests.mocks import MockTar
-from medperf.exceptions import MedperfException
+from medperf.exceptions import ExecutionError, MedperfException
 import yaml
 
 patch_utils = "medperf.utils.{}"
@@ -108,6 +111,146 @@ def test_get_file_hash_calculates_hash(mocker, file_io):
     assert hash == expected_hash
 
 
+def rewrite_keeping_mtime(path, contents):
+    stat = os.stat(path)
+    with open(path, "w") as f:
+        f.write(contents)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
+def test_get_file_hash_reuses_hash_of_unchanged_file(fs):
+    # Arrange
+    path = "/path/to/file"
+    fs.create_file(path, contents="contents")
+    exp_hash = utils.get_file_hash(path)
+    # Same size and modification time: the file is considered unchanged
+    rewrite_keeping_mtime(path, "CONTENTS")
+
+    # Act
+    hash = utils.get_file_hash(path)
+
+    # Assert
+    assert hash == exp_hash
+
+
+@pytest.mark.parametrize("new_contents", ["new contents", "CONTENTS"])
+def test_get_file_hash_rehashes_changed_file(fs, new_contents):
+    # Arrange
+    path = "/path/to/file"
+    fs.create_file(path, contents="contents")
+    utils.get_file_hash(path)
+    with open(path, "w") as f:
+        f.write(new_contents)
+    os.utime(path, ns=(0, 0))
+    exp_hash = hashlib.sha256(new_contents.encode()).hexdigest()
+
+    # Act
+    hash = utils.get_file_hash(path)
+
+    # Assert
+    assert hash == exp_hash
+
+
+def test_get_file_hash_bypasses_cache_if_strict(fs):
+    # Arrange
+    path = "/path/to/file"
+    fs.create_file(path, contents="contents")
+    utils.get_file_hash(path)
+    rewrite_keeping_mtime(path, "CONTENTS")
+    config.strict_hashing = True
+    exp_hash = hashlib.sha256(b"CONTENTS").hexdigest()
+
+    # Act
+    hash = utils.get_file_hash(path)
+
+    # Assert
+    assert hash == exp_hash
+
+
+def test_get_file_hash_bypasses_cache_if_requested(fs):
+    # Arrange
+    path = "/path/to/file"
+    fs.create_file(path, contents="contents")
+    utils.get_file_hash(path)
+    rewrite_keeping_mtime(path, "CONTENTS")
+    exp_hash = hashlib.sha256(b"CONTENTS").hexdigest()
+
+    # Act
+    hash = utils.get_file_hash(path, strict=True)
+
+    # Assert
+    assert hash == exp_hash
+
+
+def test_get_file_hash_caches_hashes_in_one_index_per_folder(fs):
+    # Arrange
+    for name in ["file1", "file2", "file3"]:
+        fs.create_file(os.path.join("/path/to", name), contents=name)
+    fs.create_file("/path/file4", contents="file4")
+
+    # Act
+    for path in ["/path/to/file1", "/path/to/file2", "/path/to/file3", "/path/file4"]:
+        utils.get_file_hash(path)
+
+    # Assert
+    assert len(os.listdir(config.hash_cache_folder)) == 2
+
+
+def test_get_folders_hash_saves_each_index_once(mocker, fs):
+    # Arrange
+    create_files(fs, 9)
+    spy = mocker.spy(utils, "_write_hash_index")
+
+    # Act
+    utils.get_folders_hash(["/data"])
+
+    # Assert
+    assert spy.call_count == 3
+    assert len(os.listdir(config.hash_cache_folder)) == 3
+
+
+def test_prune_hash_cache_removes_hashes_of_deleted_or_changed_files(fs):
+    # Arrange
+    for name in ["kept", "deleted", "changed"]:
+        fs.create_file(os.path.join("/path/to", name), contents=name)
+        utils.get_file_hash(os.path.join("/path/to", name))
+    os.remove("/path/to/deleted")
+    with open("/path/to/changed", "w") as f:
+        f.write("new contents")
+    os.utime("/path/to/changed", ns=(0, 0))
+
+    # Act
+    utils.prune_hash_cache()
+
+    # Assert
+    assert list(utils._read_hash_index("/path/to")) == ["kept"]
+
+
+def test_prune_hash_cache_removes_indexes_left_empty(fs):
+    # Arrange
+    fs.create_file("/path/to/file", contents="contents")
+    utils.get_file_hash("/path/to/file")
+    os.remove("/path/to/file")
+
+    # Act
+    utils.prune_hash_cache()
+
+    # Assert
+    assert os.listdir(config.hash_cache_folder) == []
+
+
+def test_prune_hash_cache_removes_unreadable_indexes(ui, fs):
+    # Arrange
+    fs.create_file(os.path.join(config.hash_cache_folder, "index.json"), contents="{")
+    fs.create_dir(os.path.join(config.hash_cache_folder, "folder"))
+
+    # Act
+    utils.prune_hash_cache()
+
+    # Assert
+    assert os.listdir(config.hash_cache_folder) == []
+
+
 def test_cleanup_removes_files(mocker, ui, fs):
     # Arrange
     path = "/path/to/garbage.html"
@@ -197,7 +340,7 @@ def test_untar_extracts_to_parent_directory(mocker, file):
     utils.untar(file)
 
     # Assert
-    spy.assert_called_once_with(ANY, parent_path)
+    spy.assert_called_once_with(ANY, parent_path, members=ANY)
 
 
 @pytest.mark.parametrize("file", ["./test.tar.bz", "path/to/file.tar.bz"])
@@ -215,6 +358,116 @@ def test_untar_removes_tarfile(mocker, file):
     spy.assert_called_once_with(file)
 
 
+def create_tarball(mode="w:gz"):
+    tarball = io.BytesIO()
+    with tarfile.open(fileobj=tarball, mode=mode) as tar:
+        for name in ["file.txt", "._file.txt"]:
+            info = tarfile.TarInfo(name)
+            info.size = len(name)
+            tar.addfile(info, io.BytesIO(name.encode()))
+    return tarball.getvalue()
+
+
+def mock_decompression(mocker, commands):
+    def which(cmd):
+        return cmd if cmd in commands else None
+
+    mocker.patch("shutil.which", side_effect=which)
+    proc = mocker.Mock()
+    proc.stdout = io.BytesIO(create_tarball(mode="w"))
+    proc.wait.return_value = 0
+    return mocker.patch("subprocess.Popen", return_value=proc)
+
+
+def test_untar_skips_apple_double_files(mocker, fs):
+    # Arrange
+    file = "/path/to/file.tar.gz"
+    fs.create_file(file, contents=create_tarball())
+    mocker.patch("shutil.which", return_value=None)
+
+    # Act
+    utils.untar(file)
+
+    # Assert
+    assert os.path.exists("/path/to/file.txt")
+    assert not os.path.exists("/path/to/._file.txt")
+
+
+@pytest.mark.parametrize(
+    "magic,command", [(utils.ZSTD_MAGIC, "zstd"), (utils.GZIP_MAGIC, "pigz")]
+)
+def test_untar_uses_external_decompression_by_magic_bytes(mocker, fs, magic, command):
+    # Arrange
+    file = "/path/to/file.tar.bz"
+    fs.create_file(file, contents=magic + b"compressed")
+    spy = mock_decompression(mocker, ["zstd", "pigz"])
+
+    # Act
+    utils.untar(file)
+
+    # Assert
+    assert spy.call_args.args[0][0] == command
+    assert file in spy.call_args.args[0]
+    assert os.path.exists("/path/to/file.txt")
+    assert not os.path.exists("/path/to/._file.txt")
+
+
+def test_untar_stops_the_decompression_if_extraction_fails(mocker, fs):
+    # Arrange
+    file = "/path/to/file.tar.zst"
+    fs.create_file(file, contents=utils.ZSTD_MAGIC + b"compressed")
+    spy = mock_decompression(mocker, ["zstd"])
+    proc = spy.return_value
+    proc.stdout = io.BytesIO(b"not a tarball")
+
+    # Act
+    with pytest.raises(tarfile.TarError):
+        utils.untar(file)
+
+    # Assert
+    proc.kill.assert_called_once()
+    proc.wait.assert_called_once()
+    assert proc.stdout.closed
+
+
+def test_untar_fails_if_the_decompression_fails(mocker, fs):
+    # Arrange
+    file = "/path/to/file.tar.zst"
+    fs.create_file(file, contents=utils.ZSTD_MAGIC + b"compressed")
+    proc = mock_decompression(mocker, ["zstd"]).return_value
+    proc.wait.return_value = 1
+
+    # Act & Assert
+    with pytest.raises(ExecutionError):
+        utils.untar(file)
+    proc.kill.assert_not_called()
+
+
+def test_untar_uses_tarfile_for_gzip_if_pigz_is_not_available(mocker, fs):
+    # Arrange
+    file = "/path/to/file.tar.gz"
+    fs.create_file(file, contents=create_tarball())
+    spy = mock_decompression(mocker, ["zstd"])
+
+    # Act
+    utils.untar(file)
+
+    # Assert
+    spy.assert_not_called()
+    assert os.path.exists("/path/to/file.txt")
+
+
+def test_untar_fails_for_zstd_if_zstd_is_not_available(mocker, fs):
+    # Arrange
+    file = "/path/to/file.tar.zst"
+    fs.create_file(file, contents=utils.ZSTD_MAGIC + b"compressed")
+    mock_decompression(mocker, ["pigz"])
+
+    # Act & Assert
+    with pytest.raises(MedperfException):
+        utils.untar(file)
+
+
 def test_approval_prompt_asks_for_user_input(mocker, ui):
     # Arrange
     spy = mocker.patch.object(ui, "prompt", return_value="y")
@@ -319,6 +572,40 @@ def test_get_folders_hash_returns_expected_hash(mocker, filesystem):
     assert hash == "b7e9365f1e796ba29e9e6b1b94b5f4cc7238530601fad8ec96ece9fee68c3d7f"
 
 
+def create_files(fs, num_files):
+    for i in range(num_files):
+        fs.create_file(f"/data/{i % 3}/file{i}", contents=f"contents {i}")
+
+
+def test_get_folders_hash_is_the_same_if_hashed_in_parallel(fs):
+    # Arrange
+    create_files(fs, 20)
+    config.strict_hashing = True
+    config.hash_max_workers = 1
+    exp_hash = utils.get_folders_hash(["/data"])
+    config.hash_max_workers = 4
+    config.hash_parallel_min_files = 2
+
+    # Act
+    hash = utils.get_folders_hash(["/data"])
+
+    # Assert
+    assert hash == exp_hash
+
+
+def test_get_folders_hash_reports_progress_if_interactive(mocker, ui, fs):
+    # Arrange
+    create_files(fs, 10)
+    ui.is_interactive = True
+
+    # Act
+    utils.get_folders_hash(["/data"])
+
+    # Assert
+    assert ui.text.startswith("Hashing files: 10/10 (")
+    assert "files/s" in ui.text and "MB/s" in ui.text
+
+
 @pytest.mark.parametrize(
     "encode_pair",
     [(float("nan"), "nan"), (float("inf"), "Infinity"), (float("-inf"), "-Infinity")],
@@ -431,3 +718,19 @@ def test_filter_latest_associations_works_as_expected(
     assert sorted(filtered, key=lambda x: x["dataset"]) == sorted(
         expected_result, key=lambda x: x["dataset"]
     )
+
+
+def test_spawn_and_kill_kills_running_processes_only(mocker):
+    # Arrange
+    mocker.patch(patch_utils.format("spawn_and_kill.spawn"))
+    killpg_spy = mocker.patch(patch_utils.format("os.killpg"))
+    with utils.spawn_and_kill("cmd"):
+        pass
+
+    # Act
+    with utils.spawn_and_kill("cmd") as proc_wrapper:
+        utils.spawn_and_kill.kill_running()
+
+    # Assert
+    killpg_spy.assert_called_once_with(proc_wrapper.pid, ANY)
+    assert proc_wrapper not in utils.spawn_and_kill.running
@@ -76,6 +76,25 @@ def test_interactive_handles_spinner(mocker, cli):
     assert interactive_state
 
 
+def test_nested_interactive_sessions_keep_spinner_until_outermost_exits(
+    mocker, cli
+):
+    # Arrange
+    start_spy = mocker.patch.object(cli.spinner, "start")
+    stop_spy = mocker.patch.object(cli.spinner, "stop")
+
+    # Act
+    with cli.interactive():
+        with cli.interactive():
+            pass
+        interactive_state = cli.is_interactive
+
+    # Assert
+    start_spy.assert_called_once()
+    stop_spy.assert_called_once()
+    assert interactive_state
+
+
 @pytest.mark.parametrize("text", ["123", "testing text", "spinner"])
 def test_text_modified_yaspin_text(cli, text):
     # Arrange
@@ -1,4 +1,5 @@
 import typer
+import threading
 from getpass import getpass
 from yaspin import yaspin
 from contextlib import contextmanager
@@ -10,6 +11,8 @@ class CLI(UI):
     def __init__(self):
         self.spinner = yaspin(color="green")
         self.is_interactive = False
+        self.__sessions = 0
+        self.__sessions_lock = threading.Lock()
 
     def print(self, msg: str = ""):
         """Display a message on the command line
@@ -57,16 +60,23 @@ class CLI(UI):
 
     @contextmanager
     def interactive(self):
-        """Context managed interactive session.
+        """Context managed interactive session. Sessions can be nested or
+        entered by concurrent threads, the session ends when all of them exit.
 
         Yields:
             CLI: Yields the current CLI instance with an interactive session initialized
         """
-        self.start_interactive()
+        with self.__sessions_lock:
+            if self.__sessions == 0:
+                self.start_interactive()
+            self.__sessions += 1
         try:
             yield self
         finally:
-            self.stop_interactive()
+            with self.__sessions_lock:
+                self.__sessions -= 1
+                if self.__sessions == 0:
+                    self.stop_interactive()
 
     @property
     def text(self):
@@ -2,37 +2,208 @@ from __future__ import annotations
 
 import re
 import os
+import time
 import signal
+import threading
 import yaml
 import random
 import hashlib
 import logging
 import tarfile
+import tempfile
 import requests
-from glob import glob
+import subprocess
 import json
 from pathlib import Path
+from contextlib import contextmanager
 import shutil
 from pexpect import spawn
 from datetime import datetime
 from pydantic.datetime_parse import parse_datetime
-from typing import List
+from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
 from colorama import Fore, Style
 from pexpect.exceptions import TIMEOUT
 from git import Repo, GitCommandError
 import medperf.config as config
 from medperf.exceptions import ExecutionError, MedperfException
 
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
 
-def get_file_hash(path: str) -> str:
-    """Calculates the sha256 hash for a given file.
+
+def _file_identity(path: str) -> dict:
+    """Identifies a file version by its device, inode, size and modification time"""
+    stat = os.stat(path)
+    return {
+        "device": stat.st_dev,
+        "inode": stat.st_ino,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def _hash_index_path(folder: str) -> str:
+    key = hashlib.sha256(folder.encode("utf-8")).hexdigest()
+    return os.path.join(config.hash_cache_folder, f"{key}.json")
+
+
+def _load_hash_index(index_path: str):
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+    except (OSError, ValueError) as e:
+        logging.debug(f"Ignoring unreadable hash cache index {index_path}: {e}")
+        return
+    if not isinstance(index, dict) or not isinstance(index.get("files"), dict):
+        return
+    return index
+
+
+def _read_hash_index(folder: str) -> dict:
+    index_path = _hash_index_path(folder)
+    if not os.path.exists(index_path):
+        return {}
+    index = _load_hash_index(index_path)
+    if index is None or index.get("folder") != folder:
+        return {}
+    return index["files"]
+
+
+def _write_hash_index(folder: str, files: dict):
+    index_path = _hash_index_path(folder)
+    try:
+        if not files:
+            if os.path.exists(index_path):
+                os.remove(index_path)
+            return
+        os.makedirs(config.hash_cache_folder, exist_ok=True)
+        # Unique per thread and process, which may update the same index
+        fd, tmp_path = tempfile.mkstemp(dir=config.hash_cache_folder, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"folder": folder, "files": files}, f)
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        logging.debug(f"Couldn't write hash cache index {index_path}: {e}")
+
+
+class _HashIndexes:
+    """Cached hashes of files, stored in one index per folder. Indexes are
+    loaded when files of their folder are hashed, and updated indexes are
+    saved right away, or once a batch of files is hashed"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.files = {}
+        self.updated = {}
+        self.batches = 0
+
+    def __folder_files(self, folder: str) -> dict:
+        if folder not in self.files:
+            self.files[folder] = _read_hash_index(folder)
+        return self.files[folder]
+
+    def get(self, path: str, identity: dict):
+        folder, name = os.path.split(os.path.abspath(path))
+        with self.lock:
+            entry = self.__folder_files(folder).get(name)
+        if not isinstance(entry, dict) or entry.get("identity") != identity:
+            return
+        return entry.get("hash")
+
+    def set(self, path: str, identity: dict, sha_val: str):
+        folder, name = os.path.split(os.path.abspath(path))
+        with self.lock:
+            entry = {"identity": identity, "hash": sha_val}
+            self.__folder_files(folder)[name] = entry
+            self.updated.setdefault(folder, set()).add(name)
+
+    @contextmanager
+    def batch(self):
+        with self.lock:
+            self.batches += 1
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.batches -= 1
+            self.save()
+
+    def save(self):
+        with self.lock:
+            if self.batches:
+                return
+            for folder, names in self.updated.items():
+                # Keep the entries other processes added since it was read
+                files = _read_hash_index(folder)
+                files.update({name: self.files[folder][name] for name in names})
+                _write_hash_index(folder, files)
+            # Indexes are read again when needed, so that they are not
+            # kept in memory
+            self.files = {}
+            self.updated = {}
+
+
+_hash_indexes = _HashIndexes()
+
+
+def prune_hash_cache():
+    """Removes the cached hashes of files that were deleted or changed,
+    and the hash cache indexes that are left empty or can't be read."""
+    cache_folder = config.hash_cache_folder
+    if not os.path.isdir(cache_folder):
+        return
+    for name in os.listdir(cache_folder):
+        index_path = os.path.join(cache_folder, name)
+        if name.endswith(".tmp"):
+            # May be an index being written
+            continue
+        index = None
+        if os.path.isfile(index_path):
+            index = _load_hash_index(index_path)
+        folder = None if index is None else index.get("folder")
+        if not isinstance(folder, str) or index_path != _hash_index_path(folder):
+            remove_path(index_path)
+            continue
+        files = {}
+        for filename, entry in index["files"].items():
+            filepath = os.path.join(folder, filename)
+            if not isinstance(entry, dict) or not os.path.isfile(filepath):
+                continue
+            if entry.get("identity") == _file_identity(filepath):
+                files[filename] = entry
+        if files != index["files"]:
+            with _hash_indexes.lock:
+                _write_hash_index(folder, files)
+
+
+def get_file_hash(path: str, strict: bool = None) -> str:
+    """Calculates the sha256 hash for a given file. Calculated hashes are cached,
+    keyed by the file's path, device, inode, size and modification time, so that
+    unchanged files are not read again. Any change to these invalidates the
+    cached hash. A file that is replaced by another one with the same path,
+    inode, size and modification time (e.g. extracted again from a tarball)
+    is still considered unchanged, so the cache is bypassed when the file's
+    integrity must be checked.
 
     Args:
         path (str): Location of the file of interest.
+        strict (bool, optional): Whether to bypass the cache. Defaults to
+        config.strict_hashing.
 
     Returns:
         str: Calculated hash
     """
+    if strict is None:
+        strict = config.strict_hashing
+    identity = None
+    if not strict and os.path.isfile(path):
+        identity = _file_identity(path)
+        sha_val = _hash_indexes.get(path, identity)
+        if sha_val is not None:
+            logging.debug(f"Cached hash for file {path}: {sha_val}")
+            return sha_val
+
     logging.debug("Calculating hash for file {}".format(path))
     BUF_SIZE = 65536
     sha = hashlib.sha256()
@@ -45,6 +216,9 @@ def get_file_hash(path: str) -> str:
 
     sha_val = sha.hexdigest()
     logging.debug(f"Hash for file {path}: {sha_val}")
+    if identity is not None:
+        _hash_indexes.set(path, identity, sha_val)
+        _hash_indexes.save()
     return sha_val
 
 
@@ -151,27 +325,78 @@ def generate_tmp_path() -> str:
     return tmp_path
 
 
+def is_apple_double(member: tarfile.TarInfo) -> bool:
+    # OS Specific issue: Mac Creates superfluous files with tarfile library
+    return os.path.basename(member.name).startswith("._")
+
+
+def _decompression_command(filepath: str):
+    """Finds an external command that can decompress the given tarball faster
+    than the tarfile library, or that can decompress formats tarfile doesn't
+    support. The compression format is detected from the file's magic bytes,
+    regardless of its extension.
+
+    Returns:
+        (list|None): The command that decompresses the tarball to stdout,
+        or None if the tarball should be opened with tarfile directly
+    """
+    try:
+        with open(filepath, "rb") as f:
+            magic = f.read(4)
+    except OSError:
+        return
+    if magic.startswith(ZSTD_MAGIC):
+        if shutil.which("zstd") is None:
+            raise MedperfException(
+                f"{filepath} is compressed with zstd, but the zstd command "
+                "was not found. Please install zstd"
+            )
+        return ["zstd", "-d", "-c", "-q", filepath]
+    if magic.startswith(GZIP_MAGIC) and shutil.which("pigz") is not None:
+        # pigz decompresses with separate threads for reading, writing and checking
+        return ["pigz", "-d", "-c", filepath]
+
+
 def untar(filepath: str, remove: bool = True) -> str:
-    """Untars and optionally removes the tar.gz file
+    """Untars and optionally removes the tarball. Besides the formats supported
+    by tarfile, zstd-compressed tarballs can be extracted if the zstd command
+    is available. gzip-compressed tarballs are decompressed with pigz if available
 
     Args:
-        filepath (str): Path where the tar.gz file can be found.
-        remove (bool): Wether to delete the tar.gz file. Defaults to True.
+        filepath (str): Path where the tarball can be found.
+        remove (bool): Wether to delete the tarball. Defaults to True.
 
     Returns:
         str: location where the untared files can be found.
     """
-    logging.info(f"Uncompressing tar.gz at {filepath}")
+    logging.info(f"Uncompressing tarball at {filepath}")
     addpath = str(Path(filepath).parent)
-    tar = tarfile.open(filepath)
-    tar.extractall(addpath)
-    tar.close()
+    command = _decompression_command(filepath)
+    if command is None:
+        tar = tarfile.open(filepath)
+        members = (member for member in tar if not is_apple_double(member))
+        tar.extractall(addpath, members=members)
+        tar.close()
+    else:
+        logging.debug(f"Decompressing {filepath} with {command[0]}")
+        proc = subprocess.Popen(command, stdout=subprocess.PIPE)
+        try:
+            with tarfile.open(fileobj=proc.stdout, mode="r|") as tar:
+                members = (member for member in tar if not is_apple_double(member))
+                tar.extractall(addpath, members=members)
+            # Let the command write whatever follows the archive (e.g. padding),
+            # so that only its own failures make it exit with an error
+            while proc.stdout.read(65536):
+                pass
+        except BaseException:
+            proc.kill()
+            raise
+        finally:
+            proc.stdout.close()
+            returncode = proc.wait()
+        if returncode != 0:
+            raise ExecutionError(f"{command[0]} failed to decompress {filepath}")
 
-    # OS Specific issue: Mac Creates superfluous files with tarfile library
-    [
-        remove_path(spurious_file)
-        for spurious_file in glob(addpath + "/**/._*", recursive=True)
-    ]
     if remove:
         logging.info(f"Deleting {filepath}")
         remove_path(filepath)
@@ -289,9 +514,44 @@ def combine_proc_sp_text(proc: spawn) -> str:
     return proc_out
 
 
+def _hash_files(filepaths: List[str]):
+    """Hashes files, concurrently if there are enough of them. Hashing releases
+    the GIL, so the files are hashed in parallel by a thread pool sized to the
+    number of cores (or config.hash_max_workers, e.g. to match the storage).
+
+    Yields:
+        str: The hash of each file, in the same order as the given files
+    """
+    max_workers = config.hash_max_workers or os.cpu_count() or 1
+    # The cached hashes of the files are saved once all of them are hashed
+    with _hash_indexes.batch():
+        if max_workers == 1 or len(filepaths) < config.hash_parallel_min_files:
+            for filepath in filepaths:
+                yield get_file_hash(filepath)
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            yield from pool.map(get_file_hash, filepaths)
+
+
+def _report_hashing_progress(num_hashed, num_files, num_bytes, elapsed):
+    elapsed = max(elapsed, 1e-6)
+    files_rate = num_hashed / elapsed
+    mb_rate = num_bytes / elapsed / 1024**2
+    msg = (
+        f"Hashing files: {num_hashed}/{num_files} "
+        f"({files_rate:.0f} files/s, {mb_rate:.1f} MB/s)"
+    )
+    if getattr(config.ui, "is_interactive", False):
+        config.ui.text = msg
+    return msg
+
+
 def get_folders_hash(paths: List[str]) -> str:
     """Generates a hash for all the contents of the fiven folders. This procedure
     hashes all the files in all passed folders, sorts them and then hashes that list.
+    Files are hashed in parallel, and the hashing progress is shown if the UI is
+    in an interactive session.
 
     Args:
         paths List(str): Folders to hash.
@@ -299,15 +559,32 @@ def get_folders_hash(paths: List[str]) -> str:
     Returns:
         str: sha256 hash that represents all the folders altogether
     """
-    hashes = []
+    filepaths = []
 
     # The hash doesn't depend on the order of paths or folders, as the hashes get sorted after the fact
     for path in paths:
         for root, _, files in os.walk(path, topdown=False):
             for file in files:
-                logging.debug(f"Hashing file {file}")
-                filepath = os.path.join(root, file)
-                hashes.append(get_file_hash(filepath))
+                filepaths.append(os.path.join(root, file))
+
+    hashes = []
+    num_bytes = 0
+    start = last_report = time.monotonic()
+    for filepath, file_hash in zip(filepaths, _hash_files(filepaths)):
+        logging.debug(f"Hashed file {filepath}")
+        hashes.append(file_hash)
+        if os.path.isfile(filepath):
+            num_bytes += os.path.getsize(filepath)
+        now = time.monotonic()
+        if now - last_report >= config.hash_progress_interval:
+            _report_hashing_progress(
+                len(hashes), len(filepaths), num_bytes, now - start
+            )
+            last_report = now
+    msg = _report_hashing_progress(
+        len(hashes), len(filepaths), num_bytes, time.monotonic() - start
+    )
+    logging.debug(msg)
 
     hashes = sorted(hashes)
     sha = hashlib.sha256()
@@ -318,6 +595,24 @@ def get_folders_hash(paths: List[str]) -> str:
     return hash_val
 
 
+def get_folder_manifest(path: str) -> Dict[str, str]:
+    """Hashes the files of a folder, e.g. to later verify that
+    the folder is complete and unchanged.
+
+    Args:
+        path (str): Folder to hash.
+
+    Returns:
+        Dict[str, str]: The hash of each file, keyed by its path relative to the folder
+    """
+    filepaths = []
+    for root, _, files in os.walk(path):
+        for file in files:
+            filepaths.append(os.path.join(root, file))
+    relpaths = [os.path.relpath(filepath, path) for filepath in filepaths]
+    return dict(zip(relpaths, _hash_files(filepaths)))
+
+
 def list_files(startpath):
     tree_str = ""
     for root, dirs, files in os.walk(startpath):
@@ -470,6 +765,11 @@ def check_for_updates() -> None:
 
 
 class spawn_and_kill:
+    # Instances whose process is running, so that it can be killed when the
+    # process is waited on by a thread other than the interrupted main thread
+    running = set()
+    running_lock = threading.Lock()
+
     def __init__(self, cmd, timeout=None, *args, **kwargs):
         self.cmd = cmd
         self.timeout = timeout
@@ -490,9 +790,25 @@ class spawn_and_kill:
             self.cmd, timeout=self.timeout, *self._args, **self._kwargs
         )
         self.pid = self.proc.pid
+        with self.running_lock:
+            self.running.add(self)
         return self
 
+    @classmethod
+    def kill_running(cls):
+        """Kills the process groups of all the running processes"""
+        with cls.running_lock:
+            running = list(cls.running)
+        for proc_wrapper in running:
+            logging.info(f"Killing ancestor processes of {proc_wrapper.cmd}")
+            try:
+                proc_wrapper.killpg()
+            except ProcessLookupError:
+                pass
+
     def __exit__(self, exc_type, exc_val, exc_tb):
+        with self.running_lock:
+            self.running.discard(self)
         if exc_type:
             self.exception_occurred = True
             # Forcefully kill the process group if any exception occurred, in particular,
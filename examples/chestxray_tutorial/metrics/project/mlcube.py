@@ -1,4 +1,6 @@
 """MLCube handler file"""
+import os
+import time
 import typer
 import yaml
 from metrics import calculate_metrics
@@ -19,6 +21,38 @@ def evaluate(
     calculate_metrics(labels, predictions, parameters, output_path)
 
 
+@app.command("evaluate_queue")
+def evaluate_queue(
+    labels: str = typer.Option(..., "--labels"),
+    parameters_file: str = typer.Option(..., "--parameters_file"),
+    queue: str = typer.Option(..., "--queue"),
+):
+    with open(parameters_file) as f:
+        parameters = yaml.safe_load(f)
+
+    # Each job is a folder with the predictions to evaluate, which is
+    # ready once it has a `ready` file. A `stop` file ends the loop.
+    while not os.path.exists(os.path.join(queue, "stop")):
+        for job in sorted(os.listdir(queue)):
+            job_path = os.path.join(queue, job)
+            if not os.path.exists(os.path.join(job_path, "ready")):
+                continue
+            if os.path.exists(os.path.join(job_path, "done")):
+                continue
+            if os.path.exists(os.path.join(job_path, "failed")):
+                continue
+            predictions = os.path.join(job_path, "predictions")
+            output_path = os.path.join(job_path, "results.yaml")
+            try:
+                calculate_metrics(labels, predictions, parameters, output_path)
+            except Exception as e:
+                with open(os.path.join(job_path, "failed"), "w") as f:
+                    f.write(str(e))
+                continue
+            open(os.path.join(job_path, "done"), "w").close()
+        time.sleep(0.5)
+
+
 @app.command("hotfix")
 def hotfix():
     # NOOP command for typer to behave correctly. DO NOT REMOVE OR MODIFY
@@ -0,0 +1,79 @@
+import os
+import time
+import shlex
+import argparse
+import statistics
+import subprocess
+
+from medperf.containers import native
+
+
+def get_args():
+    desc = (
+        "Measures the time it takes to run an MLCube task through the mlcube CLI\n"
+        + "and through the native container engine (--container-engine=native).\n"
+        + "Use a task that does little work, so that the startup latency dominates."
+    )
+
+    parser = argparse.ArgumentParser(prog="BenchmarkEngineStartup", description=desc)
+    parser.add_argument(
+        "--mlcube",
+        required=True,
+        help="Path to the mlcube folder. This path is the one that contains ./mlcube.yaml",
+    )
+    parser.add_argument("--task", required=True, help="Task to run")
+    parser.add_argument(
+        "--platform",
+        choices=["docker", "singularity"],
+        default="docker",
+        help="Container runtime to use",
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=5, help="Number of runs of each engine"
+    )
+    parser.add_argument(
+        "params",
+        nargs="*",
+        metavar="param=value",
+        help="Values of the task parameters",
+    )
+    args = parser.parse_args()
+    args.params = dict(param.split("=", 1) for param in args.params)
+    return args
+
+
+def mlcube_command(cube_path, task, platform, params):
+    cmd = f"mlcube run --mlcube={cube_path} --task={task} --platform={platform}"
+    cmd += " --network=none --mount=ro"
+    for name, value in params.items():
+        cmd += f" {name}={shlex.quote(value)}"
+    cmd += ' -Pdocker.cpu_args="-u $(id -u):$(id -g)"'
+    return cmd
+
+
+def time_command(cmd, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.monotonic()
+        subprocess.run(cmd, shell=True, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.monotonic() - start)
+    return times
+
+
+def main():
+    args = get_args()
+    cube_path = os.path.join(os.path.abspath(args.mlcube), "mlcube.yaml")
+    commands = {
+        "mlcube": mlcube_command(cube_path, args.task, args.platform, args.params),
+        "native": native.run_command(cube_path, args.task, args.params, args.platform),
+    }
+    for engine, cmd in commands.items():
+        print(f"{engine}: {cmd}")
+        times = time_command(cmd, args.repeats)
+        mean = statistics.mean(times)
+        median = statistics.median(times)
+        print(f"{engine}: mean {mean:.2f}s, median {median:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,13 @@ def get_args():
         "--output",
         help="(Optional) Output tarball path. If provided, the contents of the assets folder are packaged into this file",
     )
+    parser.add_argument(
+        "--compression",
+        choices=["gz", "zst"],
+        default="gz",
+        help="Compression of the created tarballs. 'zst' requires the zstd command, "
+        + "and makes large tarballs much faster to extract",
+    )
     args = parser.parse_args()
     args.mlcube_types = args.mlcube_types.split(",")
     if not set(args.mlcube_types).issubset(["data-preparator", "model", "metrics"]):
@@ -39,7 +46,7 @@ def main():
     mlcube_types = args.mlcube_types
 
     required_files = validate_and_parse_manifest(mlcube_path, mlcube_types)
-    package(mlcube_path, required_files, output_path)
+    package(mlcube_path, required_files, output_path, args.compression)
 
 
 if __name__ == "__main__":
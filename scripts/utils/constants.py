@@ -1,6 +1,7 @@
 WSPACE_PATH = "workspace"
 ADD_PATH = "additional_files"
 ADD_FILE = "additional_files.tar.gz"
+ADD_ZST_FILE = "additional_files.tar.zst"
 MLCUBE_FILE = "mlcube.yaml"
 PARAMS_FILE = "parameters.yaml"
 RUNNERS = ["docker", "singularity"]
@@ -1,20 +1,46 @@
 import os
 import shutil
 import tarfile
+import subprocess
 
-from .constants import WSPACE_PATH, PARAMS_FILE, ADD_PATH, MLCUBE_FILE, ADD_FILE
+from .constants import (
+    WSPACE_PATH,
+    PARAMS_FILE,
+    ADD_PATH,
+    MLCUBE_FILE,
+    ADD_FILE,
+    ADD_ZST_FILE,
+)
 from .bcolors import bcolors
 
 
-def make_tarfile(source_dir, output_filename):
+def add_contents(tar, source_dir):
     contents = os.listdir(source_dir)
-    with tarfile.open(output_filename, "w:gz") as tar:
-        for rel_path in contents:
-            abs_path = os.path.join(source_dir, rel_path)
-            tar.add(abs_path, arcname=os.path.basename(abs_path))
+    for rel_path in contents:
+        abs_path = os.path.join(source_dir, rel_path)
+        tar.add(abs_path, arcname=os.path.basename(abs_path))
 
 
-def package(mlcube_path, required_files, output_path):
+def make_tarfile(source_dir, output_filename, compression="gz"):
+    if compression == "gz":
+        with tarfile.open(output_filename, "w:gz") as tar:
+            add_contents(tar, source_dir)
+        return
+
+    # zstd tarballs are written by piping the tar stream into the zstd command,
+    # which compresses with all available cores
+    if shutil.which("zstd") is None:
+        raise FileNotFoundError("The zstd command is required to create .tar.zst files")
+    cmd = ["zstd", "-q", "-f", "-T0", "-o", output_filename]
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    with tarfile.open(fileobj=proc.stdin, mode="w|") as tar:
+        add_contents(tar, source_dir)
+    proc.stdin.close()
+    if proc.wait() != 0:
+        raise RuntimeError(f"zstd failed to compress {output_filename}")
+
+
+def package(mlcube_path, required_files, output_path, compression="gz"):
     workspace_path = os.path.join(mlcube_path, WSPACE_PATH)
     parameters_path = os.path.join(workspace_path, PARAMS_FILE)
     additional_path = os.path.join(workspace_path, ADD_PATH)
@@ -23,7 +49,8 @@ def package(mlcube_path, required_files, output_path):
     assets_path = os.path.join(mlcube_path, "assets")
     target_manifest_path = os.path.join(assets_path, MLCUBE_FILE)
     target_parameters_path = os.path.join(assets_path, PARAMS_FILE)
-    target_additional_tarball = os.path.join(assets_path, ADD_FILE)
+    add_file = ADD_FILE if compression == "gz" else ADD_ZST_FILE
+    target_additional_tarball = os.path.join(assets_path, add_file)
 
     print(f"{bcolors.OKCYAN}Packaging assets into {assets_path}{bcolors.ENDC}")
 
@@ -40,7 +67,7 @@ def package(mlcube_path, required_files, output_path):
 
         # Package additional files if needed
         if required_files["additional_files"]:
-            make_tarfile(additional_path, target_additional_tarball)
+            make_tarfile(additional_path, target_additional_tarball, compression)
 
         # Package singularity image if needed
         if required_files["singularity_image"]:
@@ -56,4 +83,4 @@ def package(mlcube_path, required_files, output_path):
     # Package everything to the designated output tarball
     if output_path is not None:
         print(f"{bcolors.OKCYAN}Packaging all assets into {output_path}{bcolors.ENDC}")
-        make_tarfile(assets_path, output_path)
+        make_tarfile(assets_path, output_path, compression)
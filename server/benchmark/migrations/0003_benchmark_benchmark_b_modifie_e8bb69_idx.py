@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-17 05:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmark', '0002_alter_benchmark_demo_dataset_tarball_url'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='benchmark',
+            index=models.Index(fields=['modified_at', 'id'], name='benchmark_b_modifie_e8bb69_idx'),
+        ),
+    ]
@@ -57,3 +57,4 @@ class Benchmark(models.Model):
 
     class Meta:
         ordering = ["modified_at"]
+        indexes = [models.Index(fields=["modified_at", "id"])]
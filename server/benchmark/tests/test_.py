@@ -281,6 +281,19 @@ class BenchmarkGetListTest(BenchmarkTest):
         self.assertEqual(len(response.data["results"]), 1)
         self.assertEqual(response.data["results"][0]["id"], benchmark_id)
 
+    def test_get_benchmark_list_filtered_by_ids(self):
+        # Arrange
+        benchmark_id = self.testbenchmark["id"]
+        url = self.url + f"?id__in={benchmark_id},{benchmark_id + 1}"
+
+        # Act
+        response = self.client.get(url)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], benchmark_id)
+
 
 class PermissionTest(BenchmarkTest):
     """Test module for permissions of /benchmarks/ endpoint
@@ -71,6 +71,18 @@ class BenchmarkGetTest(BenchmarkTest):
             if k in self.testbenchmark:
                 self.assertEqual(self.testbenchmark[k], v, f"Unexpected value for {k}")
 
+    def test_benchmark_not_modified_if_etag_matches(self):
+        # Arrange
+        bmk_id = self.testbenchmark["id"]
+        url = self.url.format(bmk_id)
+        etag = self.client.get(url)["ETag"]
+
+        # Act
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
     def test_benchmark_not_found(self):
         # Arrange
         invalid_id = 9999
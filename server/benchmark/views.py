@@ -6,6 +6,7 @@ from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 from rest_framework import status
 from drf_spectacular.utils import extend_schema
+from utils.filters import filter_list, select_fields, list_parameters
 
 from .models import Benchmark
 from .serializers import BenchmarkSerializer, BenchmarkApprovalSerializer
@@ -15,15 +16,21 @@ from .permissions import IsAdmin, IsBenchmarkOwner, IsAssociatedDatasetOwner
 class BenchmarkList(GenericAPIView):
     serializer_class = BenchmarkSerializer
     queryset = ""
+    filter_fields = ["state", "owner", "approval_status", "is_valid"]
 
-    @extend_schema(operation_id="benchmarks_retrieve_all")
+    @extend_schema(
+        operation_id="benchmarks_retrieve_all",
+        parameters=list_parameters(filter_fields),
+    )
     def get(self, request, format=None):
         """
         List all benchmarks
         """
         benchmarks = Benchmark.objects.all()
+        benchmarks = filter_list(benchmarks, request, self.filter_fields)
         benchmarks = self.paginate_queryset(benchmarks)
         serializer = BenchmarkSerializer(benchmarks, many=True)
+        serializer = select_fields(serializer, request)
         return self.get_paginated_response(serializer.data)
 
     def post(self, request, format=None):
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-17 05:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benchmarkdataset', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='benchmarkdataset',
+            index=models.Index(fields=['modified_at', 'id'], name='benchmarkda_modifie_c353ba_idx'),
+        ),
+    ]
@@ -23,3 +23,4 @@ class BenchmarkDataset(models.Model):
 
     class Meta:
         ordering = ["modified_at"]
+        indexes = [models.Index(fields=["modified_at", "id"])]
@@ -24,3 +24,4 @@ class BenchmarkModel(models.Model):
 
     class Meta:
         ordering = ["-priority"]
+        indexes = [models.Index(fields=["modified_at", "id"])]
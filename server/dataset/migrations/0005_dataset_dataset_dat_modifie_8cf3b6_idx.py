@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-17 05:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dataset', '0004_auto_20231211_1827'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dataset',
+            index=models.Index(fields=['modified_at', 'id'], name='dataset_dat_modifie_8cf3b6_idx'),
+        ),
+    ]
@@ -38,6 +38,7 @@ class Dataset(models.Model):
 
     class Meta:
         ordering = ["modified_at"]
+        indexes = [models.Index(fields=["modified_at", "id"])]
         constraints = [
             models.constraints.UniqueConstraint(
                 fields=["generated_uid"],
@@ -3,6 +3,7 @@ from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 from rest_framework import status
 from drf_spectacular.utils import extend_schema
+from utils.filters import filter_list, select_fields, list_parameters
 
 from .models import Dataset
 from .permissions import IsAdmin, IsDatasetOwner
@@ -16,15 +17,20 @@ from .serializers import (
 class DatasetList(GenericAPIView):
     serializer_class = DatasetPublicSerializer
     queryset = ""
+    filter_fields = ["state", "owner", "is_valid"]
 
-    @extend_schema(operation_id="datasets_retrieve_all")
+    @extend_schema(
+        operation_id="datasets_retrieve_all", parameters=list_parameters(filter_fields)
+    )
     def get(self, request, format=None):
         """
         List all datasets
         """
         datasets = Dataset.objects.all()
+        datasets = filter_list(datasets, request, self.filter_fields)
         datasets = self.paginate_queryset(datasets)
         serializer = DatasetPublicSerializer(datasets, many=True)
+        serializer = select_fields(serializer, request)
         return self.get_paginated_response(serializer.data)
 
     def post(self, request, format=None):
@@ -98,11 +98,18 @@ INSTALLED_APPS = [
     "corsheaders",
 ]
 
+# Responses smaller than this size (in bytes) are not compressed
+RESPONSE_COMPRESSION_MIN_SIZE = env.int("RESPONSE_COMPRESSION_MIN_SIZE", default=1024)
+
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    # Compresses responses. Must run after any middleware that reads the response body
+    "utils.middleware.CompressionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    # Adds ETags to responses and answers conditional requests with 304
+    "django.middleware.http.ConditionalGetMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -222,10 +229,10 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": ["user.backends.JWTAuthenticateOrCreateUser"],
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.IsAuthenticated"],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
+    "DEFAULT_PAGINATION_CLASS": "utils.pagination.MedPerfPagination",
     "DEFAULT_VERSIONING_CLASS": "rest_framework.versioning.NamespaceVersioning",
     "DEFAULT_PARSER_CLASSES": [
-        "rest_framework.parsers.JSONParser",
+        "utils.parsers.JSONParser",
     ],
     "DEFAULT_VERSION": SERVER_API_VERSION,
     "PAGE_SIZE": 32,
@@ -246,7 +253,7 @@ SPECTACULAR_SETTINGS = {
     "VERSION": None,
     "SERVE_INCLUDE_SCHEMA": True,
     "PARSER_WHITELIST": [
-        "rest_framework.parsers.JSONParser",
+        "utils.parsers.JSONParser",
     ],
     "SCHEMA_PATH_PREFIX": r"/api/v[0-9]",
     "SWAGGER_UI_DIST": "SIDECAR",  # shorthand to use the sidecar instead
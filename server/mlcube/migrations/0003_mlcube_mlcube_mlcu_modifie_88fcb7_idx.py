@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-17 05:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mlcube', '0002_alter_mlcube_unique_together'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mlcube',
+            index=models.Index(fields=['modified_at', 'id'], name='mlcube_mlcu_modifie_88fcb7_idx'),
+        ),
+    ]
@@ -45,3 +45,4 @@ class MlCube(models.Model):
         )
         verbose_name_plural = "MlCubes"
         ordering = ["modified_at"]
+        indexes = [models.Index(fields=["modified_at", "id"])]
@@ -298,6 +298,102 @@ class MlCubeGetListTest(MlCubeTest):
         self.assertEqual(len(response.data["results"]), 1)
         self.assertEqual(response.data["results"][0]["id"], mlcube_id)
 
+    def test_get_mlcube_list_filtered_by_ids(self):
+        # Arrange
+        self.set_credentials(self.mlcube_owner)
+        ids = [self.testmlcube["id"]]
+        for i in range(2):
+            testmlcube = self.mock_mlcube(name=f"mlcube{i}", image_hash=f"hash{i}")
+            ids.append(self.create_mlcube(testmlcube).data["id"])
+        self.set_credentials(self.actor)
+        url = self.url + f"?id__in={ids[0]},{ids[2]}"
+
+        # Act
+        response = self.client.get(url)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        retrieved_ids = [mlcube["id"] for mlcube in response.data["results"]]
+        self.assertEqual(set(retrieved_ids), {ids[0], ids[2]})
+
+    def test_get_mlcube_list_with_invalid_ids_gets_rejected(self):
+        # Arrange
+        url = self.url + "?id__in=1,notanid"
+
+        # Act
+        response = self.client.get(url)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_mlcube_list_filtered_by_state(self):
+        # Arrange
+        self.set_credentials(self.mlcube_owner)
+        testmlcube = self.mock_mlcube(
+            name="operational", image_hash="operational", state="OPERATION"
+        )
+        operational_id = self.create_mlcube(testmlcube).data["id"]
+        self.set_credentials(self.actor)
+
+        # Act
+        response = self.client.get(self.url + "?state=OPERATION")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], operational_id)
+
+    @parameterized.expand([("true", 1), ("false", 0)])
+    def test_get_mlcube_list_filtered_by_is_valid(self, is_valid, exp_count):
+        # Act
+        response = self.client.get(self.url + f"?is_valid={is_valid}")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), exp_count)
+
+    def test_get_mlcube_list_returns_only_requested_fields(self):
+        # Act
+        response = self.client.get(self.url + "?fields=id,name")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data["results"][0].keys()), {"id", "name"})
+
+    @parameterized.expand([("name", ["a", "b"]), ("-name", ["b", "a"])])
+    def test_get_mlcube_list_ordering(self, ordering, exp_names):
+        # Arrange
+        self.set_credentials(self.mlcube_owner)
+        for name in ["b", "a"]:
+            testmlcube = self.mock_mlcube(name=name, image_hash=name, state="OPERATION")
+            self.create_mlcube(testmlcube)
+        self.set_credentials(self.actor)
+        url = self.url + f"?state=OPERATION&ordering={ordering}"
+
+        # Act
+        response = self.client.get(url)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        names = [mlcube["name"] for mlcube in response.data["results"]]
+        self.assertEqual(names, exp_names)
+
+    @parameterized.expand(
+        [
+            ("fields=id,unknown",),
+            ("ordering=unknown",),
+            ("ordering=metadata",),
+            ("is_valid=notabool",),
+            ("owner=notanid",),
+        ]
+    )
+    def test_get_mlcube_list_with_invalid_query_gets_rejected(self, query):
+        # Act
+        response = self.client.get(self.url + f"?{query}")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 
 class PermissionTest(MlCubeTest):
     """Test module for permissions of /mlcubes/ endpoint
@@ -3,6 +3,7 @@ from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 from rest_framework import status
 from drf_spectacular.utils import extend_schema
+from utils.filters import filter_list, select_fields, list_parameters
 
 from .models import MlCube
 from .serializers import MlCubeSerializer, MlCubeDetailSerializer
@@ -14,15 +15,20 @@ from dataset.models import Dataset
 class MlCubeList(GenericAPIView):
     serializer_class = MlCubeSerializer
     queryset = ""
+    filter_fields = ["state", "owner", "is_valid"]
 
-    @extend_schema(operation_id="mlcubes_retrieve_all")
+    @extend_schema(
+        operation_id="mlcubes_retrieve_all", parameters=list_parameters(filter_fields)
+    )
     def get(self, request, format=None):
         """
         List all mlcubes
         """
         mlcubes = MlCube.objects.all()
+        mlcubes = filter_list(mlcubes, request, self.filter_fields)
         mlcubes = self.paginate_queryset(mlcubes)
         serializer = MlCubeSerializer(mlcubes, many=True)
+        serializer = select_fields(serializer, request)
         return self.get_paginated_response(serializer.data)
 
     def post(self, request, format=None):
@@ -0,0 +1,137 @@
+"""Measure the latency of retrieving a page of results at increasing depths,
+with limit-offset pagination and with cursor pagination (?pagination=cursor).
+The database used is a throwaway test database seeded with the given number of
+results. Cursor pagination should keep a flat per-page latency regardless of
+the page depth, while limit-offset pagination gets slower the deeper the page.
+
+This script can only be invoked from its parent folder, that's because it
+executes Django code to create and seed the test database."""
+
+import os
+import time
+import argparse
+import statistics
+from urllib.parse import parse_qs, urlparse
+
+import django
+
+
+def setup_database():
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+
+def seed(num_rows, batch_size=10000):
+    from django.contrib.auth import get_user_model
+    from mlcube.models import MlCube
+    from dataset.models import Dataset
+    from benchmark.models import Benchmark
+    from result.models import ModelResult
+
+    owner = get_user_model().objects.create(username="benchmark_owner")
+    mlcube = MlCube.objects.create(
+        name="mlcube", git_mlcube_url="url", image_hash="hash", owner=owner
+    )
+    dataset = Dataset.objects.create(
+        name="dataset",
+        owner=owner,
+        input_data_hash="hash",
+        generated_uid="uid",
+        split_seed=0,
+        data_preparation_mlcube=mlcube,
+        submitted_as_prepared=False,
+    )
+    benchmark = Benchmark.objects.create(
+        name="benchmark",
+        owner=owner,
+        demo_dataset_tarball_url="url",
+        demo_dataset_tarball_hash="hash",
+        demo_dataset_generated_uid="uid",
+        data_preparation_mlcube=mlcube,
+        reference_model_mlcube=mlcube,
+        data_evaluator_mlcube=mlcube,
+    )
+    for start in range(0, num_rows, batch_size):
+        size = min(batch_size, num_rows - start)
+        results = [
+            ModelResult(
+                owner=owner,
+                benchmark=benchmark,
+                model=mlcube,
+                dataset=dataset,
+                results={"metric": i},
+            )
+            for i in range(start, start + size)
+        ]
+        ModelResult.objects.bulk_create(results)
+
+
+def build_request(params):
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    return Request(APIRequestFactory().get("/results/", params))
+
+
+def time_page(paginator, queryset, params, repeats):
+    latencies = []
+    for _ in range(repeats):
+        request = build_request(params)
+        start = time.perf_counter()
+        page = paginator().paginate_queryset(queryset, request)
+        latencies.append(time.perf_counter() - start)
+    assert len(page) > 0
+    return statistics.median(latencies) * 1000
+
+
+def cursor_at(paginator, queryset, offset):
+    # The cursor a client would have been given after walking offset records
+    if offset == 0:
+        return {}
+    last = queryset.order_by(*paginator.ordering)[offset - 1]
+    page = paginator()
+    page.request = build_request({})
+    next_url = page.encode_cursor(last)
+    return {"cursor": parse_qs(urlparse(next_url).query)["cursor"][0]}
+
+
+def run(args):
+    from result.models import ModelResult
+    from rest_framework.pagination import LimitOffsetPagination
+    from utils.pagination import KeysetPagination
+
+    setup_database()
+    start = time.perf_counter()
+    seed(args.rows)
+    print(f"Seeded {args.rows} results in {time.perf_counter() - start:.1f}s")
+
+    queryset = ModelResult.objects.all()
+    limit = args.page_size
+    depths = [0.0, 0.25, 0.5, 0.75, 1.0]
+    print(f"{'page offset':>12} {'limit-offset (ms)':>18} {'cursor (ms)':>12}")
+    for depth in depths:
+        offset = min(int(args.rows * depth), args.rows - limit)
+        params = {"limit": limit, "offset": offset}
+        offset_ms = time_page(LimitOffsetPagination, queryset, params, args.repeats)
+        params = {"limit": limit, **cursor_at(KeysetPagination, queryset, offset)}
+        cursor_ms = time_page(KeysetPagination, queryset, params, args.repeats)
+        print(f"{offset:>12} {offset_ms:>18.2f} {cursor_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rows", type=int, default=1000000, help="Number of results to seed"
+    )
+    parser.add_argument("--page-size", type=int, default=32, help="Page size")
+    parser.add_argument(
+        "--repeats", type=int, default=5, help="Measurements taken per page"
+    )
+    args = parser.parse_args()
+
+    os.environ["DJANGO_SETTINGS_MODULE"] = "medperf.settings"
+    django.setup()
+    run(args)
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-17 05:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('result', '0002_auto_20231124_0208'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='modelresult',
+            index=models.Index(fields=['modified_at', 'id'], name='result_mode_modifie_6ad2f6_idx'),
+        ),
+    ]
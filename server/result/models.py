@@ -32,3 +32,4 @@ class ModelResult(models.Model):
 
     class Meta:
         ordering = ["modified_at"]
+        indexes = [models.Index(fields=["modified_at", "id"])]
@@ -412,6 +412,27 @@ class GenericResultsGetListTest(ResultsTest):
         self.assertEqual(len(response.data["results"]), 1)
         self.assertEqual(response.data["results"][0]["id"], result_id)
 
+    def test_get_result_list_filtered_by_benchmark(self):
+        # Arrange
+        benchmark_id = self.testresult["benchmark"]
+
+        # Act
+        response = self.client.get(self.url + f"?benchmark={benchmark_id}")
+        other_response = self.client.get(self.url + f"?benchmark={benchmark_id + 1}")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(len(other_response.data["results"]), 0)
+
+    def test_get_result_list_can_exclude_results_field(self):
+        # Act
+        response = self.client.get(self.url + "?fields=id,benchmark,model,dataset")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("results", response.data["results"][0])
+
 
 class PermissionTest(ResultsTest):
     """Test module for permissions of /results endpoint
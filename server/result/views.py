@@ -3,6 +3,7 @@ from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 from rest_framework import status
 from drf_spectacular.utils import extend_schema
+from utils.filters import filter_list, select_fields, list_parameters
 
 from .models import ModelResult
 from .serializers import ModelResultSerializer, ModelResultDetailSerializer
@@ -12,6 +13,14 @@ from .permissions import IsAdmin, IsBenchmarkOwner, IsDatasetOwner
 class ModelResultList(GenericAPIView):
     serializer_class = ModelResultSerializer
     queryset = ""
+    filter_fields = [
+        "owner",
+        "approval_status",
+        "is_valid",
+        "benchmark",
+        "dataset",
+        "model",
+    ]
 
     def get_permissions(self):
         if self.request.method == "GET":
@@ -20,14 +29,18 @@ class ModelResultList(GenericAPIView):
             self.permission_classes = [IsAdmin | IsDatasetOwner]
         return super(self.__class__, self).get_permissions()
 
-    @extend_schema(operation_id="results_retrieve_all")
+    @extend_schema(
+        operation_id="results_retrieve_all", parameters=list_parameters(filter_fields)
+    )
     def get(self, request, format=None):
         """
         List all results
         """
         modelresults = ModelResult.objects.all()
+        modelresults = filter_list(modelresults, request, self.filter_fields)
         modelresults = self.paginate_queryset(modelresults)
         serializer = ModelResultSerializer(modelresults, many=True)
+        serializer = select_fields(serializer, request)
         return self.get_paginated_response(serializer.data)
 
     def post(self, request, format=None):
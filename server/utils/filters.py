@@ -0,0 +1,118 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import BooleanField, JSONField
+from rest_framework.exceptions import ValidationError
+from rest_framework import serializers
+from drf_spectacular.utils import OpenApiParameter
+
+
+ID_IN_PARAMETER = OpenApiParameter(
+    name="id__in",
+    type=str,
+    description="Comma-separated list of ids to retrieve",
+)
+
+FIELDS_PARAMETER = OpenApiParameter(
+    name="fields",
+    type=str,
+    description="Comma-separated list of fields to include in each record",
+)
+
+ORDERING_PARAMETER = OpenApiParameter(
+    name="ordering",
+    type=str,
+    description="Comma-separated list of fields to order by. "
+    "Prefix a field with - for descending order",
+)
+
+
+def list_parameters(filter_fields):
+    """
+    OpenAPI query parameters accepted by a list endpoint
+    """
+    filter_parameters = [
+        OpenApiParameter(name=field, type=str, description=f"Filter by {field}")
+        for field in filter_fields
+    ]
+    return [ID_IN_PARAMETER, FIELDS_PARAMETER, ORDERING_PARAMETER] + filter_parameters
+
+
+def filter_by_ids(queryset, request):
+    """
+    Restricts a queryset to the comma-separated ids given in the id__in
+    query parameter, so that multiple records can be retrieved in a single request
+    """
+    ids = request.query_params.get("id__in")
+    if ids is None:
+        return queryset
+    try:
+        ids = [int(id) for id in ids.split(",") if id]
+    except ValueError:
+        raise ValidationError(
+            {"id__in": "Expected a comma-separated list of integer ids"}
+        )
+    return queryset.filter(id__in=ids)
+
+
+def get_model_field(queryset, name, param):
+    try:
+        return queryset.model._meta.get_field(name)
+    except FieldDoesNotExist:
+        raise ValidationError({param: f"Unknown field: {name}"})
+
+
+def filter_list(queryset, request, filter_fields):
+    """
+    Applies the filters and ordering given as query parameters to a queryset.
+    Only the fields in filter_fields can be used for filtering, by exact match.
+    Any non-JSON field can be used for ordering.
+    """
+    queryset = filter_by_ids(queryset, request)
+
+    filters = {}
+    for name in filter_fields:
+        value = request.query_params.get(name)
+        if value is None:
+            continue
+        field = get_model_field(queryset, name, name)
+        try:
+            if isinstance(field, BooleanField):
+                # Accept the same boolean representations as the serializers
+                filters[name] = serializers.BooleanField().to_internal_value(value)
+            else:
+                filters[name] = field.to_python(value)
+        except DjangoValidationError as e:
+            raise ValidationError({name: e.messages})
+        except ValidationError as e:
+            raise ValidationError({name: e.detail})
+    queryset = queryset.filter(**filters)
+
+    ordering = request.query_params.get("ordering")
+    if ordering:
+        ordering = [name for name in ordering.split(",") if name]
+        for name in ordering:
+            field = get_model_field(queryset, name.lstrip("-"), "ordering")
+            if not field.concrete or isinstance(field, JSONField):
+                raise ValidationError({"ordering": f"Can't order by {name}"})
+        queryset = queryset.order_by(*ordering)
+
+    return queryset
+
+
+def select_fields(serializer, request):
+    """
+    Restricts the fields of a list serializer to the comma-separated
+    fields given in the fields query parameter
+    """
+    fields = request.query_params.get("fields")
+    if fields is None:
+        return serializer
+    fields = set(name for name in fields.split(",") if name)
+    child_fields = serializer.child.fields
+    unknown_fields = fields.difference(child_fields.keys())
+    if unknown_fields:
+        unknown_fields = ", ".join(sorted(unknown_fields))
+        raise ValidationError({"fields": f"Unknown fields: {unknown_fields}"})
+    for name in set(child_fields.keys()).difference(fields):
+        child_fields.pop(name)
+    return serializer
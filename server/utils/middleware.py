@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compresses responses with gzip if the client accepts it. Responses smaller
+    than settings.RESPONSE_COMPRESSION_MIN_SIZE are sent uncompressed, since
+    compressing them saves little and costs server time.
+    """
+
+    def process_response(self, request, response):
+        if (
+            not response.streaming
+            and len(response.content) < settings.RESPONSE_COMPRESSION_MIN_SIZE
+        ):
+            return response
+        return super().process_response(request, response)
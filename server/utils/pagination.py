@@ -0,0 +1,157 @@
+import json
+import base64
+import binascii
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import (
+    BasePagination,
+    LimitOffsetPagination,
+    _positive_int,
+)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginates a queryset by (modified_at, id). Each page starts right after
+    the last record of the previous one instead of at an offset, so retrieving
+    a page takes the same time regardless of how deep it is. Records are never
+    skipped during a paginated walk: a record modified during the walk is
+    returned again, with its latest values, in a later page.
+    """
+
+    cursor_query_param = "cursor"
+    limit_query_param = "limit"
+    ordering = ("modified_at", "id")
+    default_limit = api_settings.PAGE_SIZE
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get("ordering"):
+            raise ValidationError(
+                {"ordering": "Ordering is not supported with cursor pagination"}
+            )
+        self.request = request
+        self.limit = self.get_limit(request)
+        position = self.decode_cursor(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            modified_at, id = position
+            # Equivalent to (modified_at, id) > position, written as a range
+            # on modified_at so that it can be resolved with an index scan
+            queryset = queryset.filter(modified_at__gte=modified_at).exclude(
+                Q(modified_at=modified_at) & Q(id__lte=id)
+            )
+
+        results = list(queryset[: self.limit + 1])
+        self.has_next = len(results) > self.limit
+        self.page = results[: self.limit]
+        return self.page
+
+    def get_limit(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.limit_query_param], strict=True
+            )
+        except (KeyError, ValueError):
+            return self.default_limit
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            decoded = base64.urlsafe_b64decode(encoded.encode("ascii"))
+            modified_at, id = json.loads(decoded)
+            modified_at = parse_datetime(modified_at)
+            id = int(id)
+        except (TypeError, ValueError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if modified_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return modified_at, id
+
+    def encode_cursor(self, instance):
+        position = [instance.modified_at.isoformat(), instance.id]
+        encoded = base64.urlsafe_b64encode(json.dumps(position).encode("ascii"))
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encoded.decode())
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict([("next", self.get_next_link()), ("results", data)])
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.limit_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+
+class MedPerfPagination(BasePagination):
+    """
+    Limit-offset pagination by default. Cursor (keyset) pagination
+    when requested with ?pagination=cursor
+    """
+
+    pagination_query_param = "pagination"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get(self.pagination_query_param) == "cursor":
+            self.paginator = KeysetPagination()
+        else:
+            self.paginator = LimitOffsetPagination()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return LimitOffsetPagination().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        pagination_parameter = {
+            "name": self.pagination_query_param,
+            "required": False,
+            "in": "query",
+            "description": "Set to cursor to paginate with cursors instead "
+            "of limit and offset.",
+            "schema": {"type": "string", "enum": ["cursor"]},
+        }
+        parameters = LimitOffsetPagination().get_schema_operation_parameters(view)
+        parameters += [pagination_parameter]
+        parameters += KeysetPagination().get_schema_operation_parameters(view)[:1]
+        return parameters
@@ -0,0 +1,41 @@
+import io
+import zlib
+
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError, UnsupportedMediaType
+
+
+class JSONParser(parsers.JSONParser):
+    """
+    JSON parser that also accepts request bodies sent with Content-Encoding: gzip.
+    Decompressed bodies are limited to settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = parser_context["request"]
+        encoding = request.META.get("HTTP_CONTENT_ENCODING", "identity").lower()
+        if encoding == "gzip":
+            stream = io.BytesIO(self.decompress(stream.read()))
+        elif encoding != "identity":
+            raise UnsupportedMediaType(
+                media_type, f"Unsupported content encoding: {encoding}"
+            )
+        return super().parse(stream, media_type, parser_context)
+
+    @staticmethod
+    def decompress(body):
+        max_size = settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            if max_size is None:
+                data = decompressor.decompress(body)
+            else:
+                data = decompressor.decompress(body, max_size + 1)
+        except zlib.error as e:
+            raise ParseError(f"Invalid gzip request body: {e}")
+        if max_size is not None and len(data) > max_size:
+            raise ParseError("Decompressed request body is too large")
+        if not decompressor.eof:
+            raise ParseError("Invalid gzip request body: truncated")
+        return data
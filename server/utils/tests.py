@@ -1,3 +1,5 @@
+import gzip
+import json
 from rest_framework import status
 
 from medperf.tests import MedPerfTest
@@ -145,6 +147,22 @@ class MlCubesTest(MedPerfTest):
         self.assertEqual(resp1[0]["id"], mlcube1["id"])
         self.assertEqual(resp2[0]["id"], mlcube2["id"])
 
+    def test_endpoint_applies_filters(self):
+        url = self.api_prefix + "/me/mlcubes/"
+
+        # setup user
+        user = "user1"
+        self.create_user(user)
+        self.__create_asset(user)
+
+        # Act
+        self.set_credentials(user)
+        response = self.client.get(url + "?state=OPERATION&fields=id")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 0)
+
 
 class ResultsTest(MedPerfTest):
     def setUp(self):
@@ -309,3 +327,136 @@ class BenchmarkMlCubeTest(MedPerfTest):
         self.assertEqual(len(resp2), 1)
         self.assertEqual(resp1[0]["id"], assoc1["id"])
         self.assertEqual(resp2[0]["id"], assoc2["id"])
+
+
+class CursorPaginationTest(MedPerfTest):
+    def setUp(self):
+        super(CursorPaginationTest, self).setUp()
+        self.url = self.api_prefix + "/mlcubes/"
+        self.user = "user1"
+        self.create_user(self.user)
+        self.set_credentials(self.user)
+        self.ids = []
+        for i in range(5):
+            mlcube = self.mock_mlcube(name=f"mlcube{i}", mlcube_hash=f"hash{i}")
+            self.ids.append(self.create_mlcube(mlcube).data["id"])
+
+    def __walk(self, url, on_first_page=None):
+        ids = []
+        while url is not None:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [mlcube["id"] for mlcube in response.data["results"]]
+            url = response.data["next"]
+            if on_first_page is not None:
+                on_first_page()
+                on_first_page = None
+        return ids
+
+    def test_cursor_pagination_walks_all_records_in_order(self):
+        # Act
+        ids = self.__walk(self.url + "?pagination=cursor&limit=2")
+
+        # Assert
+        self.assertEqual(ids, self.ids)
+
+    def test_cursor_pagination_does_not_skip_records_modified_during_walk(self):
+        # Arrange
+        def modify_records():
+            for id in [self.ids[0], self.ids[2]]:
+                url = self.url + f"{id}/"
+                self.client.put(url, {"name": f"new{id}"}, format="json")
+
+        # Act
+        ids = self.__walk(self.url + "?pagination=cursor&limit=2", modify_records)
+
+        # Assert
+        self.assertEqual(set(ids), set(self.ids))
+        self.assertEqual(ids[-2:], [self.ids[0], self.ids[2]])
+
+    def test_cursor_pagination_response_has_no_count(self):
+        # Act
+        response = self.client.get(self.url + "?pagination=cursor")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertIsNone(response.data["next"])
+
+    def test_cursor_pagination_rejects_invalid_cursor(self):
+        # Act
+        response = self.client.get(self.url + "?pagination=cursor&cursor=invalid")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_pagination_rejects_custom_ordering(self):
+        # Act
+        response = self.client.get(self.url + "?pagination=cursor&ordering=name")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CompressionTest(MedPerfTest):
+    def setUp(self):
+        super(CompressionTest, self).setUp()
+        self.url = self.api_prefix + "/mlcubes/"
+        self.user = "user1"
+        self.create_user(self.user)
+        self.set_credentials(self.user)
+
+    def test_large_responses_are_compressed_if_accepted(self):
+        # Arrange
+        for i in range(10):
+            mlcube = self.mock_mlcube(name=f"mlcube{i}", mlcube_hash=f"hash{i}")
+            self.create_mlcube(mlcube)
+
+        # Act
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        data = json.loads(gzip.decompress(response.content))
+        self.assertEqual(len(data["results"]), 10)
+
+    def test_small_responses_are_not_compressed(self):
+        # Act
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_gzip_request_bodies_are_accepted(self):
+        # Arrange
+        mlcube = self.mock_mlcube()
+        body = gzip.compress(json.dumps(mlcube).encode())
+
+        # Act
+        response = self.client.post(
+            self.url,
+            body,
+            content_type="application/json",
+            HTTP_CONTENT_ENCODING="gzip",
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["name"], mlcube["name"])
+
+    def test_invalid_gzip_request_bodies_are_rejected(self):
+        # Arrange
+        body = json.dumps(self.mock_mlcube()).encode()
+
+        # Act
+        response = self.client.post(
+            self.url,
+            body,
+            content_type="application/json",
+            HTTP_CONTENT_ENCODING="gzip",
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -18,6 +18,7 @@ from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from drf_spectacular.utils import extend_schema, inline_serializer
+from utils.filters import filter_list, select_fields, list_parameters
 from rest_framework import serializers
 
 
@@ -37,6 +38,7 @@ class User(GenericAPIView):
 class BenchmarkList(GenericAPIView):
     serializer_class = BenchmarkSerializer
     queryset = ""
+    filter_fields = ["state", "approval_status", "is_valid"]
 
     def get_object(self, pk):
         try:
@@ -44,19 +46,23 @@ class BenchmarkList(GenericAPIView):
         except Benchmark.DoesNotExist:
             raise Http404
 
+    @extend_schema(parameters=list_parameters(filter_fields))
     def get(self, request, format=None):
         """
         Retrieve all benchmarks owned by the current user
         """
         benchmarks = self.get_object(request.user.id)
+        benchmarks = filter_list(benchmarks, request, self.filter_fields)
         benchmarks = self.paginate_queryset(benchmarks)
         serializer = BenchmarkSerializer(benchmarks, many=True)
+        serializer = select_fields(serializer, request)
         return self.get_paginated_response(serializer.data)
 
 
 class MlCubeList(GenericAPIView):
     serializer_class = MlCubeSerializer
     queryset = ""
+    filter_fields = ["state", "is_valid"]
 
     def get_object(self, pk):
         try:
@@ -64,19 +70,23 @@ class MlCubeList(GenericAPIView):
         except MlCube.DoesNotExist:
             raise Http404
 
+    @extend_schema(parameters=list_parameters(filter_fields))
     def get(self, request, format=None):
         """
         Retrieve all mlcubes associated with the current user
         """
         mlcubes = self.get_object(request.user.id)
+        mlcubes = filter_list(mlcubes, request, self.filter_fields)
         mlcubes = self.paginate_queryset(mlcubes)
         serializer = MlCubeSerializer(mlcubes, many=True)
+        serializer = select_fields(serializer, request)
         return self.get_paginated_response(serializer.data)
 
 
 class DatasetList(GenericAPIView):
     serializer_class = DatasetFullSerializer
     queryset = ""
+    filter_fields = ["state", "is_valid"]
 
     def get_object(self, pk):
         try:
@@ -84,19 +94,23 @@ class DatasetList(GenericAPIView):
         except Dataset.DoesNotExist:
             raise Http404
 
+    @extend_schema(parameters=list_parameters(filter_fields))
     def get(self, request, format=None):
         """
         Retrieve all datasets associated with the current user
         """
         datasets = self.get_object(request.user.id)
+        datasets = filter_list(datasets, request, self.filter_fields)
         datasets = self.paginate_queryset(datasets)
         serializer = DatasetFullSerializer(datasets, many=True)
+        serializer = select_fields(serializer, request)
         return self.get_paginated_response(serializer.data)
 
 
 class ModelResultList(GenericAPIView):
     serializer_class = ModelResultSerializer
     queryset = ""
+    filter_fields = ["approval_status", "is_valid", "benchmark", "dataset", "model"]
 
     def get_object(self, pk):
         try:
@@ -104,19 +118,23 @@ class ModelResultList(GenericAPIView):
         except ModelResult.DoesNotExist:
             raise Http404
 
+    @extend_schema(parameters=list_parameters(filter_fields))
     def get(self, request, format=None):
         """
         Retrieve all results associated with the current user
         """
         results = self.get_object(request.user.id)
+        results = filter_list(results, request, self.filter_fields)
         results = self.paginate_queryset(results)
         serializer = ModelResultSerializer(results, many=True)
+        serializer = select_fields(serializer, request)
         return self.get_paginated_response(serializer.data)
 
 
 class DatasetAssociationList(GenericAPIView):
     serializer_class = BenchmarkDatasetListSerializer
     queryset = ""
+    filter_fields = ["approval_status", "benchmark", "dataset"]
 
     def get_object(self, pk):
         try:
@@ -126,19 +144,23 @@ class DatasetAssociationList(GenericAPIView):
         except BenchmarkDataset.DoesNotExist:
             raise Http404
 
+    @extend_schema(parameters=list_parameters(filter_fields))
     def get(self, request, format=None):
         """
         Retrieve all dataset associations involving an asset of mine
         """
         benchmarkdatasets = self.get_object(request.user.id)
+        benchmarkdatasets = filter_list(benchmarkdatasets, request, self.filter_fields)
         benchmarkdatasets = self.paginate_queryset(benchmarkdatasets)
         serializer = BenchmarkDatasetListSerializer(benchmarkdatasets, many=True)
+        serializer = select_fields(serializer, request)
         return self.get_paginated_response(serializer.data)
 
 
 class MlCubeAssociationList(GenericAPIView):
     serializer_class = BenchmarkModelListSerializer
     queryset = ""
+    filter_fields = ["approval_status", "benchmark", "model_mlcube"]
 
     def get_object(self, pk):
         try:
@@ -148,13 +170,16 @@ class MlCubeAssociationList(GenericAPIView):
         except BenchmarkModel.DoesNotExist:
             raise Http404
 
+    @extend_schema(parameters=list_parameters(filter_fields))
     def get(self, request, format=None):
         """
         Retrieve all mlcube associations involving an asset of mine
         """
         benchmarkmodels = self.get_object(request.user.id)
+        benchmarkmodels = filter_list(benchmarkmodels, request, self.filter_fields)
         benchmarkmodels = self.paginate_queryset(benchmarkmodels)
         serializer = BenchmarkModelListSerializer(benchmarkmodels, many=True)
+        serializer = select_fields(serializer, request)
         return self.get_paginated_response(serializer.data)
 
 